@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
 from app.schemas.assignments_schema import AssignmentCreate, AssignmentUpdate, AssignmentResponse
 from app.services.assignment_service import AssignmentService
 
@@ -20,10 +22,14 @@ def get_assignments(
     course_code: str = None,
     student_uuid: str = None,
     session: Session = Depends(get_db), 
-    request: Request = None
+    request: Request = None,
+    response: Response = None,
+    cursor: Optional[Cursor] = Depends(cursor_param)
     ):
     service = AssignmentService(session, request)
-    return service.get_all_assignments(skip, limit, course_uuid, search, course_code, student_uuid)
+    items = service.get_all_assignments(skip, limit, course_uuid, search, course_code, student_uuid, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{uuid}", response_model=AssignmentResponse)
 def get_assignment(uuid: str, session: Session = Depends(get_db), request: Request = None):
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
+from app.utils.replicas import get_async_read_db
 
 ## Services
-from app.services.career_service import CareerService
+from app.services.career_service import CareerService, CareerAsyncService
 
 ## Schemas
 from app.schemas.careers_schema import CareerCreate, CareerUpdate, CareerResponse
@@ -17,14 +21,16 @@ def create_career(career: CareerCreate, session: Session = Depends(get_db), requ
     return service.create_career(career)
 
 @router.get("/get-all", response_model=list[CareerResponse])
-def get_careers(session: Session = Depends(get_db), request: Request = None, skip: int = 0, limit: int = 100, search: str = None):
-    service = CareerService(session, request)
-    return service.get_all_careers(skip, limit, search)
+async def get_careers(session: AsyncSession = Depends(get_async_read_db), request: Request = None, skip: int = 0, limit: int = 100, search: str = None, response: Response = None, cursor: Optional[Cursor] = Depends(cursor_param)):
+    service = CareerAsyncService(session, request)
+    items = await service.get_all_careers(skip, limit, search, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{uuid}", response_model=CareerResponse)
-def get_career(uuid: str, session: Session = Depends(get_db), request: Request = None):
-    service = CareerService(session, request)
-    return service.get_career_by_uuid(uuid)
+async def get_career(uuid: str, session: AsyncSession = Depends(get_async_read_db), request: Request = None):
+    service = CareerAsyncService(session, request)
+    return await service.get_career_by_uuid(uuid)
 
 @router.put("/update/{uuid}", response_model=CareerResponse)
 def update_career(uuid: str, career: CareerUpdate, session: Session = Depends(get_db), request: Request = None):
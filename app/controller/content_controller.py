@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from app.services.content_service import ContentService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.content_service import ContentService, ContentAsyncService
 from app.schemas.content_schema import ContentCreate, ContentUpdate, ContentResponse, CreateCoursesContent, CreateCoursesContentResponse
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
+from app.utils.replicas import get_async_read_db
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(
     prefix="/content",
@@ -22,7 +25,7 @@ def create_courses_content(content: CreateCoursesContent, request: Request, db:
     return service.create_courses_content(content)
 
 @router.get("/get-all", response_model=list[ContentResponse])
-def get_all_contents(
+async def get_all_contents(
     skip: int = 0, 
     limit: int = 100, 
     course_uuid: str = None, 
@@ -30,10 +33,14 @@ def get_all_contents(
     assignment_name: str = None,
     search: str = None,
     request: Request = None, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db),
+    response: Response = None,
+    cursor: Optional[Cursor] = Depends(cursor_param)
 ):
-    service = ContentService(db, request)
-    return service.get_all_contents(skip, limit, course_uuid, course_code, assignment_name, search)
+    service = ContentAsyncService(db, request)
+    items = await service.get_all_contents(skip, limit, course_uuid, course_code, assignment_name, search, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/download/{content_uuid}")
 def download_content(content_uuid: UUID, request: Request, db: Session = Depends(get_db)):
@@ -41,9 +48,9 @@ def download_content(content_uuid: UUID, request: Request, db: Session = Depends
     return service.download_content(content_uuid)
 
 @router.get("/{content_uuid}", response_model=ContentResponse)
-def get_content(content_uuid: UUID, request: Request, db: Session = Depends(get_db)):
-    service = ContentService(db, request)
-    return service.get_content_by_uuid(content_uuid)
+async def get_content(content_uuid: UUID, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    service = ContentAsyncService(db, request)
+    return await service.get_content_by_uuid(content_uuid)
 
 
 @router.put("/update/{content_uuid}", response_model=ContentResponse)
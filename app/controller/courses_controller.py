@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
+from app.utils.replicas import get_async_read_db
 from app.schemas.courses_schema import CourseCreate, CourseUpdate, CourseResponse
-from app.services.course_service import CourseService
+from app.services.course_service import CourseService, CourseAsyncService
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
@@ -12,14 +16,16 @@ def create_course(course: CourseCreate, session: Session = Depends(get_db), requ
     return service.create_course(course)
 
 @router.get("/get-all", response_model=list[CourseResponse])
-def get_courses(skip: int = 0, limit: int = 100, search: str = None, course_code:str = None, student_uuid:str = None, session: Session = Depends(get_db), request: Request = None):
-    service = CourseService(session, request)
-    return service.get_all_courses(skip, limit, search, course_code, student_uuid)
+async def get_courses(skip: int = 0, limit: int = 100, search: str = None, course_code:str = None, student_uuid:str = None, session: AsyncSession = Depends(get_async_read_db), request: Request = None, response: Response = None, cursor: Optional[Cursor] = Depends(cursor_param)):
+    service = CourseAsyncService(session, request)
+    items = await service.get_all_courses(skip, limit, search, course_code, student_uuid, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{uuid}", response_model=CourseResponse)
-def get_course(uuid: str, session: Session = Depends(get_db), request: Request = None):
-    service = CourseService(session, request)
-    return service.get_course_by_uuid(uuid)
+async def get_course(uuid: str, session: AsyncSession = Depends(get_async_read_db), request: Request = None):
+    service = CourseAsyncService(session, request)
+    return await service.get_course_by_uuid(uuid)
 
 @router.put("/update/{uuid}", response_model=CourseResponse)
 def update_course(uuid: str, course: CourseUpdate, session: Session = Depends(get_db), request: Request = None):
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
+from app.utils.replicas import get_async_read_db
 from app.schemas.enrollments_schema import EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse
-from app.services.enrollment_service import EnrollmentService
+from app.services.enrollment_service import EnrollmentService, EnrollmentAsyncService
 
 router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
 
@@ -12,7 +16,7 @@ def create_enrollment(enrollment: EnrollmentCreate, session: Session = Depends(g
     return service.create_enrollment(enrollment)
 
 @router.get("/get-all", response_model=list[EnrollmentResponse])
-def get_enrollments(
+async def get_enrollments(
     skip: int = 0, 
     limit: int = 100, 
     course_code: str = None, 
@@ -21,16 +25,20 @@ def get_enrollments(
     student_uuid: str = None,
     course_uuid: str = None,
     section_uuid: str = None,
-    session: Session = Depends(get_db), 
-    request: Request = None
+    session: AsyncSession = Depends(get_async_read_db), 
+    request: Request = None,
+    response: Response = None,
+    cursor: Optional[Cursor] = Depends(cursor_param)
     ):
-    service = EnrollmentService(session, request)
-    return service.get_all_enrollments(skip, limit, course_code, assignment_name, search, student_uuid, course_uuid, section_uuid)
+    service = EnrollmentAsyncService(session, request)
+    items = await service.get_all_enrollments(skip, limit, course_code, assignment_name, search, student_uuid, course_uuid, section_uuid, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{uuid}", response_model=EnrollmentResponse)
-def get_enrollment(uuid: str, session: Session = Depends(get_db), request: Request = None):
-    service = EnrollmentService(session, request)
-    return service.get_enrollment_by_uuid(uuid)
+async def get_enrollment(uuid: str, session: AsyncSession = Depends(get_async_read_db), request: Request = None):
+    service = EnrollmentAsyncService(session, request)
+    return await service.get_enrollment_by_uuid(uuid)
 
 @router.put("/update/{uuid}", response_model=EnrollmentResponse)
 def update_enrollment(uuid: str, enrollment: EnrollmentUpdate, session: Session = Depends(get_db), request: Request = None):
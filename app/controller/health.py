@@ -1,4 +1,6 @@
 from fastapi import APIRouter
+from app.utils.authentication import auth_stats
+from app.utils.replicas import replica_router
 
 router = APIRouter(prefix="/api/v1", tags=["Health"])
 
@@ -7,4 +9,12 @@ async def health_check():
     return {
         "status": "ok",
         "version": "1.0.0"
-    } 
\ No newline at end of file
+    }
+
+@router.get("/health/auth")
+async def auth_health_check():
+    return auth_stats()
+
+@router.get("/health/replicas")
+async def replicas_health_check():
+    return replica_router.stats()
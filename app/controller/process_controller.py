@@ -1,20 +1,68 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from app.services.process_service import ProcessService
-from app.utils.dataBase import get_db
+from app.services.process_run_service import ProcessRunAsyncService
+from app.services.process_retry_service import ProcessRetryAsyncService
+from app.schemas.process_runs_schema import ProcessRunResponse, ProcessRunStarted
+from app.schemas.process_retries_schema import ProcessDeadLetterResponse, ProcessDeadLetterReplay, ProcessDeadLetterReplayed
+from app.utils.dataBase import get_db, get_async_db
 from sqlalchemy.orm import Session
-from fastapi import Request, Depends
-import logging
-
-logger = logging.getLogger('process_controller')
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Request, Depends, Query
 
 router = APIRouter(prefix="/internal/process", tags=["Internal Process"])
 
-@router.get("/process-student-data")
-def process_student_data(background_tasks: BackgroundTasks, session: Session = Depends(get_db), request: Request = None):
+@router.get("/process-student-data", response_model=ProcessRunStarted)
+def process_student_data(
+    full: bool = Query(False, description="Reenviar todos los pares aunque no hayan cambiado"),
+    resume: bool = Query(True, description="Retomar la última corrida si quedó interrumpida (solo sus work items sin terminar)"),
+    session: Session = Depends(get_db),
+    request: Request = None
+):
+    """Solo encola la corrida; la ejecutan los workers (python -m app.workers.process)"""
     service = ProcessService(session, request)
-    try:
-        background_tasks.add_task(service.process_student_prediction_data)
-    except Exception as e:
-        logger.error(f"Error processing student data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    return {"message": "Student data processing started"}
\ No newline at end of file
+    run, resumed = service.enqueue_run(full, resume)
+    return ProcessRunStarted(
+        message="Student data processing resumed" if resumed else "Student data processing queued",
+        run_uuid=run.uuid,
+        resumed=resumed
+    )
+
+# El progreso se lee del primario: en una réplica llegaría con retraso
+@router.get("/runs", response_model=list[ProcessRunResponse])
+async def get_runs(limit: int = Query(20, ge=1, le=100), session: AsyncSession = Depends(get_async_db), request: Request = None):
+    service = ProcessRunAsyncService(session, request)
+    return await service.get_all_runs(limit)
+
+@router.get("/runs/{uuid}", response_model=ProcessRunResponse)
+async def get_run(uuid: str, session: AsyncSession = Depends(get_async_db), request: Request = None):
+    service = ProcessRunAsyncService(session, request)
+    return await service.get_run_by_uuid(uuid)
+
+@router.get("/runs/{uuid}/stream")
+async def stream_run(uuid: str, request: Request = None):
+    """Server-sent events con el progreso de la corrida hasta que termina; abre su propia sesión"""
+    service = ProcessRunAsyncService(None, request)
+    return StreamingResponse(
+        service.stream_run(uuid),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/dead-letters", response_model=list[ProcessDeadLetterResponse])
+async def get_dead_letters(
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    stage: str = Query(None, description="user, prediction o dispatch"),
+    session: AsyncSession = Depends(get_async_db),
+    request: Request = None
+):
+    """Pares que agotaron sus reintentos"""
+    service = ProcessRetryAsyncService(session, request)
+    return await service.get_all_dead_letters(skip, limit, stage)
+
+@router.post("/dead-letters/replay", response_model=ProcessDeadLetterReplayed)
+async def replay_dead_letters(replay: ProcessDeadLetterReplay, session: AsyncSession = Depends(get_async_db), request: Request = None):
+    """Devuelve los dead letters indicados (o todos) a la cola de reintentos; los envía el worker"""
+    service = ProcessRetryAsyncService(session, request)
+    return await service.replay_dead_letters(replay.uuids, replay.stage)
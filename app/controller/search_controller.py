@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Request, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.replicas import get_async_read_db
+from app.schemas.search_schema import SearchResponse
+from app.services.search_service import SearchAsyncService
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str,
+    types: str = Query(None, description="Tipos separados por coma: careers, courses, assignments, contents, students"),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_read_db),
+    request: Request = None
+):
+    service = SearchAsyncService(session, request)
+    return await service.search(q, types, limit)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
+from app.utils.replicas import get_async_read_db
 from app.schemas.sections_schema import SectionCreate, SectionUpdate, SectionResponse
-from app.services.section_service import SectionService
+from app.services.section_service import SectionService, SectionAsyncService
 
 router = APIRouter(prefix="/sections", tags=["Sections"])
 
@@ -12,25 +16,29 @@ def create_section(section: SectionCreate, session: Session = Depends(get_db), r
     return service.create_section(section)
 
 @router.get("/get-all", response_model=list[SectionResponse])
-def get_sections(
+async def get_sections(
         skip: int = 0, 
         limit: int = 100, 
         course_uuid: str = None, 
         search: str = None, 
         course_code: str = None, 
         student_uuid: str = None, 
-        session: Session = Depends(get_db), 
-        request: Request = None
+        session: AsyncSession = Depends(get_async_read_db), 
+        request: Request = None,
+        response: Response = None,
+        cursor: Optional[Cursor] = Depends(cursor_param)
     ):
-    service = SectionService(session, request)
-    return service.get_all_sections(skip, limit, course_uuid, search, course_code, student_uuid)
+    service = SectionAsyncService(session, request)
+    items = await service.get_all_sections(skip, limit, course_uuid, search, course_code, student_uuid, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 
 
 @router.get("/{uuid}", response_model=SectionResponse)
-def get_section(uuid: str, session: Session = Depends(get_db), request: Request = None):
-    service = SectionService(session, request)
-    return service.get_section_by_uuid(uuid)
+async def get_section(uuid: str, session: AsyncSession = Depends(get_async_read_db), request: Request = None):
+    service = SectionAsyncService(session, request)
+    return await service.get_section_by_uuid(uuid)
 
 @router.put("/update/{uuid}", response_model=SectionResponse)
 def update_section(uuid: str, section: SectionUpdate, session: Session = Depends(get_db), request: Request = None):
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
 from app.schemas.students_schema import StudentCreate, StudentUpdate, StudentResponse
 from app.services.student_service import StudentService
 
@@ -17,10 +19,14 @@ def get_students(
     limit: int = 100, 
     course_uuid: str = None,
     session: Session = Depends(get_db), 
-    request: Request = None
+    request: Request = None,
+    response: Response = None,
+    cursor: Optional[Cursor] = Depends(cursor_param)
     ):
     service = StudentService(session, request)
-    return service.get_all_students(skip, limit, course_uuid)
+    items = service.get_all_students(skip, limit, course_uuid, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{uuid}", response_model=StudentResponse)
 def get_student(uuid: str, session: Session = Depends(get_db), request: Request = None):
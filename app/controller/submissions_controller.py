@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.utils.dataBase import get_db
+from app.utils.pagination import Cursor, cursor_param, set_next_cursor
+from app.utils.replicas import get_async_read_db
 from app.schemas.submissions_schema import SubmissionCreate, SubmissionUpdate, SubmissionResponse
-from app.services.submission_service import SubmissionService
+from app.services.submission_service import SubmissionService, SubmissionAsyncService
 
 router = APIRouter(prefix="/submissions", tags=["Submissions"])
 
@@ -12,7 +16,7 @@ def create_submission(submission: SubmissionCreate, session: Session = Depends(g
     return service.create_submission(submission)
 
 @router.get("/get-all", response_model=list[SubmissionResponse])
-def get_submissions(
+async def get_submissions(
     skip: int = 0, 
     limit: int = 100, 
     assignment_uuid: str = None, 
@@ -21,17 +25,21 @@ def get_submissions(
     course_code: str = None,
     assignment_name: str = None,
     search: str = None, 
-    session: Session = Depends(get_db), 
-    request: Request = None
+    session: AsyncSession = Depends(get_async_read_db), 
+    request: Request = None,
+    response: Response = None,
+    cursor: Optional[Cursor] = Depends(cursor_param)
     ):
-    service = SubmissionService(session, request)
-    return service.get_all_submissions(skip, limit, course_uuid, assignment_uuid, student_uuid, course_code, assignment_name, search)
+    service = SubmissionAsyncService(session, request)
+    items = await service.get_all_submissions(skip, limit, course_uuid, assignment_uuid, student_uuid, course_code, assignment_name, search, cursor)
+    set_next_cursor(response, items, limit)
+    return items
 
 
 @router.get("/{uuid}", response_model=SubmissionResponse)
-def get_submission(uuid: str, session: Session = Depends(get_db), request: Request = None):
-    service = SubmissionService(session, request)
-    return service.get_submission_by_uuid(uuid)
+async def get_submission(uuid: str, session: AsyncSession = Depends(get_async_read_db), request: Request = None):
+    service = SubmissionAsyncService(session, request)
+    return await service.get_submission_by_uuid(uuid)
 
 
 @router.put("/update/{uuid}", response_model=SubmissionResponse)
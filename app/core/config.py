@@ -8,7 +8,69 @@ class Settings(BaseSettings):
     
     # Configuración de Supabase
     SUPABASE_PASSWORD: str 
-    SUPABASE_DB_URL: Optional[str] = None
+    SUPABASE_DB_URL: Optional[str] = None  # si se define reemplaza la URL armada con SUPABASE_PASSWORD
+
+    # Pool de conexiones a la base de datos
+    DB_POOL_CLASS: str = "queue"  # "queue" o "null" (una conexión nueva por sesión)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT_SECONDS: int = 10
+    DB_TRANSACTION_POOLER: bool = False  # True detrás de un pooler en modo transacción (ej. Supavisor :6543)
+
+    # Réplicas de lectura (URLs separadas por coma)
+    DB_READ_REPLICA_URLS: Optional[str] = None
+    DB_REPLICA_MAX_LAG_SECONDS: float = 10.0
+    DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0  # tiempo que un cliente lee del primario después de escribir (cookie/header)
+
+    # Scope de acceso por usuario (cursos/secciones/carreras inscritas); 0 desactiva la cache entre requests
+    ACCESS_SCOPE_CACHE_TTL_SECONDS: int = 30
+    ACCESS_SCOPE_CACHE_MAX_SIZE: int = 10000
+
+    # Parámetro search de los listados: "ilike" (substring) o "fulltext" (columnas tsvector);
+    # "fulltext" solo después de correr python -m app.scripts.add_search_columns
+    SEARCH_MODE: str = "ilike"
+
+    # Cálculo de las métricas de entregas del proceso de predicción: "numpy" (columnar) o "python"
+    PROCESS_FEATURES_ENGINE: str = "numpy"
+
+    # Envío del proceso de predicción a los servicios de users y predicción
+    PROCESS_DISPATCH_CONCURRENCY: int = 20  # envíos en vuelo a la vez
+    PROCESS_FEATURES_CHUNK_SIZE: int = 500  # estudiantes por lote de métricas
+    PROCESS_STREAM_CHUNK_SIZE: int = 5000  # filas por fetch del cursor del servidor al recorrer inscripciones
+    PROCESS_SHARDS: int = 1  # procesos que calculan lotes de métricas en paralelo; 1 = en el mismo proceso
+    PROCESS_HTTP_TIMEOUT_SECONDS: float = 30.0
+    PROCESS_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    PROCESS_HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    PROCESS_HTTP_MAX_RETRIES: int = 3
+    PROCESS_HTTP_BACKOFF_SECONDS: float = 0.5
+    PROCESS_HTTP_BACKOFF_MAX_SECONDS: float = 10.0
+    PROCESS_PREDICTION_BATCH_SIZE: int = 1  # pares por request al servicio de predicción; 1 desactiva los lotes
+    PROCESS_PREDICTION_BATCH_MAX_BYTES: int = 1_000_000  # tope del body JSON de cada lote
+
+    # Seguimiento de corridas del proceso (tabla process_runs)
+    PROCESS_RUN_CHECKPOINT_SECONDS: float = 5.0  # cada cuánto se guardan progreso y watermarks y se renueva el lease
+    PROCESS_RUN_STALE_SECONDS: int = 120  # una corrida "running" sin heartbeat en este tiempo se considera interrumpida
+    PROCESS_RUN_STREAM_INTERVAL_SECONDS: float = 1.0
+
+    # Cola de trabajo distribuida (tabla process_work_items)
+    PROCESS_WORK_ITEM_STUDENTS: int = 2000  # estudiantes por work item
+    PROCESS_WORK_LEASE_SECONDS: int = 60  # un work item sin renovar en este tiempo lo puede tomar otro worker
+    PROCESS_WORK_MAX_ATTEMPTS: int = 3  # intentos por work item antes de marcarlo failed
+
+    # Reintentos de pares cuyo envío falló (tablas process_retries y process_dead_letters)
+    PROCESS_RETRY_MAX_ATTEMPTS: int = 5  # envíos fallidos antes de pasar a dead letters
+    PROCESS_RETRY_BACKOFF_SECONDS: int = 60  # espera tras el primer fallo; se duplica en cada uno, con jitter
+    PROCESS_RETRY_BACKOFF_MAX_SECONDS: int = 6 * 3600
+    PROCESS_RETRY_BATCH_SIZE: int = 500  # pares que toma un worker por vez
+
+    # Worker del proceso (python -m app.workers.process)
+    PROCESS_WORKER_SCHEDULE: Optional[str] = None  # cron de 5 campos en UTC, ej. "0 3 * * *"; sin definir solo ejecuta lo encolado
+    PROCESS_WORKER_POLL_SECONDS: float = 5.0
+    PROCESS_WORKER_LOCK_KEY: int = 72310001  # pg advisory lock compartido: un solo worker programa y coordina las corridas
     
     # Configuración de seguridad
     SECRET_KEY: str = "tu_clave_secreta_aqui"
@@ -17,6 +79,34 @@ class Settings(BaseSettings):
     # Configuración de APIs
     API_AUTH_URL: str
     API_PREDICTION_URL: str
+
+    # Cache de tokens validados contra /auth/me
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    AUTH_CACHE_SHARED_PATH: Optional[str] = None  # archivo SQLite compartido entre workers del host
+
+    # Cliente HTTP hacia el servicio de auth
+    AUTH_HTTP_TIMEOUT_SECONDS: float = 5.0
+    AUTH_HTTP_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    AUTH_HTTP_MAX_CONNECTIONS: int = 100
+    AUTH_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    AUTH_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+
+    # Verificación de tokens: "remote" (siempre /auth/me) o "local" (firma JWT)
+    AUTH_VERIFICATION_MODE: str = "remote"
+    AUTH_JWT_ALGORITHMS: str = "HS256"
+    AUTH_JWT_JWKS_PATH: Optional[str] = None  # si no se define se usa SECRET_KEY
+    AUTH_JWT_AUDIENCE: Optional[str] = None
+    AUTH_JWT_ISSUER: Optional[str] = None
+    AUTH_JWT_USER_CLAIM: str = "uuid"
+    AUTH_JWT_REVOCATION_CHECK: bool = False  # consultar /auth/me ante cada miss de cache
+
+    # Circuit breaker del servicio de auth
+    AUTH_BREAKER_FAILURE_THRESHOLD: int = 5
+    AUTH_BREAKER_RECOVERY_TIMEOUT_SECONDS: float = 30.0
+    AUTH_BREAKER_HALF_OPEN_MAX_CALLS: int = 1
+    AUTH_STALE_GRACE_SECONDS: int = 300  # ventana en la que se sirve el último payload válido
     
     class Config:
         case_sensitive = True
@@ -9,6 +9,10 @@ from app.models.submissions_model import Submission
 from app.models.enrollments_model import Enrollment, EnrollmentStatus
 from app.models.periods_model import Period
 from app.models.course_sections_model import CourseSection
+from app.models.process_watermarks_model import ProcessWatermark
+from app.models.process_runs_model import ProcessRun, ProcessRunStatus
+from app.models.process_work_items_model import ProcessWorkItem, ProcessWorkItemStatus
+from app.models.process_retries_model import ProcessRetry, ProcessDeadLetter
 
 __all__ = [
     'Career',
@@ -22,5 +26,12 @@ __all__ = [
     'Enrollment',
     'EnrollmentStatus',
     'Period',
-    'CourseSection'
+    'CourseSection',
+    'ProcessWatermark',
+    'ProcessRun',
+    'ProcessRunStatus',
+    'ProcessWorkItem',
+    'ProcessWorkItemStatus',
+    'ProcessRetry',
+    'ProcessDeadLetter'
 ] 
\ No newline at end of file
@@ -1,12 +1,22 @@
-from sqlalchemy import Column, String, BigInteger, ForeignKey, Text
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from app.utils.dataBase import Base
+from app.utils.search import search_vector_column, SEARCH_VECTOR_MAPPER_ARGS
 
 class Assignment(Base):
     __tablename__ = "assignments"
+    __mapper_args__ = SEARCH_VECTOR_MAPPER_ARGS
+    __table_args__ = (
+        Index("ix_assignments_course_uuid_section_uuid", "course_uuid", "section_uuid"),
+        Index("ix_assignments_section_uuid", "section_uuid"),
+        Index("ix_assignments_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_assignments_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+        Index("ix_assignments_created_at_uuid", "created_at", "uuid"),
+        Index("ix_assignments_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     course_uuid = Column(UUID(as_uuid=True), ForeignKey("courses.uuid"))
@@ -16,6 +26,7 @@ class Assignment(Base):
     due_date = Column(BigInteger, nullable=True)
     created_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp())
     updated_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp(), onupdate=datetime.now(timezone.utc).timestamp())
+    search_vector = search_vector_column(title="A", description="C")
 
     # Relaciones
     course = relationship("Course", back_populates="assignments")
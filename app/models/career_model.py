@@ -1,12 +1,20 @@
-from sqlalchemy import Column, String, BigInteger
+from sqlalchemy import Column, String, BigInteger, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from app.utils.dataBase import Base
+from app.utils.search import search_vector_column, SEARCH_VECTOR_MAPPER_ARGS
 
 class Career(Base):
     __tablename__ = "careers"
+    __mapper_args__ = SEARCH_VECTOR_MAPPER_ARGS
+    __table_args__ = (
+        Index("ix_careers_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_careers_code_trgm", "code", postgresql_using="gin", postgresql_ops={"code": "gin_trgm_ops"}),
+        Index("ix_careers_created_at_uuid", "created_at", "uuid"),
+        Index("ix_careers_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -14,6 +22,7 @@ class Career(Base):
     description = Column(String)
     created_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp())
     updated_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp(), onupdate=datetime.now(timezone.utc).timestamp())
+    search_vector = search_vector_column(name="A", code="A", description="C")
 
     # Relaciones
     courses = relationship("Course", back_populates="career")
@@ -1,12 +1,19 @@
-from sqlalchemy import Column, String, BigInteger, ForeignKey, Text
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from app.utils.dataBase import Base
+from app.utils.search import search_vector_column, SEARCH_VECTOR_MAPPER_ARGS
 
 class Content(Base):
     __tablename__ = "contents"
+    __mapper_args__ = SEARCH_VECTOR_MAPPER_ARGS
+    __table_args__ = (
+        Index("ix_contents_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_contents_created_at_uuid", "created_at", "uuid"),
+        Index("ix_contents_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
@@ -16,6 +23,7 @@ class Content(Base):
     file_size = Column(BigInteger)  # tamaño en bytes
     created_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp())
     updated_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp(), onupdate=datetime.now(timezone.utc).timestamp())
+    search_vector = search_vector_column(title="A", description="C")
 
     # Relaciones
     course_contents = relationship("CourseContent", back_populates="content")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, ForeignKey, Text
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
@@ -7,6 +7,11 @@ from app.utils.dataBase import Base
 
 class CourseContent(Base):
     __tablename__ = "course_contents"
+    __table_args__ = (
+        Index("ix_course_contents_course_uuid", "course_uuid"),
+        Index("ix_course_contents_content_uuid", "content_uuid"),
+        Index("ix_course_contents_assignment_uuid", "assignment_uuid"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     course_uuid = Column(UUID(as_uuid=True), ForeignKey("courses.uuid"), nullable=False)
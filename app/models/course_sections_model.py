@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, ForeignKey
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
@@ -7,6 +7,10 @@ from app.utils.dataBase import Base
 
 class CourseSection(Base):
     __tablename__ = "course_sections"
+    __table_args__ = (
+        Index("ix_course_sections_course_uuid", "course_uuid"),
+        Index("ix_course_sections_section_uuid", "section_uuid"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     course_uuid = Column(UUID(as_uuid=True), ForeignKey("courses.uuid"), nullable=False)
@@ -1,12 +1,21 @@
-from sqlalchemy import Column, String, BigInteger, ForeignKey
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from app.utils.dataBase import Base
+from app.utils.search import search_vector_column, SEARCH_VECTOR_MAPPER_ARGS
 
 class Course(Base):
     __tablename__ = "courses"
+    __mapper_args__ = SEARCH_VECTOR_MAPPER_ARGS
+    __table_args__ = (
+        Index("ix_courses_career_uuid", "career_uuid"),
+        Index("ix_courses_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_courses_code_trgm", "code", postgresql_using="gin", postgresql_ops={"code": "gin_trgm_ops"}),
+        Index("ix_courses_created_at_uuid", "created_at", "uuid"),
+        Index("ix_courses_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -15,6 +24,7 @@ class Course(Base):
     career_uuid = Column(UUID(as_uuid=True), ForeignKey("careers.uuid"))
     created_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp())
     updated_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp(), onupdate=datetime.now(timezone.utc).timestamp())
+    search_vector = search_vector_column(name="A", code="A", description="C")
 
     # Relaciones
     career = relationship("Career", back_populates="courses")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, ForeignKey, Enum
+from sqlalchemy import Column, BigInteger, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
@@ -13,6 +13,12 @@ class EnrollmentStatus(enum.Enum):
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        Index("ix_enrollments_section_uuid", "section_uuid"),
+        Index("ix_enrollments_student_uuid_course_uuid", "student_uuid", "course_uuid"),
+        Index("ix_enrollments_course_uuid_section_uuid", "course_uuid", "section_uuid"),
+        Index("ix_enrollments_created_at_uuid", "created_at", "uuid"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     student_uuid = Column(UUID(as_uuid=True), ForeignKey("students.uuid"))
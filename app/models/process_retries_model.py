@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, BigInteger, ForeignKey, Index, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from app.utils.dataBase import Base
+
+class ProcessRetry(Base):
+    """Par (estudiante, curso) cuyo envío falló, pendiente de reintento"""
+    __tablename__ = "process_retries"
+    __table_args__ = (
+        Index("ix_process_retries_next_attempt_at", "next_attempt_at"),
+    )
+
+    student_uuid = Column(UUID(as_uuid=True), ForeignKey("students.uuid"), primary_key=True)
+    course_uuid = Column(UUID(as_uuid=True), ForeignKey("courses.uuid"), primary_key=True)
+    stage = Column(String(20), nullable=False)  # "user", "prediction" o "dispatch": dónde falló el último intento
+    attempts = Column(Integer, nullable=False, default=0)  # envíos fallidos
+    last_error = Column(Text, nullable=True)
+    run_uuid = Column(UUID(as_uuid=True), nullable=True)  # corrida en la que falló por primera vez
+    next_attempt_at = Column(BigInteger, nullable=False)
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+class ProcessDeadLetter(Base):
+    """Par que agotó PROCESS_RETRY_MAX_ATTEMPTS; solo se vuelve a intentar al hacer replay"""
+    __tablename__ = "process_dead_letters"
+    __table_args__ = (
+        UniqueConstraint("student_uuid", "course_uuid", name="uq_process_dead_letters_student_uuid_course_uuid"),
+        Index("ix_process_dead_letters_dead_at", "dead_at"),
+    )
+
+    uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    student_uuid = Column(UUID(as_uuid=True), ForeignKey("students.uuid"), nullable=False)
+    course_uuid = Column(UUID(as_uuid=True), ForeignKey("courses.uuid"), nullable=False)
+    stage = Column(String(20), nullable=False)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text, nullable=True)
+    run_uuid = Column(UUID(as_uuid=True), nullable=True)
+    first_failed_at = Column(BigInteger, nullable=False)
+    dead_at = Column(BigInteger, nullable=False)
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, BigInteger, Boolean, Enum, Index, Text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+import enum
+from app.utils.dataBase import Base
+
+class ProcessRunStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ProcessRun(Base):
+    """Una corrida del envío de métricas al servicio de predicción"""
+    __tablename__ = "process_runs"
+    __table_args__ = (
+        Index("ix_process_runs_queued_at", "queued_at"),
+    )
+
+    uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = Column(Enum(ProcessRunStatus), nullable=False, default=ProcessRunStatus.QUEUED)
+    full = Column(Boolean, nullable=False, default=False)
+
+    # Progreso (inscripciones)
+    total_enrollments = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    retries = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    # Tramos de estudiantes en process_work_items; al retomar solo se procesan los no terminados
+    work_items = Column(Integer, nullable=False, default=0)
+    work_items_done = Column(Integer, nullable=False, default=0)
+    resumed_count = Column(Integer, nullable=False, default=0)
+
+    queued_at = Column(BigInteger, nullable=False)
+    started_at = Column(BigInteger, nullable=True)  # cuando un worker la tomó
+    updated_at = Column(BigInteger, nullable=False)  # heartbeat, se actualiza con cada checkpoint de sus work items
+    finished_at = Column(BigInteger, nullable=True)
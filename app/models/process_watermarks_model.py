@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, BigInteger, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.utils.dataBase import Base
+
+class ProcessWatermark(Base):
+    """Último estado enviado al servicio de predicción por (estudiante, curso)"""
+    __tablename__ = "process_watermarks"
+
+    student_uuid = Column(UUID(as_uuid=True), ForeignKey("students.uuid"), primary_key=True)
+    course_uuid = Column(UUID(as_uuid=True), ForeignKey("courses.uuid"), primary_key=True)
+    input_updated_at = Column(BigInteger, nullable=True)  # máximo updated_at de entregas y tareas procesado
+    feature_hash = Column(String(64), nullable=False)  # sha256 del vector de métricas enviado
+    processed_at = Column(BigInteger, nullable=False)
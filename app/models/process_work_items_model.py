@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Enum, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+import enum
+from app.utils.dataBase import Base
+
+class ProcessWorkItemStatus(enum.Enum):
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+class ProcessWorkItem(Base):
+    """Un tramo de estudiantes de una corrida; los workers lo toman con SELECT ... FOR UPDATE SKIP LOCKED"""
+    __tablename__ = "process_work_items"
+    __table_args__ = (
+        Index("ix_process_work_items_run_uuid_status", "run_uuid", "status"),
+    )
+
+    uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_uuid = Column(UUID(as_uuid=True), ForeignKey("process_runs.uuid"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+
+    # Estudiantes del tramo (inclusive), en el orden de sus uuid
+    first_student_uuid = Column(UUID(as_uuid=True), nullable=False)
+    last_student_uuid = Column(UUID(as_uuid=True), nullable=False)
+    enrollments = Column(Integer, nullable=False, default=0)
+
+    status = Column(Enum(ProcessWorkItemStatus), nullable=False, default=ProcessWorkItemStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    lease_owner = Column(String(255), nullable=True)  # host:pid del worker que lo tiene
+    lease_expires_at = Column(BigInteger, nullable=True)  # vencido, cualquier worker lo puede volver a tomar
+
+    # Progreso (inscripciones)
+    processed = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    retries = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, ForeignKey, Integer
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
@@ -7,6 +7,11 @@ from app.utils.dataBase import Base
 
 class Section(Base):
     __tablename__ = "sections"
+    __table_args__ = (
+        Index("ix_sections_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_sections_section_code_trgm", "section_code", postgresql_using="gin", postgresql_ops={"section_code": "gin_trgm_ops"}),
+        Index("ix_sections_created_at_uuid", "created_at", "uuid"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -1,12 +1,20 @@
-from sqlalchemy import Column, String, BigInteger
+from sqlalchemy import Column, String, BigInteger, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from app.utils.dataBase import Base
+from app.utils.search import search_vector_column, SEARCH_VECTOR_MAPPER_ARGS
 
 class Student(Base):
     __tablename__ = "students"
+    __mapper_args__ = SEARCH_VECTOR_MAPPER_ARGS
+    __table_args__ = (
+        Index("ix_students_first_name_trgm", "first_name", postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"}),
+        Index("ix_students_last_name_trgm", "last_name", postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"}),
+        Index("ix_students_created_at_uuid", "created_at", "uuid"),
+        Index("ix_students_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     first_name = Column(String, nullable=False)
@@ -14,6 +22,7 @@ class Student(Base):
     email = Column(String, unique=True, nullable=False)
     created_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp())
     updated_at = Column(BigInteger, default=datetime.now(timezone.utc).timestamp(), onupdate=datetime.now(timezone.utc).timestamp())
+    search_vector = search_vector_column(first_name="A", last_name="A", email="B")
 
     # Relaciones
     enrollments = relationship("Enrollment", back_populates="student")
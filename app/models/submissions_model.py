@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, ForeignKey, Text, Float
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Text, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
@@ -7,6 +7,11 @@ from app.utils.dataBase import Base
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        Index("ix_submissions_assignment_uuid", "assignment_uuid"),
+        Index("ix_submissions_student_uuid_assignment_uuid", "student_uuid", "assignment_uuid"),
+        Index("ix_submissions_created_at_uuid", "created_at", "uuid"),
+    )
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     assignment_uuid = Column(UUID(as_uuid=True), ForeignKey("assignments.uuid"))
@@ -28,3 +28,11 @@ class StudentData(BaseModel):
     mentor_total_words_exchanged: int = Field(..., description="Total de palabras intercambiadas con mentor")
     mentor_before_task_help: int = Field(..., description="Número de ayudas de mentor antes de tareas")
     mentor_after_low_grade: int = Field(..., description="Número de ayudas de mentor después de calificaciones bajas")
+
+class StudentPredictionItem(BaseModel):
+    user_uuid: str = Field(..., description="UUID del estudiante")
+    course_id: str = Field(..., description="Código del curso")
+    data: StudentData
+
+class StudentPredictionBatch(BaseModel):
+    items: List[StudentPredictionItem] = Field(..., description="Pares estudiante-curso a procesar")
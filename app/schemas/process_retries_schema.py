@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from uuid import UUID
+
+class ProcessDeadLetterResponse(BaseModel):
+    uuid: UUID
+    student_uuid: UUID
+    course_uuid: UUID
+    stage: str
+    attempts: int
+    last_error: Optional[str] = None
+    run_uuid: Optional[UUID] = None
+    first_failed_at: int
+    dead_at: int
+
+    class Config:
+        from_attributes = True
+
+class ProcessDeadLetterReplay(BaseModel):
+    uuids: Optional[List[UUID]] = None  # sin uuids se reintentan todos (o todos los de stage)
+    stage: Optional[str] = None
+
+class ProcessDeadLetterReplayed(BaseModel):
+    replayed: int
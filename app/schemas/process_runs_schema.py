@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from app.models.process_runs_model import ProcessRunStatus
+
+class ProcessRunResponse(BaseModel):
+    uuid: UUID
+    status: ProcessRunStatus
+    full: bool
+    total_enrollments: int
+    processed: int
+    sent: int
+    skipped: int
+    failed: int
+    retries: int
+    progress: float
+    last_error: Optional[str] = None
+    work_items: int
+    work_items_done: int
+    resumed_count: int
+    queued_at: int
+    started_at: Optional[int] = None
+    updated_at: int
+    finished_at: Optional[int] = None
+    elapsed_seconds: int
+
+class ProcessRunStarted(BaseModel):
+    message: str
+    run_uuid: UUID
+    resumed: bool
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+
+class SearchHit(BaseModel):
+    type: str
+    uuid: UUID
+    title: str
+    subtitle: Optional[str] = None
+    rank: float
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    facets: dict[str, int]
+    items: list[SearchHit]
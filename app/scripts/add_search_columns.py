@@ -0,0 +1,35 @@
+"""Agrega las columnas search_vector (tsvector generadas) y sus índices GIN a una base existente.
+
+Uso: python -m app.scripts.add_search_columns
+
+Agregar una columna generada reescribe la tabla con un lock exclusivo, así que
+conviene correrlo fuera de horario. Los índices se crean después con CONCURRENTLY.
+Cuando termina se puede pasar a SEARCH_MODE=fulltext.
+"""
+from sqlalchemy.schema import CreateIndex
+from app.utils.dataBase import Base, engine
+import app.models  # registra todos los modelos en Base.metadata
+
+def add_search_columns():
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in Base.metadata.sorted_tables:
+            column = table.c.get("search_vector")
+            if column is None:
+                continue
+
+            print(f"Agregando {table.name}.search_vector...")
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({column.computed.sqltext}) STORED"
+            )
+
+            for index in table.indexes:
+                if "search_vector" in index.columns:
+                    index.dialect_kwargs["postgresql_concurrently"] = True
+                    print(f"Creando {index.name}...")
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+
+    print("¡Columnas de búsqueda creadas exitosamente! Ya se puede usar SEARCH_MODE=fulltext")
+
+if __name__ == "__main__":
+    add_search_columns()
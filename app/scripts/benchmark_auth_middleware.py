@@ -0,0 +1,125 @@
+"""Compara el overhead por request del middleware de auth con BaseHTTPMiddleware vs ASGI puro.
+
+Uso: python -m app.scripts.benchmark_auth_middleware [requests]
+
+La validación del token se reemplaza por un stub que responde al instante, así
+lo que se mide es solo el costo del middleware y no el del servicio de auth.
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Valores por defecto para poder correrlo sin .env
+os.environ.setdefault("SUPABASE_PASSWORD", "benchmark")
+os.environ.setdefault("API_AUTH_URL", "http://localhost")
+os.environ.setdefault("API_PREDICTION_URL", "http://localhost")
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app.utils.auth_middleware import AuthMiddleware
+
+USER = {"uuid": "00000000-0000-0000-0000-000000000000"}
+
+
+async def stub_authenticate(access_token: str):
+    return USER
+
+
+async def endpoint(request: Request):
+    return PlainTextResponse(request.state.user["uuid"])
+
+
+def build_base_http_app() -> Starlette:
+    """Réplica del middleware anterior basado en @app.middleware("http")"""
+    async def verify_access_token(request: Request, call_next):
+        if request.method == "OPTIONS":
+            return await call_next(request)
+        if request.headers.get("X-HTTP-PURPOSE") == "internal":
+            return await call_next(request)
+        if request.url.path in ["/docs", "/openapi.json", '/api/v1/health']:
+            return await call_next(request)
+
+        auth_header = request.headers.get("authorization")
+        if not auth_header or not auth_header.lower().startswith("bearer "):
+            return JSONResponse(status_code=401, content={"detail": "Access token not found or invalid"})
+
+        user = await stub_authenticate(auth_header.split(" ")[1])
+        if user is None:
+            return JSONResponse(status_code=401, content={"detail": "Access token invalid"})
+        request.state.user = user
+        return await call_next(request)
+
+    app = Starlette(routes=[Route("/bench", endpoint)])
+    app.add_middleware(BaseHTTPMiddleware, dispatch=verify_access_token)
+    return app
+
+
+def build_asgi_app() -> Starlette:
+    app = Starlette(routes=[Route("/bench", endpoint)])
+    app.add_middleware(AuthMiddleware, authenticate=stub_authenticate)
+    return app
+
+
+async def call(app: Starlette) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/bench",
+        "raw_path": b"/bench",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"authorization", b"Bearer benchmark-token")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 4002),
+    }
+
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Como un servidor real: el cliente se desconecta cuando termina la respuesta
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"Unexpected status {message['status']}")
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_done.set()
+
+    await app(scope, receive, send)
+
+
+async def measure(app: Starlette, requests: int) -> float:
+    for _ in range(min(requests, 1000)):
+        await call(app)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    base_http = await measure(build_base_http_app(), requests)
+    asgi = await measure(build_asgi_app(), requests)
+    print(f"Requests: {requests}")
+    print(f"BaseHTTPMiddleware: {base_http:.1f} us/request")
+    print(f"ASGI middleware:    {asgi:.1f} us/request")
+    print(f"Overhead saved:     {base_http - asgi:.1f} us/request ({(1 - asgi / base_http) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
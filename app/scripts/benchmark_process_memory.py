@@ -0,0 +1,58 @@
+"""Compara la memoria que usa recorrer las inscripciones para repartir una corrida del proceso.
+
+Uso: python -m app.scripts.benchmark_process_memory
+
+Mide con tracemalloc el pico de memoria de:
+  - all=True: get_all_enrollments(all=True) con estudiante y curso cargados, como
+    lo hacía el proceso antes de los work items.
+  - streaming: iter_enrolled_students, que lee (estudiante, inscripciones) con un
+    cursor del servidor de a PROCESS_STREAM_CHUNK_SIZE filas y arma los tramos de
+    PROCESS_WORK_ITEM_STUDENTS estudiantes sin guardarlos a todos.
+El pico del streaming no debería crecer con la cantidad de inscripciones.
+"""
+import time
+import tracemalloc
+
+from app.core.config import settings
+from app.services.enrollment_service import EnrollmentDataAccess
+from app.services.process_service import ProcessDataAccess
+from app.utils.dataBase import SessionLocal
+
+def measure(name: str, function):
+    session = SessionLocal()
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        enrollments = function(session)
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        session.close()
+    print(f"{name:>10} {enrollments:>12} {seconds:>9.2f} {peak / 2 ** 20:>10.1f}")
+    return peak
+
+def load_all(session) -> int:
+    enrollments = EnrollmentDataAccess(session).get_all_enrollments(all=True) or []
+    for enrollment in enrollments:
+        enrollment.student.email, enrollment.course.code
+    return len(enrollments)
+
+def stream(session) -> int:
+    size = max(1, settings.PROCESS_WORK_ITEM_STUDENTS)
+    work_items = students = enrollments = 0
+    for _, count in ProcessDataAccess(session).iter_enrolled_students():
+        if students % size == 0:
+            work_items += 1
+        students += 1
+        enrollments += count
+    return enrollments
+
+def benchmark():
+    print(f"{'':>10} {'inscripciones':>12} {'segundos':>9} {'pico (MB)':>10}")
+    all_peak = measure("all=True", load_all)
+    stream_peak = measure("streaming", stream)
+    print(f"El streaming usa {all_peak / max(1, stream_peak):.1f}x menos memoria")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,80 @@
+"""Mide cómo escala el cálculo de métricas del proceso de predicción con 1, 2, 4 y 8 procesos.
+
+Uso: python -m app.scripts.benchmark_process_shards [tamaño_de_lote] [shards...]
+
+Calcula las métricas (consultas, NumPy y hash del vector) de todos los estudiantes
+inscritos, sin enviar nada, igual que lo hace cada work item del worker con
+PROCESS_SHARDS. El tiempo incluye el arranque del pool. Verifica además que todos
+los shards den los mismos hashes que la corrida en un solo proceso.
+"""
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select
+
+from app.models import Enrollment
+from app.services.process_service import ProcessDataAccess, compute_shard_chunk
+from app.utils.dataBase import SessionLocal
+
+def enrolled_students():
+    session = SessionLocal()
+    try:
+        return sorted(session.scalars(select(Enrollment.student_uuid).distinct()))
+    finally:
+        session.close()
+
+def run_shards(chunks, shards: int):
+    """Devuelve {par: hash} y los segundos de cálculo acumulados por proceso"""
+    hashes = {}
+    compute_seconds = {}
+    if shards == 1:
+        session = SessionLocal()
+        try:
+            data_access = ProcessDataAccess(session)
+            for chunk in chunks:
+                started = time.perf_counter()
+                features = data_access.get_chunk_features(chunk, full=True)
+                compute_seconds[0] = compute_seconds.get(0, 0.0) + time.perf_counter() - started
+                hashes.update({pair: values[1] for pair, values in features.items()})
+        finally:
+            session.close()
+        return hashes, compute_seconds
+
+    with ProcessPoolExecutor(max_workers=shards, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for features, stats in pool.map(compute_shard_chunk, chunks, [True] * len(chunks)):
+            compute_seconds[stats["pid"]] = compute_seconds.get(stats["pid"], 0.0) + stats["seconds"]
+            hashes.update({pair: values[1] for pair, values in features.items()})
+    return hashes, compute_seconds
+
+def benchmark(chunk_size: int = 500, shard_counts=(1, 2, 4, 8)):
+    students = enrolled_students()
+    chunks = [students[start:start + chunk_size] for start in range(0, len(students), chunk_size)]
+    print(f"Estudiantes: {len(students)} | lotes de {chunk_size}: {len(chunks)} | CPUs: {multiprocessing.cpu_count()}")
+    print(f"{'shards':>6} {'segundos':>9} {'pares/s':>9} {'speedup':>8} {'cálculo/proceso':>16}")
+
+    baseline_seconds = None
+    baseline_hashes = None
+    ok = True
+    for shards in shard_counts:
+        started = time.perf_counter()
+        hashes, compute_seconds = run_shards(chunks, shards)
+        seconds = time.perf_counter() - started
+
+        if baseline_hashes is None:
+            baseline_seconds, baseline_hashes = seconds, hashes
+        elif hashes != baseline_hashes:
+            ok = False
+            print(f"  ¡{shards} shards dieron resultados distintos a 1 shard!")
+
+        per_process = sum(compute_seconds.values()) / max(1, len(compute_seconds))
+        print(f"{shards:>6} {seconds:>9.2f} {len(hashes) / seconds:>9.0f} {baseline_seconds / seconds:>7.2f}x {per_process:>15.2f}s")
+
+    print("Sin diferencias" if ok else "Hay diferencias entre shards")
+    return ok
+
+if __name__ == "__main__":
+    chunk_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    shard_counts = tuple(int(value) for value in sys.argv[2:]) or (1, 2, 4, 8)
+    sys.exit(0 if benchmark(chunk_size, shard_counts) else 1)
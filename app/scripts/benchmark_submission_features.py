@@ -0,0 +1,86 @@
+"""Compara el cálculo de métricas de entregas en Python (por par) con el columnar de NumPy sobre datos sintéticos.
+
+Uso: python -m app.scripts.benchmark_submission_features [entregas] [pares]
+
+Por defecto genera 1.000.000 de entregas repartidas en 50.000 pares
+(estudiante, curso), con notas y fechas límite nulas como en la base real.
+Verifica que ambos cálculos coincidan (tolerancia relativa 1e-9) y termina con
+código 1 si no.
+"""
+import math
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from app.services.process_service import performance_metrics, submission_metrics
+from app.utils.submission_features import grouped_submission_features
+
+METRICS = (
+    "avg_grade",
+    "grade_stddev",
+    "retry_rate",
+    "avg_delivery_delay_days",
+    "avg_submission_time_diff_hours",
+    "late_submissions_count",
+    "completed_tasks",
+)
+
+def synthetic_submissions(n_submissions: int, n_pairs: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    group = rng.integers(0, n_pairs, n_submissions)
+    assignment = rng.integers(0, 40, n_submissions)
+    created_at = 1_700_000_000 + rng.integers(0, 120 * 24 * 3600, n_submissions)
+    due_date = (1_700_000_000 + rng.integers(0, 120 * 24 * 3600, 40)).astype(np.float64)[assignment]
+    due_date[assignment % 10 == 0] = np.nan  # tareas sin fecha límite
+    grade = np.round(rng.uniform(0, 100, n_submissions), 2)
+    grade[rng.random(n_submissions) < 0.2] = np.nan  # entregas sin calificar
+    return group, assignment, created_at, due_date, grade
+
+def python_features(group, assignment, created_at, due_date, grade, n_pairs: int):
+    submissions = defaultdict(list)
+    grades = defaultdict(list)
+    # Mismo orden que la consulta: por created_at
+    for i in np.argsort(created_at, kind="stable").tolist():
+        due = None if math.isnan(due_date[i]) else int(due_date[i])
+        submissions[group[i]].append((assignment[i], created_at[i], due))
+        if not math.isnan(grade[i]):
+            grades[group[i]].append(grade[i])
+    return [
+        {**performance_metrics(grades[pair]), **submission_metrics(submissions[pair], 0)}
+        for pair in range(n_pairs)
+    ]
+
+def benchmark(n_submissions: int = 1_000_000, n_pairs: int = 50_000):
+    group, assignment, created_at, due_date, grade = synthetic_submissions(n_submissions, n_pairs)
+    print(f"Entregas: {n_submissions} | pares: {n_pairs}")
+
+    started = time.perf_counter()
+    columns = [column.tolist() for column in (group, assignment, created_at, due_date, grade)]
+    expected = python_features(*columns, n_pairs)
+    python_seconds = time.perf_counter() - started
+    print(f"Python: {python_seconds:.2f}s")
+
+    started = time.perf_counter()
+    features = grouped_submission_features(group, assignment, created_at, due_date, grade, n_pairs)
+    numpy_seconds = time.perf_counter() - started
+    print(f"NumPy:  {numpy_seconds:.2f}s ({python_seconds / numpy_seconds:.1f}x)")
+
+    features = {name: values.tolist() for name, values in features.items()}
+    mismatches = [
+        (pair, name)
+        for pair in range(n_pairs)
+        for name in METRICS
+        if not math.isclose(expected[pair][name], features[name][pair], rel_tol=1e-9, abs_tol=1e-9)
+    ]
+    for pair, name in mismatches[:20]:
+        print(f"  par {pair} {name}: python={expected[pair][name]!r} numpy={features[name][pair]!r}")
+
+    print("Sin diferencias" if not mismatches else f"{len(mismatches)} métricas con diferencias")
+    return not mismatches
+
+if __name__ == "__main__":
+    n_submissions = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_pairs = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    sys.exit(0 if benchmark(n_submissions, n_pairs) else 1)
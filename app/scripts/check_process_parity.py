@@ -0,0 +1,68 @@
+"""Compara las métricas del cálculo en bloque (get_all_students_data) con el cálculo por par (get_student_data).
+
+Uso: python -m app.scripts.check_process_parity [max_pares]
+
+El cálculo en bloque en Python tiene que devolver exactamente los mismos valores
+para cada (estudiante, curso) inscrito. El cálculo columnar con NumPy suma en
+otro orden, así que sus métricas decimales se comparan con tolerancia relativa
+de 1e-9 y las enteras exactamente. Si algún par difiere se lista y el script
+termina con código 1.
+"""
+import math
+import sys
+import time
+from app.utils.dataBase import SessionLocal
+from app.services.process_service import ProcessDataAccess
+
+ENGINES = ("python", "numpy")
+
+def same_value(expected, actual, exact: bool) -> bool:
+    if exact or not isinstance(expected, float) or not isinstance(actual, float):
+        return expected == actual and type(expected) is type(actual)
+    return math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9)
+
+def differences(expected: dict, actual: dict, exact: bool) -> list:
+    keys = list(dict.fromkeys([*expected, *actual]))
+    return [key for key in keys if not same_value(expected.get(key), actual.get(key), exact)]
+
+def check_process_parity(max_pairs: int = None):
+    session = SessionLocal()
+    try:
+        data_access = ProcessDataAccess(session)
+
+        bulk = {}
+        bulk_seconds = {}
+        for engine in ENGINES:
+            started = time.perf_counter()
+            bulk[engine] = data_access.get_all_students_data(engine=engine)
+            bulk_seconds[engine] = time.perf_counter() - started
+
+        all_pairs = list(bulk["python"])
+        pairs = all_pairs[:max_pairs] if max_pairs else all_pairs
+        started = time.perf_counter()
+        mismatches = []
+        for student_uuid, course_uuid in pairs:
+            expected = data_access.get_student_data(student_uuid, course_uuid)
+            for engine in ENGINES:
+                actual = bulk[engine].get((student_uuid, course_uuid), {})
+                keys = differences(expected, actual, exact=engine == "python")
+                if keys:
+                    mismatches.append((engine, student_uuid, course_uuid, keys, expected, actual))
+        per_pair_seconds = time.perf_counter() - started
+    finally:
+        session.close()
+
+    print(f"Pares: {len(all_pairs)} (comparados: {len(pairs)})")
+    print(" | ".join(f"En bloque ({engine}): {bulk_seconds[engine]:.3f}s" for engine in ENGINES) + f" | por par: {per_pair_seconds:.3f}s")
+
+    for engine, student_uuid, course_uuid, keys, expected, actual in mismatches:
+        print(f"\nDiferencia ({engine}) en estudiante {student_uuid}, curso {course_uuid}:")
+        for key in keys:
+            print(f"  {key}: por par={expected.get(key)!r} en bloque={actual.get(key)!r}")
+
+    print("\nSin diferencias" if not mismatches else f"\n{len(mismatches)} pares con diferencias")
+    return not mismatches
+
+if __name__ == "__main__":
+    max_pairs = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    sys.exit(0 if check_process_parity(max_pairs) else 1)
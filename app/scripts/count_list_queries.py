@@ -0,0 +1,74 @@
+"""Cuenta las consultas SQL que emite cada endpoint de listado según el tamaño de página.
+
+Uso: python -m app.scripts.count_list_queries [limit ...]
+
+Con las relaciones de las respuestas cargadas de forma anticipada, la cantidad
+de consultas no depende de cuántas filas trae la página. Si algún endpoint
+emite más consultas con páginas más grandes (N+1), se lista al final y el
+script termina con código 1.
+"""
+import sys
+from types import SimpleNamespace
+from sqlalchemy import event
+from app.utils.dataBase import SessionLocal, engine
+from app.services.career_service import CareerService
+from app.services.course_service import CourseService
+from app.services.section_service import SectionService
+from app.services.enrollment_service import EnrollmentService
+from app.services.submission_service import SubmissionService
+from app.services.content_service import ContentService
+from app.services.assignment_service import AssignmentService
+from app.services.student_service import StudentService
+
+DEFAULT_LIMITS = [1, 10, 100]
+
+ENDPOINTS = {
+    "/careers/get-all": lambda session, request, limit: CareerService(session, request).get_all_careers(limit=limit),
+    "/courses/get-all": lambda session, request, limit: CourseService(session, request).get_all_courses(limit=limit),
+    "/sections/get-all": lambda session, request, limit: SectionService(session, request).get_all_sections(limit=limit),
+    "/enrollments/get-all": lambda session, request, limit: EnrollmentService(session, request).get_all_enrollments(limit=limit),
+    "/submissions/get-all": lambda session, request, limit: SubmissionService(session, request).get_all_submissions(limit=limit),
+    "/content/get-all": lambda session, request, limit: ContentService(session, request).get_all_contents(limit=limit),
+    "/assignments/get-all": lambda session, request, limit: AssignmentService(session, request).get_all_assignments(limit=limit),
+    "/students/get-all": lambda session, request, limit: StudentService(session, request).get_all_students(limit=limit),
+}
+
+def count_queries(endpoint, limit: int):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Request sin usuario: sin filtro de alcance, la página trae todas las filas posibles
+    request = SimpleNamespace(state=SimpleNamespace())
+    session = SessionLocal()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        items = endpoint(session, request, limit)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        session.close()
+
+    rows = len(items) if isinstance(items, list) else 0
+    return rows, len(statements)
+
+def count_list_queries(limits):
+    growing = []
+
+    for name, endpoint in ENDPOINTS.items():
+        counts = []
+        for limit in limits:
+            rows, queries = count_queries(endpoint, limit)
+            counts.append(queries)
+            print(f"{name:<24} limit={limit:<5} filas={rows:<5} consultas={queries}")
+        if len(set(counts)) > 1:
+            growing.append(name)
+
+    print("\nConsultas que crecen con el tamaño de página:" if growing else "\nTodas las páginas usan una cantidad constante de consultas")
+    for name in growing:
+        print(f"  - {name}")
+    return not growing
+
+if __name__ == "__main__":
+    limits = [int(arg) for arg in sys.argv[1:]] or DEFAULT_LIMITS
+    sys.exit(0 if count_list_queries(limits) else 1)
@@ -0,0 +1,32 @@
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateIndex
+from app.utils.dataBase import Base, engine
+import app.models  # registra todos los modelos en Base.metadata
+
+def create_indexes():
+    """Crea los índices declarados en los modelos sobre una base existente, sin bloquear escrituras"""
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        print("Habilitando pg_trgm...")
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                print(f"Saltando la tabla {table.name}: no existe")
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                # Las columnas search_vector se agregan aparte con add_search_columns, que crea sus índices
+                missing = [column.name for column in index.columns if column.name not in existing_columns]
+                if missing:
+                    print(f"Saltando {index.name}: falta la columna {', '.join(missing)} (python -m app.scripts.add_search_columns)")
+                    continue
+                index.dialect_kwargs["postgresql_concurrently"] = True
+                print(f"Creando {index.name}...")
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+    print("¡Índices creados exitosamente!")
+
+if __name__ == "__main__":
+    create_indexes()
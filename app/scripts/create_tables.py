@@ -10,6 +10,10 @@ from app.models.submissions_model import Submission
 from app.models.content_model import Content
 from app.models.course_content import CourseContent
 from app.models.course_sections_model import CourseSection
+from app.models.process_watermarks_model import ProcessWatermark
+from app.models.process_runs_model import ProcessRun
+from app.models.process_work_items_model import ProcessWorkItem
+from app.models.process_retries_model import ProcessRetry, ProcessDeadLetter
 
 def create_tables():
     print("Eliminando tablas existentes...")
@@ -0,0 +1,79 @@
+"""Muestra el plan de ejecución (EXPLAIN) de la consulta de cada endpoint de listado.
+
+Uso: python -m app.scripts.explain_list_queries [--analyze]
+
+Los filtros se completan con valores reales tomados de la base. Al final se
+listan las consultas cuyo plan todavía incluye un Seq Scan.
+"""
+import sys
+from psycopg2.extras import register_uuid
+from sqlalchemy import select
+from app.utils.dataBase import SessionLocal, engine
+from app.models import Enrollment, Assignment, Student, Course
+from app.services.career_service import careers_query
+from app.services.course_service import courses_query
+from app.services.section_service import sections_query
+from app.services.enrollment_service import enrollments_query
+from app.services.submission_service import submissions_query
+from app.services.content_service import contents_query
+from app.services.assignment_service import assignments_query
+from app.services.student_service import students_query
+from app.utils.access_scope import resolve_access_scope
+
+def sample_values():
+    session = SessionLocal()
+    try:
+        enrollment = session.scalars(select(Enrollment).limit(1)).first()
+        assignment = session.scalars(select(Assignment).limit(1)).first()
+        student = session.get(Student, enrollment.student_uuid) if enrollment else None
+        course = session.get(Course, enrollment.course_uuid) if enrollment else None
+        return {
+            "student_uuid": str(enrollment.student_uuid) if enrollment else None,
+            "course_uuid": str(enrollment.course_uuid) if enrollment else None,
+            "section_uuid": str(enrollment.section_uuid) if enrollment else None,
+            "assignment_uuid": str(assignment.uuid) if assignment else None,
+            "assignment_name": assignment.title[:4] if assignment else "tarea",
+            "course_code": course.code[:3] if course else "DWS",
+            "search": student.first_name[:4] if student else "ana",
+            "scope": resolve_access_scope(session, enrollment.student_uuid) if enrollment else None,
+        }
+    finally:
+        session.close()
+
+def list_queries(v):
+    return {
+        "/careers/get-all": careers_query(search=v["search"], _access_scope=v["scope"]),
+        "/courses/get-all": courses_query(search=v["search"], course_code=v["course_code"], _access_scope=v["scope"]),
+        "/sections/get-all": sections_query(course_uuid=v["course_uuid"], search=v["search"], _access_scope=v["scope"]),
+        "/students/get-all": students_query(course_uuid=v["course_uuid"]),
+        "/assignments/get-all": assignments_query(course_uuid=v["course_uuid"], search=v["search"], _access_scope=v["scope"]),
+        "/enrollments/get-all": enrollments_query(course_code=v["course_code"], search=v["search"], _current_user_uuid=v["student_uuid"]),
+        "/enrollments/get-all?course_uuid": enrollments_query(course_uuid=v["course_uuid"], section_uuid=v["section_uuid"]),
+        "/submissions/get-all": submissions_query(assignment_uuid=v["assignment_uuid"], search=v["search"], _current_user_uuid=v["student_uuid"]),
+        "/submissions/get-all?course_uuid": submissions_query(course_uuid=v["course_uuid"], assignment_name=v["assignment_name"]),
+        "/content/get-all": contents_query(course_uuid=v["course_uuid"], search=v["search"], _access_scope=v["scope"]),
+    }
+
+def explain_list_queries(analyze: bool = False):
+    # Los uuids del scope llegan como UUID a los parámetros que se pasan directo al driver
+    register_uuid()
+    values = sample_values()
+    with_seq_scan = []
+
+    with engine.connect() as conn:
+        for name, query in list_queries(values).items():
+            compiled = query.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+            explain = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+            plan = [row[0] for row in conn.exec_driver_sql(explain + str(compiled), compiled.params)]
+
+            print(f"\n=== {name}")
+            print("\n".join(plan))
+            if any("Seq Scan" in line for line in plan):
+                with_seq_scan.append(name)
+
+    print("\nConsultas con Seq Scan:" if with_seq_scan else "\nNinguna consulta usa Seq Scan")
+    for name in with_seq_scan:
+        print(f"  - {name}")
+
+if __name__ == "__main__":
+    explain_list_queries(analyze="--analyze" in sys.argv)
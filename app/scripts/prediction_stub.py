@@ -0,0 +1,103 @@
+"""Stub local de los servicios de users y predicción para probar el proceso sin red.
+
+Uso: python -m app.scripts.prediction_stub [--port 8001] [--max-batch N] [--no-batch] [--latency-ms N]
+
+Responde los mismos endpoints que usa ProcessDispatcher:
+  PATCH /internal/users_services/get_or_create_user
+  POST  /process/predictions/process_student_data           (un par por request)
+  POST  /process/predictions/process_student_data_batch     (lotes)
+  GET   /stats                                              (contadores recibidos)
+  PUT   /failures                                           (usuarios y cursos que responden 500)
+
+Para correr el proceso contra el stub:
+  API_AUTH_URL=http://localhost:8001 API_PREDICTION_URL=http://localhost:8001 \\
+  PROCESS_PREDICTION_BATCH_SIZE=100 uvicorn main:app
+
+--max-batch rechaza con 413 los lotes más grandes y --no-batch responde 404 al
+endpoint de lotes, para ver el envío de a uno como fallback. PUT /failures con
+{"users": [uuid, ...], "courses": [código, ...]} hace fallar a esos usuarios en
+get_or_create_user y a esos cursos en predicción, para ver los reintentos y los
+dead letters; {} vuelve a aceptar todo.
+"""
+import argparse
+import asyncio
+
+from fastapi import FastAPI, HTTPException, Request
+
+from app.schemas.prediction_model_schema import StudentData, StudentPredictionBatch
+
+def create_stub_app(max_batch: int = None, batch_enabled: bool = True, latency_ms: int = 0) -> FastAPI:
+    app = FastAPI(title="Prediction stub")
+    app.state.stats = {"users": 0, "single": 0, "batches": 0, "batch_items": 0, "rejected_batches": 0, "max_batch_bytes": 0}
+    app.state.received = {}
+    app.state.failing_users = set()
+    app.state.failing_courses = set()
+    stats = app.state.stats
+
+    async def wait():
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    @app.patch("/internal/users_services/get_or_create_user")
+    async def get_or_create_user(payload: dict):
+        await wait()
+        if payload.get("uuid") in app.state.failing_users:
+            raise HTTPException(status_code=500, detail="User sync failed")
+        stats["users"] += 1
+        return {"uuid": payload.get("uuid"), "email": payload.get("email")}
+
+    @app.post("/process/predictions/process_student_data")
+    async def process_student_data(user_uuid: str, course_id: str, data: StudentData):
+        await wait()
+        if course_id in app.state.failing_courses:
+            raise HTTPException(status_code=500, detail="Prediction failed")
+        stats["single"] += 1
+        app.state.received[(user_uuid, course_id)] = data.model_dump()
+        return {"message": "ok"}
+
+    @app.post("/process/predictions/process_student_data_batch")
+    async def process_student_data_batch(request: Request, batch: StudentPredictionBatch):
+        await wait()
+        if not batch_enabled:
+            raise HTTPException(status_code=404, detail="Not Found")
+        if max_batch and len(batch.items) > max_batch:
+            stats["rejected_batches"] += 1
+            raise HTTPException(status_code=413, detail=f"Batch larger than {max_batch} items")
+
+        if any(item.course_id in app.state.failing_courses for item in batch.items):
+            raise HTTPException(status_code=500, detail="Prediction failed")
+
+        stats["batches"] += 1
+        stats["batch_items"] += len(batch.items)
+        stats["max_batch_bytes"] = max(stats["max_batch_bytes"], len(await request.body()))
+        for item in batch.items:
+            app.state.received[(item.user_uuid, item.course_id)] = item.data.model_dump()
+        return {"message": "ok", "processed": len(batch.items)}
+
+    @app.put("/failures")
+    async def set_failures(failures: dict):
+        app.state.failing_users = set(failures.get("users", []))
+        app.state.failing_courses = set(failures.get("courses", []))
+        return {"users": len(app.state.failing_users), "courses": len(app.state.failing_courses)}
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "pairs": len(app.state.received)}
+
+    return app
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub de los servicios de users y predicción")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--max-batch", type=int, default=None)
+    parser.add_argument("--no-batch", action="store_true")
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_stub_app(args.max_batch, not args.no_batch, args.latency_ms),
+        host="127.0.0.1",
+        port=args.port
+    )
@@ -2,15 +2,41 @@ import logging
 from fastapi import Request, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
-from sqlalchemy import or_
+from sqlalchemy import select
 from app.models.assignments_model import Assignment
 from app.models.courses_model import Course
 from app.models.enrollments_model import Enrollment
 from app.schemas.assignments_schema import AssignmentCreate, AssignmentUpdate, AssignmentResponse
+from app.utils.access_scope import AccessScope
+from app.utils.pagination import Cursor, paginate
+from app.utils.search import text_search
 from app.services.base_service import AppDataAccess, AppService
 
 logger = logging.getLogger('assignment_service')
 
+def assignments_query(skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+    items = select(Assignment)
+    if course_uuid:
+        items = items.filter(Assignment.course_uuid == course_uuid)
+    if search:
+        items = items.filter(text_search(Assignment, search, Assignment.title, Assignment.description))
+    if course_code:
+        items = items.filter(
+            Assignment.course.has(
+                Course.code.ilike(f"%{course_code}%")
+            )
+        )
+    if student_uuid:
+        items = items.filter(
+            Assignment.course.has(
+                Course.enrollments.any(Enrollment.student_uuid == student_uuid)
+            )
+        )
+    if _access_scope is not None:
+        items = items.filter(Assignment.course_uuid.in_(_access_scope.course_uuids))
+    items = paginate(items, Assignment, skip, limit, cursor)
+    return items
+
 class AssignmentDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -36,37 +62,8 @@ class AssignmentDataAccess(AppDataAccess):
         item = item.first()
         return item if item else None
     
-    def get_all_assignments(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, _current_user_uuid: str = None):
-        items = self.session.query(Assignment)
-        if course_uuid:
-            items = items.filter(Assignment.course_uuid == course_uuid)
-        if search:
-            items = items.filter(
-                or_(
-                    Assignment.title.ilike(f"%{search}%"), 
-                    Assignment.description.ilike(f"%{search}%")
-                )
-            )
-        if course_code:
-            items = items.filter(
-                Assignment.course.has(
-                    Course.code.ilike(f"%{course_code}%")
-                )
-            )
-        if student_uuid:
-            items = items.filter(
-                Assignment.course.has(
-                    Course.enrollments.any(Enrollment.student_uuid == student_uuid)
-                )
-            )
-        if _current_user_uuid:
-            items = items.filter(
-                Assignment.course.has(
-                    Course.enrollments.any(Enrollment.student_uuid == _current_user_uuid)
-                )
-            )
-        items = items.order_by(Assignment.created_at.desc())
-        items = items.offset(skip).limit(limit)
+    def get_all_assignments(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = self.session.scalars(assignments_query(skip, limit, course_uuid, search, course_code, student_uuid, cursor, _access_scope))
         items = items.all()
         return items if items else None
     
@@ -138,9 +135,9 @@ class AssignmentService(AppService):
             logger.error(f"Error getting assignment by uuid: {e}")
             raise HTTPException(status_code=500, detail="Error getting assignment by uuid")
         
-    def get_all_assignments(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None):
+    def get_all_assignments(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None):
         try:
-            items = self.data_access.get_all_assignments(skip, limit, course_uuid, search, course_code, student_uuid, self.current_user_uuid)
+            items = self.data_access.get_all_assignments(skip, limit, course_uuid, search, course_code, student_uuid, cursor, self.get_access_scope())
 
             if not items:
                 return HTTPException(status_code=404, detail="No assignments found")
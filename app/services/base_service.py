@@ -1,6 +1,8 @@
 import logging
 from fastapi import Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.access_scope import resolve_access_scope, resolve_access_scope_async
 
 class DBSessionMixin:
     def __init__(self, session: Session):
@@ -13,4 +15,27 @@ class AppService(DBSessionMixin):
     def __init__(self, session: Session, request: Request):
         super().__init__(session)
         self.request = request 
-        self.current_user_uuid = request.state.user.get('uuid') if hasattr(request.state, "user") else None
\ No newline at end of file
+        # Sin request (ej. el worker del proceso) no hay usuario
+        self.current_user_uuid = request.state.user.get('uuid') if hasattr(getattr(request, "state", None), "user") else None
+        # Permite que las lecturas posteriores del usuario vayan al primario (ver replicas.py)
+        self.session.info["user_uuid"] = self.current_user_uuid
+
+    def get_access_scope(self):
+        """Cursos, secciones y carreras visibles para el usuario; se resuelve una vez por request"""
+        return resolve_access_scope(self.session, self.current_user_uuid, self.request)
+
+class AsyncDBSessionMixin:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+class AsyncAppDataAccess(AsyncDBSessionMixin):
+    pass
+
+class AsyncAppService(AsyncDBSessionMixin):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session)
+        self.request = request
+        self.current_user_uuid = request.state.user.get('uuid') if hasattr(request.state, "user") else None
+
+    async def get_access_scope(self):
+        return await resolve_access_scope_async(self.session, self.current_user_uuid, self.request)
@@ -1,18 +1,20 @@
 import logging
 from fastapi import Request, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, select
 
 ## Models
 from app.models.career_model import Career
-from app.models.courses_model import Course
-from app.models.enrollments_model import Enrollment
 
 ## Schemas
 from app.schemas.careers_schema import CareerCreate, CareerUpdate, CareerResponse
 
 ## Services
-from app.services.base_service import AppDataAccess, AppService
+from app.utils.access_scope import AccessScope
+from app.utils.pagination import Cursor, paginate
+from app.utils.search import text_search
+from app.services.base_service import AppDataAccess, AppService, AsyncAppDataAccess, AsyncAppService
 
 ## Extras
 import logging
@@ -24,6 +26,23 @@ from datetime import datetime, timezone
 logger = logging.getLogger('career_service')    
 
 
+def careers_query(skip: int = 0, limit: int = 100, search: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+    items = select(Career)
+    if search:
+        items = items.filter(text_search(Career, search, Career.name, Career.code))
+    if _access_scope is not None:
+        items = items.filter(Career.uuid.in_(_access_scope.career_uuids))
+
+    items = paginate(items, Career, skip, limit, cursor)
+    return items
+
+
+# Relaciones que serializa CareerResponse; una colección, así que se carga con un IN en una segunda consulta
+CAREER_RESPONSE_OPTIONS = (
+    selectinload(Career.courses),
+)
+
+
 class CareerDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -43,31 +62,13 @@ class CareerDataAccess(AppDataAccess):
         return item
 
     def get_career_by_uuid(self, uuid: str):
-        item = self.session.query(Career)
+        item = self.session.query(Career).options(*CAREER_RESPONSE_OPTIONS)
         item = item.filter(Career.uuid == uuid)
         item = item.first()
         return item if item else None
     
-    def get_all_careers(self, skip: int = 0, limit: int = 100, search: str = None, _current_user_uuid: str = None):
-        items = self.session.query(Career)
-        if search:
-            items = items.filter(
-                or_(
-                    Career.name.ilike(f"%{search}%"), 
-                    Career.code.ilike(f"%{search}%")
-                )
-            )
-        if _current_user_uuid:
-            items = items.filter(
-                Career.courses.any(
-                    Course.enrollments.any(
-                        Enrollment.student_uuid == _current_user_uuid
-                    )
-                )
-            )
-
-        items = items.order_by(Career.created_at.desc())
-        items = items.offset(skip).limit(limit)
+    def get_all_careers(self, skip: int = 0, limit: int = 100, search: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = self.session.scalars(careers_query(skip, limit, search, cursor, _access_scope).options(*CAREER_RESPONSE_OPTIONS))
         items = items.all()
         return items
     
@@ -138,9 +139,9 @@ class CareerService(AppService):
             logger.error(f"Error getting career by uuid: {e}")
             raise HTTPException(status_code=500, detail="Error getting career by uuid")
         
-    def get_all_careers(self, skip: int = 0, limit: int = 100, search: str = None):
+    def get_all_careers(self, skip: int = 0, limit: int = 100, search: str = None, cursor: Cursor = None):
         try:
-            items = self.data_access.get_all_careers(skip, limit, search, self.current_user_uuid)
+            items = self.data_access.get_all_careers(skip, limit, search, cursor, self.get_access_scope())
             
             return [CareerResponse(
                 uuid=item.uuid,
@@ -192,4 +193,61 @@ class CareerService(AppService):
         except Exception as e:
             self.session.rollback()
             logger.error(f"Error deleting career: {e}")
-            raise HTTPException(status_code=500, detail="Error deleting career")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Error deleting career")
+
+class CareerAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_career_by_uuid(self, uuid: str):
+        item = select(Career).options(*CAREER_RESPONSE_OPTIONS)
+        item = item.filter(Career.uuid == uuid)
+        item = (await self.session.scalars(item)).first()
+        return item if item else None
+
+    async def get_all_careers(self, skip: int = 0, limit: int = 100, search: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = careers_query(skip, limit, search, cursor, _access_scope).options(*CAREER_RESPONSE_OPTIONS)
+        items = (await self.session.scalars(items)).all()
+        return items
+
+class CareerAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = CareerAsyncDataAccess(session)
+
+    async def get_career_by_uuid(self, uuid: str):
+        try:
+            item = await self.data_access.get_career_by_uuid(uuid)
+
+            if not item:
+                raise HTTPException(status_code=404, detail="Career not found")
+            
+            return CareerResponse(
+                uuid=item.uuid,
+                name=item.name,
+                code=item.code,
+                description=item.description,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                courses=item.courses
+            )
+        except Exception as e:
+            logger.error(f"Error getting career by uuid: {e}")
+            raise HTTPException(status_code=500, detail="Error getting career by uuid")
+        
+    async def get_all_careers(self, skip: int = 0, limit: int = 100, search: str = None, cursor: Cursor = None):
+        try:
+            items = await self.data_access.get_all_careers(skip, limit, search, cursor, await self.get_access_scope())
+            
+            return [CareerResponse(
+                uuid=item.uuid,
+                name=item.name,
+                code=item.code,
+                description=item.description,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                courses=item.courses
+            ) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting all careers: {e}")
+            raise HTTPException(status_code=500, detail="Error getting all careers")
@@ -2,23 +2,75 @@ import logging
 from fastapi import Request, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 from sqlalchemy import select, func
 import requests
 from app.models.content_model import Content
 from app.models.course_content import CourseContent
 from app.schemas.content_schema import ContentCreate, ContentUpdate, ContentResponse, CreateCoursesContent, CreateCoursesContentResponse
-from app.services.base_service import AppService, AppDataAccess
+from app.utils.access_scope import AccessScope
+from app.utils.pagination import Cursor, paginate
+from app.utils.search import text_search
+from app.services.base_service import AppService, AppDataAccess, AsyncAppService, AsyncAppDataAccess
 from uuid import UUID
 from playwright.sync_api import sync_playwright
 import tempfile
 import os
 from app.models.courses_model import Course
 from app.models.assignments_model import Assignment
-from app.models.enrollments_model import Enrollment
 from sqlalchemy import or_
 logger = logging.getLogger('content_service')
 
+def content_columns_query():
+    # Subconsulta para obtener los UUIDs de los cursos
+    courses_subquery = (
+        select(func.array_agg(CourseContent.course_uuid))
+        .where(CourseContent.content_uuid == Content.uuid)
+        .correlate(Content)
+        .scalar_subquery()
+    )
+    return select(
+        Content.uuid,
+        Content.title,
+        Content.description,
+        Content.file_url,
+        Content.file_type,
+        Content.file_size,
+        Content.created_at,
+        Content.updated_at,
+        courses_subquery.label('courses_list')
+    )
+
+def contents_query(skip: int = 0, limit: int = 100, course_uuid: str = None, course_code: str = None, assignment_name: str = None, search: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+    # Consulta principal con la subconsulta
+    items = content_columns_query().outerjoin(
+        CourseContent, 
+        Content.uuid == CourseContent.content_uuid
+    )
+    
+    if course_uuid:
+        items = items.filter(Content.course_contents.any(CourseContent.course_uuid == course_uuid))
+    if course_code:
+        items = items.filter(Content.course_contents.any(CourseContent.course.has(Course.code.ilike(f"%{course_code}%"))))
+    if assignment_name:
+        items = items.filter(Content.course_contents.any(CourseContent.assignment.has(Assignment.title.ilike(f"%{assignment_name}%"))))
+    if search:
+        items = items.filter(
+            or_(
+                text_search(Content, search, Content.title),
+                Content.course_contents.any(CourseContent.course.has(text_search(Course, search, Course.name, Course.code))),
+                Content.course_contents.any(CourseContent.assignment.has(text_search(Assignment, search, Assignment.title)))
+            )
+        )
+    if _access_scope is not None:
+        # course_contents ya está unida a la consulta
+        items = items.filter(CourseContent.course_uuid.in_(_access_scope.course_uuids))
+
+    items = items.group_by(Content.uuid)
+    items = paginate(items, Content, skip, limit, cursor)
+    return items
+
 class ContentDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -54,74 +106,13 @@ class ContentDataAccess(AppDataAccess):
         return item
     
     def get_content_by_uuid(self, uuid: UUID):
-        courses_subquery = (
-            select(func.array_agg(CourseContent.course_uuid))
-            .where(CourseContent.content_uuid == Content.uuid)
-            .correlate(Content)
-            .scalar_subquery()
-        )
-        item = self.session.query(
-            Content.uuid,
-            Content.title,
-            Content.description,
-            Content.file_url,
-            Content.file_type,
-            Content.file_size,
-            Content.created_at,
-            Content.updated_at,
-            courses_subquery.label('courses_list')
-        )
+        item = content_columns_query()
         item = item.filter(Content.uuid == uuid)
-        item = item.first() 
+        item = self.session.execute(item).first() 
         return item if item else None
     
-    def get_all_contents(self, skip: int = 0, limit: int = 100, course_uuid: str = None, course_code: str = None, assignment_name: str = None, search: str = None, _current_user_uuid: str = None):
-        # Subconsulta para obtener los UUIDs de los cursos
-        courses_subquery = (
-            select(func.array_agg(CourseContent.course_uuid))
-            .where(CourseContent.content_uuid == Content.uuid)
-            .correlate(Content)
-            .scalar_subquery()
-        )
-        
-        # Consulta principal con la subconsulta
-        items = self.session.query(
-            Content.uuid,
-            Content.title,
-            Content.description,
-            Content.file_url,
-            Content.file_type,
-            Content.file_size,
-            Content.created_at,
-            Content.updated_at,
-            courses_subquery.label('courses_list')
-        ).outerjoin(
-            CourseContent, 
-            Content.uuid == CourseContent.content_uuid
-        )
-        
-        if course_uuid:
-            items = items.filter(Content.course_contents.any(CourseContent.course_uuid == course_uuid))
-        if course_code:
-            items = items.filter(Content.course_contents.any(CourseContent.course.has(Course.code.ilike(f"%{course_code}%"))))
-        if assignment_name:
-            items = items.filter(Content.course_contents.any(CourseContent.assignment.has(Assignment.title.ilike(f"%{assignment_name}%"))))
-        if search:
-            items = items.filter(
-                or_(
-                    Content.title.ilike(f"%{search}%"),
-                    Content.course_contents.any(CourseContent.course.has(Course.name.ilike(f"%{search}%"))),
-                    Content.course_contents.any(CourseContent.assignment.has(Assignment.title.ilike(f"%{search}%"))),
-                    Content.course_contents.any(CourseContent.course.has(Course.code.ilike(f"%{search}%")))
-                )
-            )
-        if _current_user_uuid:
-            items = items.filter(Content.course_contents.any(CourseContent.course.has(Course.enrollments.any(Enrollment.student_uuid == _current_user_uuid))))
-
-        items = items.group_by(Content.uuid)
-        items = items.order_by(Content.created_at.desc())
-        items = items.offset(skip).limit(limit)
-        
+    def get_all_contents(self, skip: int = 0, limit: int = 100, course_uuid: str = None, course_code: str = None, assignment_name: str = None, search: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = self.session.execute(contents_query(skip, limit, course_uuid, course_code, assignment_name, search, cursor, _access_scope))
         items = items.all()
         return items if items else None
     
@@ -225,9 +216,9 @@ class ContentService(AppService):
             logger.error(f"Error getting content by uuid: {e}")
             raise HTTPException(status_code=500, detail="Error getting content by uuid")
         
-    def get_all_contents(self, skip: int = 0, limit: int = 100, course_uuid: str = None, course_code: str = None, assignment_name: str = None, search: str = None):
+    def get_all_contents(self, skip: int = 0, limit: int = 100, course_uuid: str = None, course_code: str = None, assignment_name: str = None, search: str = None, cursor: Cursor = None):
         try:
-            items = self.data_access.get_all_contents(skip, limit, course_uuid, course_code, assignment_name, search, self.current_user_uuid)
+            items = self.data_access.get_all_contents(skip, limit, course_uuid, course_code, assignment_name, search, cursor, self.get_access_scope())
             
             if not items:
                 raise HTTPException(status_code=404, detail="No contents found")
@@ -347,4 +338,68 @@ class ContentService(AppService):
 
         except Exception as e:
             logger.error(f"Error downloading content: {e}")
-            raise HTTPException(status_code=500, detail="Error downloading content")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Error downloading content")
+
+class ContentAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_content_by_uuid(self, uuid: UUID):
+        item = content_columns_query()
+        item = item.filter(Content.uuid == uuid)
+        item = (await self.session.execute(item)).first()
+        return item if item else None
+
+    async def get_all_contents(self, skip: int = 0, limit: int = 100, course_uuid: str = None, course_code: str = None, assignment_name: str = None, search: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = contents_query(skip, limit, course_uuid, course_code, assignment_name, search, cursor, _access_scope)
+        items = (await self.session.execute(items)).all()
+        return items if items else None
+
+class ContentAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = ContentAsyncDataAccess(session)
+
+    async def get_content_by_uuid(self, uuid: UUID):
+        try:
+            item = await self.data_access.get_content_by_uuid(uuid)
+
+            if not item:
+                raise HTTPException(status_code=404, detail="Content not found")
+            
+            return ContentResponse(
+                uuid=item.uuid,
+                title=item.title,
+                description=item.description,
+                file_url=item.file_url,
+                file_type=item.file_type,
+                file_size=item.file_size,
+                created_at=int(item.created_at),
+                updated_at=int(item.updated_at),
+                courses=item.courses_list
+            )
+        except Exception as e:
+            logger.error(f"Error getting content by uuid: {e}")
+            raise HTTPException(status_code=500, detail="Error getting content by uuid")
+        
+    async def get_all_contents(self, skip: int = 0, limit: int = 100, course_uuid: str = None, course_code: str = None, assignment_name: str = None, search: str = None, cursor: Cursor = None):
+        try:
+            items = await self.data_access.get_all_contents(skip, limit, course_uuid, course_code, assignment_name, search, cursor, await self.get_access_scope())
+            
+            if not items:
+                raise HTTPException(status_code=404, detail="No contents found")
+            
+            return [ContentResponse(
+                uuid=item.uuid,
+                title=item.title,
+                description=item.description,
+                file_url=item.file_url,
+                file_type=item.file_type,
+                file_size=item.file_size,
+                created_at=int(item.created_at),
+                updated_at=int(item.updated_at),
+                courses=item.courses_list
+            ) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting all contents: {e}")
+            raise HTTPException(status_code=500, detail="Error getting all contents")
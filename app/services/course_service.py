@@ -1,16 +1,43 @@
 import logging
 from fastapi import Request, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from sqlalchemy import or_
+from sqlalchemy import select
 
 from app.models.courses_model import Course
 from app.models.enrollments_model import Enrollment
 from app.schemas.courses_schema import CourseCreate, CourseUpdate, CourseResponse
-from app.services.base_service import AppDataAccess, AppService
+from app.utils.access_scope import AccessScope
+from app.utils.pagination import Cursor, paginate
+from app.utils.search import text_search
+from app.services.base_service import AppDataAccess, AppService, AsyncAppDataAccess, AsyncAppService
 
 logger = logging.getLogger('course_service')
 
+def courses_query(skip: int = 0, limit: int = 100, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+    items = select(Course)
+    if search:
+        items = items.filter(text_search(Course, search, Course.name, Course.code))
+    if course_code:
+        items = items.filter(Course.code.ilike(f"%{course_code}%"))
+
+    if student_uuid:
+        items = items.filter(
+            Course.enrollments.any(
+                Enrollment.student_uuid == student_uuid
+            )
+        )
+    if _access_scope is not None:
+        items = items.filter(Course.uuid.in_(_access_scope.course_uuids))
+    items = paginate(items, Course, skip, limit, cursor)
+    return items
+
+# Relaciones que serializa CourseResponse; una colección, así que se carga con un IN en una segunda consulta
+COURSE_RESPONSE_OPTIONS = (
+    selectinload(Course.assignments),
+)
+
 class CourseDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -30,37 +57,13 @@ class CourseDataAccess(AppDataAccess):
         return item
 
     def get_course_by_uuid(self, uuid: str):
-        item = self.session.query(Course)
+        item = self.session.query(Course).options(*COURSE_RESPONSE_OPTIONS)
         item = item.filter(Course.uuid == uuid)
         item = item.first()
         return item if item else None
     
-    def get_all_courses(self, skip: int = 0, limit: int = 100, search: str = None, course_code: str = None, student_uuid: str = None, _current_user_uuid: str = None):
-        items = self.session.query(Course)
-        if search:
-            items = items.filter(
-                or_(
-                    Course.name.ilike(f"%{search}%"), 
-                    Course.code.ilike(f"%{search}%")
-                )
-            )
-        if course_code:
-            items = items.filter(Course.code.ilike(f"%{course_code}%"))
-
-        if student_uuid:
-            items = items.filter(
-                Course.enrollments.any(
-                    Enrollment.student_uuid == student_uuid
-                )
-            )
-        if _current_user_uuid:
-            items = items.filter(
-                Course.enrollments.any(
-                    Enrollment.student_uuid == _current_user_uuid
-                )
-            )
-        items = items.order_by(Course.created_at.desc())
-        items = items.offset(skip).limit(limit)
+    def get_all_courses(self, skip: int = 0, limit: int = 100, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = self.session.scalars(courses_query(skip, limit, search, course_code, student_uuid, cursor, _access_scope).options(*COURSE_RESPONSE_OPTIONS))
         items = items.all()
         return items if items else None
     
@@ -130,9 +133,9 @@ class CourseService(AppService):
             logger.error(f"Error getting course by uuid: {e}")
             raise HTTPException(status_code=500, detail="Error getting course by uuid")
         
-    def get_all_courses(self, skip: int = 0, limit: int = 100, search: str = None, course_code: str = None, student_uuid: str = None):
+    def get_all_courses(self, skip: int = 0, limit: int = 100, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None):
         try:
-            items = self.data_access.get_all_courses(skip, limit, search, course_code, student_uuid, self.current_user_uuid)
+            items = self.data_access.get_all_courses(skip, limit, search, course_code, student_uuid, cursor, self.get_access_scope())
             
             return [CourseResponse(
                 uuid=item.uuid,
@@ -184,4 +187,63 @@ class CourseService(AppService):
         except Exception as e:
             self.session.rollback()
             logger.error(f"Error deleting course: {e}")
-            raise HTTPException(status_code=500, detail="Error deleting course") 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Error deleting course")
+
+class CourseAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_course_by_uuid(self, uuid: str):
+        item = select(Course).options(*COURSE_RESPONSE_OPTIONS)
+        item = item.filter(Course.uuid == uuid)
+        item = (await self.session.scalars(item)).first()
+        return item if item else None
+
+    async def get_all_courses(self, skip: int = 0, limit: int = 100, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = courses_query(skip, limit, search, course_code, student_uuid, cursor, _access_scope).options(*COURSE_RESPONSE_OPTIONS)
+        items = (await self.session.scalars(items)).all()
+        return items if items else None
+
+class CourseAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = CourseAsyncDataAccess(session)
+
+    async def get_course_by_uuid(self, uuid: str):
+        try:
+            item = await self.data_access.get_course_by_uuid(uuid)
+
+            if not item:
+                raise HTTPException(status_code=404, detail="Course not found")
+            
+            return CourseResponse(
+                uuid=item.uuid,
+                career_uuid=item.career_uuid,
+                name=item.name,
+                code=item.code,
+                description=item.description,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                assignments=item.assignments
+            )
+        except Exception as e:
+            logger.error(f"Error getting course by uuid: {e}")
+            raise HTTPException(status_code=500, detail="Error getting course by uuid")
+        
+    async def get_all_courses(self, skip: int = 0, limit: int = 100, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None):
+        try:
+            items = await self.data_access.get_all_courses(skip, limit, search, course_code, student_uuid, cursor, await self.get_access_scope())
+            
+            return [CourseResponse(
+                uuid=item.uuid,
+                career_uuid=item.career_uuid,
+                name=item.name,
+                code=item.code,
+                description=item.description,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                assignments=item.assignments
+            ) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting all courses: {e}")
+            raise HTTPException(status_code=500, detail="Error getting all courses")
@@ -1,17 +1,64 @@
 import logging
 from fastapi import Request, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from app.models.enrollments_model import Enrollment
 from app.models.courses_model import Course
 from app.models.assignments_model import Assignment
 from app.models.students_model import Student
 from app.schemas.enrollments_schema import EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse
-from app.services.base_service import AppDataAccess, AppService
+from app.utils.pagination import Cursor, paginate
+from app.utils.search import text_search
+from app.services.base_service import AppDataAccess, AppService, AsyncAppDataAccess, AsyncAppService
 
 logger = logging.getLogger('enrollment_service')
 
+def enrollments_query(
+    skip: int = 0, 
+    limit: int = 100, 
+    course_code: str = None, 
+    assignment_name: str = None,
+    search: str = None,
+    student_uuid: str = None, 
+    course_uuid: str = None,
+    section_uuid: str = None,
+    cursor: Cursor = None,
+    _current_user_uuid: str = None,
+    all: bool = False
+):
+    items = select(Enrollment)
+    if course_code:
+        items = items.filter(Enrollment.course.has(Course.code.ilike(f"%{course_code}%")))
+    if course_uuid:
+        items = items.filter(Enrollment.course_uuid == course_uuid)
+    if assignment_name:
+        items = items.filter(Enrollment.course.has(Course.assignments.any(Assignment.title.ilike(f"%{assignment_name}%"))))
+    if search:
+        items = items.filter(
+            or_(
+                Enrollment.course.has(text_search(Course, search, Course.name)),
+                Enrollment.student.has(text_search(Student, search, Student.first_name, Student.last_name))
+            )
+        )
+    if student_uuid:
+        items = items.filter(Enrollment.student_uuid == student_uuid)
+    if section_uuid:
+        items = items.filter(Enrollment.section_uuid == section_uuid)
+    if _current_user_uuid:
+        items = items.filter(Enrollment.student_uuid == _current_user_uuid)
+    items = paginate(items, Enrollment, skip, limit, cursor, all)
+
+    return items
+
+# Relaciones que serializa EnrollmentResponse; son many-to-one, así que van en el mismo SELECT
+ENROLLMENT_RESPONSE_OPTIONS = (
+    joinedload(Enrollment.student),
+    joinedload(Enrollment.course),
+    joinedload(Enrollment.section)
+)
+
 class EnrollmentDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -32,7 +79,7 @@ class EnrollmentDataAccess(AppDataAccess):
         return item
 
     def get_enrollment_by_uuid(self, uuid: str):
-        item = self.session.query(Enrollment)
+        item = self.session.query(Enrollment).options(*ENROLLMENT_RESPONSE_OPTIONS)
         item = item.filter(Enrollment.uuid == uuid)
         item = item.first()
         return item if item else None
@@ -47,39 +94,12 @@ class EnrollmentDataAccess(AppDataAccess):
         student_uuid: str = None, 
         course_uuid: str = None,
         section_uuid: str = None,
+        cursor: Cursor = None,
         _current_user_uuid: str = None,
         all: bool = False
     ):
-        items = self.session.query(Enrollment)
-        if course_code:
-            items = items.filter(Enrollment.course.has(Course.code.ilike(f"%{course_code}%")))
-        if course_uuid:
-            items = items.filter(Enrollment.course_uuid == course_uuid)
-        if assignment_name:
-            items = items.filter(Enrollment.course.has(Course.assignments.any(Assignment.title.ilike(f"%{assignment_name}%"))))
-        if search:
-            items = items.filter(
-                or_(
-                    Enrollment.course.has(
-                        Course.name.ilike(f"%{search}%")
-                    ), 
-                    or_(
-                        Enrollment.student.has(Student.first_name.ilike(f"%{search}%")), 
-                        Enrollment.student.has(Student.last_name.ilike(f"%{search}%"))
-                    )
-                )
-            )
-        if student_uuid:
-            items = items.filter(Enrollment.student_uuid == student_uuid)
-        if section_uuid:
-            items = items.filter(Enrollment.section_uuid == section_uuid)
-        if _current_user_uuid:
-            items = items.filter(Enrollment.student_uuid == _current_user_uuid)
-        items = items.order_by(Enrollment.created_at.desc())
-
-        if not all:
-            items = items.offset(skip).limit(limit)
-
+        items = enrollments_query(skip, limit, course_code, assignment_name, search, student_uuid, course_uuid, section_uuid, cursor, _current_user_uuid, all)
+        items = self.session.scalars(items.options(*ENROLLMENT_RESPONSE_OPTIONS))
         items = items.all()
 
         return items if items else None
@@ -165,10 +185,11 @@ class EnrollmentService(AppService):
         search: str = None,
         student_uuid: str = None, 
         course_uuid: str = None,
-        section_uuid: str = None
+        section_uuid: str = None,
+        cursor: Cursor = None
     ):
         try:
-            items = self.data_access.get_all_enrollments(skip, limit, course_code, assignment_name, search, student_uuid, course_uuid, section_uuid, self.current_user_uuid)
+            items = self.data_access.get_all_enrollments(skip, limit, course_code, assignment_name, search, student_uuid, course_uuid, section_uuid, cursor, self.current_user_uuid)
 
             if not items:
                 return HTTPException(status_code=404, detail="No enrollments found")
@@ -224,4 +245,95 @@ class EnrollmentService(AppService):
         except Exception as e:
             self.session.rollback()
             logger.error(f"Error deleting enrollment: {e}")
-            raise HTTPException(status_code=500, detail="Error deleting enrollment") 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Error deleting enrollment")
+
+class EnrollmentAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_enrollment_by_uuid(self, uuid: str):
+        item = select(Enrollment).options(*ENROLLMENT_RESPONSE_OPTIONS)
+        item = item.filter(Enrollment.uuid == uuid)
+        item = (await self.session.scalars(item)).first()
+        return item if item else None
+
+    async def get_all_enrollments(
+        self, 
+        skip: int = 0, 
+        limit: int = 100, 
+        course_code: str = None, 
+        assignment_name: str = None,
+        search: str = None,
+        student_uuid: str = None, 
+        course_uuid: str = None,
+        section_uuid: str = None,
+        cursor: Cursor = None,
+        _current_user_uuid: str = None,
+        all: bool = False
+    ):
+        items = enrollments_query(skip, limit, course_code, assignment_name, search, student_uuid, course_uuid, section_uuid, cursor, _current_user_uuid, all)
+        items = items.options(*ENROLLMENT_RESPONSE_OPTIONS)
+        items = (await self.session.scalars(items)).all()
+        return items if items else None
+
+class EnrollmentAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = EnrollmentAsyncDataAccess(session)
+
+    async def get_enrollment_by_uuid(self, uuid: str):
+        try:
+            item = await self.data_access.get_enrollment_by_uuid(uuid)
+
+            if not item:
+                return HTTPException(status_code=404, detail="Enrollment not found")
+            
+            return EnrollmentResponse(
+                uuid=item.uuid,
+                course_uuid=item.course_uuid,
+                student_uuid=item.student_uuid,
+                section_uuid=item.section_uuid,
+                status=item.status,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                student=item.student,
+                course=item.course,
+                section=item.section
+            )
+        except Exception as e:
+            logger.error(f"Error getting enrollment by uuid: {e}")
+            raise HTTPException(status_code=500, detail="Error getting enrollment by uuid")
+        
+    async def get_all_enrollments(
+        self, 
+        skip: int = 0, 
+        limit: int = 100, 
+        course_code: str = None, 
+        assignment_name: str = None,
+        search: str = None,
+        student_uuid: str = None, 
+        course_uuid: str = None,
+        section_uuid: str = None,
+        cursor: Cursor = None
+    ):
+        try:
+            items = await self.data_access.get_all_enrollments(skip, limit, course_code, assignment_name, search, student_uuid, course_uuid, section_uuid, cursor, self.current_user_uuid)
+
+            if not items:
+                return HTTPException(status_code=404, detail="No enrollments found")
+            
+            return [EnrollmentResponse(
+                uuid=item.uuid,
+                student_uuid=item.student_uuid,
+                course_uuid=item.course_uuid,
+                section_uuid=item.section_uuid,
+                status=item.status,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                student=item.student,
+                course=item.course,
+                section=item.section
+            ) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting all enrollments: {e}")
+            raise HTTPException(status_code=500, detail="Error getting all enrollments")
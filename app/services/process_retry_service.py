@@ -0,0 +1,202 @@
+import logging
+import random
+from fastapi import Request, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.models.process_retries_model import ProcessRetry, ProcessDeadLetter
+from app.schemas.process_retries_schema import ProcessDeadLetterReplayed
+from app.services.base_service import AppDataAccess, AsyncAppDataAccess, AsyncAppService
+from app.services.process_run_service import now
+from app.core.config import settings
+
+logger = logging.getLogger('process_retry_service')
+
+# Filas por INSERT: Postgres acepta hasta 65535 parámetros por sentencia
+INSERT_CHUNK_SIZE = 1000
+
+def chunked(rows: List[Any]):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        yield rows[start:start + INSERT_CHUNK_SIZE]
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Backoff exponencial con jitter tras `attempts` envíos fallidos"""
+    delay = min(settings.PROCESS_RETRY_BACKOFF_MAX_SECONDS, settings.PROCESS_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+class ProcessRetryDataAccess(AppDataAccess):
+    def __init__(self, session: Session):
+        super().__init__(session)
+
+    def record_failures(self, failures: List[Dict[str, Any]], run_uuid=None) -> None:
+        """Programa el reintento de los pares que fallaron, o los pasa a dead letters si agotaron los intentos (sin commit).
+
+        failures: {student_uuid, course_uuid, stage, error} por par.
+        """
+        if not failures:
+            return
+        timestamp = now()
+        pairs = [(failure["student_uuid"], failure["course_uuid"]) for failure in failures]
+        previous = {}
+        for chunk in chunked(pairs):
+            for student_uuid, course_uuid, attempts, first_run_uuid, created_at in self.session.execute(
+                select(
+                    ProcessRetry.student_uuid,
+                    ProcessRetry.course_uuid,
+                    ProcessRetry.attempts,
+                    ProcessRetry.run_uuid,
+                    ProcessRetry.created_at
+                ).filter(tuple_(ProcessRetry.student_uuid, ProcessRetry.course_uuid).in_(chunk))
+            ):
+                previous[(student_uuid, course_uuid)] = (attempts, first_run_uuid, created_at)
+
+        retries = []
+        dead_letters = []
+        for failure, pair in zip(failures, pairs):
+            attempts, first_run_uuid, created_at = previous.get(pair, (0, run_uuid, timestamp))
+            attempts += 1
+            row = {
+                "student_uuid": failure["student_uuid"],
+                "course_uuid": failure["course_uuid"],
+                "stage": failure["stage"],
+                "attempts": attempts,
+                "last_error": failure["error"],
+                "run_uuid": first_run_uuid
+            }
+            if attempts >= settings.PROCESS_RETRY_MAX_ATTEMPTS:
+                dead_letters.append({**row, "first_failed_at": created_at, "dead_at": timestamp})
+            else:
+                retries.append({**row, "next_attempt_at": timestamp + int(retry_delay_seconds(attempts)), "created_at": created_at, "updated_at": timestamp})
+
+        for chunk in chunked(retries):
+            statement = insert(ProcessRetry).values(chunk)
+            self.session.execute(statement.on_conflict_do_update(
+                index_elements=[ProcessRetry.student_uuid, ProcessRetry.course_uuid],
+                set_={
+                    key: statement.excluded[key]
+                    for key in ("stage", "attempts", "last_error", "next_attempt_at", "updated_at")
+                }
+            ))
+
+        if dead_letters:
+            logger.warning(f"{len(dead_letters)} pairs exhausted their retries and moved to dead letters")
+        for chunk in chunked(dead_letters):
+            statement = insert(ProcessDeadLetter).values(chunk)
+            self.session.execute(statement.on_conflict_do_update(
+                index_elements=[ProcessDeadLetter.student_uuid, ProcessDeadLetter.course_uuid],
+                set_={
+                    key: statement.excluded[key]
+                    for key in ("stage", "attempts", "last_error", "run_uuid", "first_failed_at", "dead_at")
+                }
+            ))
+        if dead_letters:
+            self.clear_retries([(row["student_uuid"], row["course_uuid"]) for row in dead_letters])
+
+    def clear_retries(self, pairs: List[Tuple[Any, Any]]) -> None:
+        """Saca de la cola de reintentos los pares que ya se enviaron (sin commit)"""
+        for chunk in chunked(pairs):
+            self.session.execute(
+                delete(ProcessRetry).where(tuple_(ProcessRetry.student_uuid, ProcessRetry.course_uuid).in_(chunk))
+            )
+
+    def claim_due_retries(self, limit: int) -> List[Tuple[Any, Any]]:
+        """Toma hasta `limit` pares con el reintento vencido (SKIP LOCKED, como los work items).
+
+        Se corre su próximo intento PROCESS_WORK_LEASE_SECONDS para que otro worker no los tome
+        mientras se envían; si el worker muere, vuelven a estar vencidos al pasar ese tiempo.
+        """
+        timestamp = now()
+        retries = self.session.scalars(
+            select(ProcessRetry).filter(
+                ProcessRetry.next_attempt_at <= timestamp
+            ).order_by(
+                ProcessRetry.next_attempt_at
+            ).limit(limit).with_for_update(skip_locked=True)
+        ).all()
+        for retry in retries:
+            retry.next_attempt_at = timestamp + settings.PROCESS_WORK_LEASE_SECONDS
+            retry.updated_at = timestamp
+        self.session.flush()
+        return [(retry.student_uuid, retry.course_uuid) for retry in retries]
+
+class ProcessRetryAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_all_dead_letters(self, skip: int = 0, limit: int = 100, stage: str = None):
+        items = select(ProcessDeadLetter)
+        if stage:
+            items = items.filter(ProcessDeadLetter.stage == stage)
+        items = items.order_by(ProcessDeadLetter.dead_at.desc(), ProcessDeadLetter.uuid).offset(skip).limit(limit)
+        return (await self.session.scalars(items)).all()
+
+    async def replay_dead_letters(self, uuids: Optional[List[str]] = None, stage: str = None) -> int:
+        """Devuelve los dead letters a la cola de reintentos con el contador en cero (sin commit)"""
+        dead_letters = delete(ProcessDeadLetter)
+        if uuids:
+            dead_letters = dead_letters.where(ProcessDeadLetter.uuid.in_(uuids))
+        if stage:
+            dead_letters = dead_letters.where(ProcessDeadLetter.stage == stage)
+        # DELETE ... RETURNING: se reencola exactamente lo que se borró
+        rows = (await self.session.execute(
+            dead_letters.returning(
+                ProcessDeadLetter.student_uuid,
+                ProcessDeadLetter.course_uuid,
+                ProcessDeadLetter.stage,
+                ProcessDeadLetter.last_error,
+                ProcessDeadLetter.run_uuid,
+                ProcessDeadLetter.first_failed_at
+            ).execution_options(synchronize_session=False)
+        )).all()
+        if not rows:
+            return 0
+
+        timestamp = now()
+        retries = [
+            {
+                "student_uuid": student_uuid,
+                "course_uuid": course_uuid,
+                "stage": row_stage,
+                "attempts": 0,
+                "last_error": last_error,
+                "run_uuid": run_uuid,
+                "next_attempt_at": timestamp,
+                "created_at": first_failed_at,
+                "updated_at": timestamp
+            }
+            for student_uuid, course_uuid, row_stage, last_error, run_uuid, first_failed_at in rows
+        ]
+        for chunk in chunked(retries):
+            statement = insert(ProcessRetry).values(chunk)
+            await self.session.execute(statement.on_conflict_do_update(
+                index_elements=[ProcessRetry.student_uuid, ProcessRetry.course_uuid],
+                set_={"attempts": 0, "next_attempt_at": timestamp, "updated_at": timestamp}
+            ))
+        return len(rows)
+
+class ProcessRetryAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = ProcessRetryAsyncDataAccess(session)
+
+    async def get_all_dead_letters(self, skip: int = 0, limit: int = 100, stage: str = None):
+        try:
+            items = await self.data_access.get_all_dead_letters(skip, limit, stage)
+            return items
+        except Exception as e:
+            logger.error(f"Error getting process dead letters: {e}")
+            raise HTTPException(status_code=500, detail="Error getting process dead letters")
+
+    async def replay_dead_letters(self, uuids: Optional[List[str]] = None, stage: str = None):
+        try:
+            replayed = await self.data_access.replay_dead_letters(uuids, stage)
+            await self.session.commit()
+            logger.info(f"Replayed {replayed} process dead letters")
+            return ProcessDeadLetterReplayed(replayed=replayed)
+        except Exception as e:
+            logger.error(f"Error replaying process dead letters: {e}")
+            await self.session.rollback()
+            raise HTTPException(status_code=500, detail="Error replaying process dead letters")
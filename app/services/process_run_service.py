@@ -0,0 +1,367 @@
+import asyncio
+import json
+import logging
+from fastapi import Request, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from typing import List, Dict, Iterable, Optional, Tuple, Any
+from sqlalchemy import select, update, func, case, or_, and_
+
+from app.models.process_runs_model import ProcessRun, ProcessRunStatus
+from app.models.process_work_items_model import ProcessWorkItem, ProcessWorkItemStatus
+from app.schemas.process_runs_schema import ProcessRunResponse
+from app.services.base_service import AppDataAccess, AsyncAppDataAccess, AsyncAppService
+from app.core.config import settings
+from app.utils.dataBase import AsyncSessionLocal
+
+logger = logging.getLogger('process_run_service')
+
+def now() -> int:
+    return int(datetime.now(timezone.utc).timestamp())
+
+def is_stale(run: ProcessRun) -> bool:
+    return run.status == ProcessRunStatus.RUNNING and now() - run.updated_at > settings.PROCESS_RUN_STALE_SECONDS
+
+def is_finished(run: ProcessRun) -> bool:
+    return run.status not in (ProcessRunStatus.QUEUED, ProcessRunStatus.RUNNING) or is_stale(run)
+
+def run_response(run: ProcessRun) -> ProcessRunResponse:
+    return ProcessRunResponse(
+        uuid=run.uuid,
+        status=run.status,
+        full=run.full,
+        total_enrollments=run.total_enrollments,
+        processed=run.processed,
+        sent=run.sent,
+        skipped=run.skipped,
+        failed=run.failed,
+        retries=run.retries,
+        progress=run.processed / run.total_enrollments if run.total_enrollments else 0.0,
+        last_error=run.last_error,
+        work_items=run.work_items,
+        work_items_done=run.work_items_done,
+        resumed_count=run.resumed_count,
+        queued_at=run.queued_at,
+        started_at=run.started_at,
+        updated_at=run.updated_at,
+        finished_at=run.finished_at,
+        elapsed_seconds=(run.finished_at or run.updated_at) - run.started_at if run.started_at else 0
+    )
+
+class ProcessRunDataAccess(AppDataAccess):
+    def __init__(self, session: Session):
+        super().__init__(session)
+
+    def get_run_by_uuid(self, uuid) -> ProcessRun:
+        return self.session.get(ProcessRun, uuid)
+
+    def get_latest_run(self) -> ProcessRun:
+        return self.session.scalars(
+            select(ProcessRun).order_by(ProcessRun.queued_at.desc()).limit(1)
+        ).first()
+
+    def create_run(self, full: bool) -> ProcessRun:
+        timestamp = now()
+        run = ProcessRun(
+            status=ProcessRunStatus.QUEUED,
+            full=full,
+            total_enrollments=0,
+            processed=0,
+            sent=0,
+            skipped=0,
+            failed=0,
+            retries=0,
+            work_items=0,
+            work_items_done=0,
+            resumed_count=0,
+            queued_at=timestamp,
+            updated_at=timestamp
+        )
+        self.session.add(run)
+        self.session.flush()
+        return run
+
+    def enqueue_run(self, full: bool = False, resume: bool = True):
+        """Encola una corrida, o vuelve a encolar la última si quedó interrumpida; None si hay una en curso.
+
+        Si ya hay una encolada se devuelve esa (pasa a full si se pidió full).
+        """
+        latest = self.get_latest_run()
+        if latest is not None and latest.status == ProcessRunStatus.QUEUED:
+            latest.full = latest.full or full
+            return latest, False
+        if latest is not None and latest.status == ProcessRunStatus.RUNNING and not is_stale(latest):
+            return None, False
+
+        resumable = latest is not None and (latest.status == ProcessRunStatus.FAILED or is_stale(latest))
+        if resume and resumable and (latest.full or not full):
+            latest.status = ProcessRunStatus.QUEUED
+            latest.updated_at = now()
+            latest.finished_at = None
+            return latest, True
+
+        if resumable:
+            latest.status = ProcessRunStatus.FAILED
+            latest.finished_at = latest.finished_at or latest.updated_at
+        return self.create_run(full), False
+
+    def get_running_runs(self) -> List[ProcessRun]:
+        return self.session.scalars(
+            select(ProcessRun).filter(ProcessRun.status == ProcessRunStatus.RUNNING).order_by(ProcessRun.queued_at)
+        ).all()
+
+    def get_next_queued_run(self) -> Optional[ProcessRun]:
+        """La corrida encolada más antigua; None si hay una en curso (se ejecuta una a la vez)"""
+        if self.get_running_runs():
+            return None
+        return self.session.scalars(
+            select(ProcessRun).filter(ProcessRun.status == ProcessRunStatus.QUEUED).order_by(ProcessRun.queued_at).limit(1)
+        ).first()
+
+    def start_run(self, run: ProcessRun, students: Optional[Iterable[Tuple[Any, int]]] = None) -> None:
+        """Pasa la corrida a running. La primera vez la reparte en work items de
+        PROCESS_WORK_ITEM_STUDENTS estudiantes (students: (uuid, inscripciones) ordenados por uuid);
+        al retomarla vuelve a la cola los items que fallaron y conserva los terminados.
+
+        students se recorre una sola vez y solo se guarda el tramo en curso, así que puede
+        venir de un cursor del servidor sin cargar todos los estudiantes en memoria.
+        """
+        timestamp = now()
+        if run.started_at is None:
+            size = max(1, settings.PROCESS_WORK_ITEM_STUDENTS)
+            run.work_items = 0
+            run.total_enrollments = 0
+            item = None
+            for student_uuid, enrollments in students or ():
+                if item is None or item["students"] == size:
+                    if item is not None:
+                        self.add_work_item(run, item, timestamp)
+                    item = {"first_student_uuid": student_uuid, "students": 0, "enrollments": 0}
+                item["last_student_uuid"] = student_uuid
+                item["students"] += 1
+                item["enrollments"] += enrollments
+            if item is not None:
+                self.add_work_item(run, item, timestamp)
+        else:
+            run.resumed_count += 1
+            self.session.execute(
+                update(ProcessWorkItem).where(
+                    ProcessWorkItem.run_uuid == run.uuid,
+                    ProcessWorkItem.status == ProcessWorkItemStatus.FAILED
+                ).values(status=ProcessWorkItemStatus.PENDING, attempts=0, lease_owner=None, lease_expires_at=None, last_error=None, updated_at=timestamp)
+            )
+
+        run.status = ProcessRunStatus.RUNNING
+        run.started_at = run.started_at or timestamp
+        run.updated_at = timestamp
+        run.finished_at = None
+        self.session.flush()
+
+    def add_work_item(self, run: ProcessRun, item: Dict[str, Any], timestamp: int) -> None:
+        self.session.add(ProcessWorkItem(
+            run_uuid=run.uuid,
+            chunk_index=run.work_items,
+            first_student_uuid=item["first_student_uuid"],
+            last_student_uuid=item["last_student_uuid"],
+            enrollments=item["enrollments"],
+            status=ProcessWorkItemStatus.PENDING,
+            attempts=0,
+            processed=0,
+            sent=0,
+            skipped=0,
+            failed=0,
+            retries=0,
+            created_at=timestamp,
+            updated_at=timestamp
+        ))
+        run.work_items += 1
+        run.total_enrollments += item["enrollments"]
+
+    def claim_work_item(self, worker_id: str) -> Optional[ProcessWorkItem]:
+        """Toma un work item pendiente, o con el lease vencido, de una corrida en curso.
+
+        SKIP LOCKED hace que cada worker salte las filas que otro está tomando en ese momento,
+        así que varios workers reparten la cola sin bloquearse entre sí. Un item cuyo lease
+        venció después de PROCESS_WORK_MAX_ATTEMPTS intentos queda failed.
+        """
+        timestamp = now()
+        while True:
+            item = self.session.scalars(
+                select(ProcessWorkItem).join(
+                    ProcessRun,
+                    ProcessRun.uuid == ProcessWorkItem.run_uuid
+                ).filter(
+                    ProcessRun.status == ProcessRunStatus.RUNNING,
+                    or_(
+                        ProcessWorkItem.status == ProcessWorkItemStatus.PENDING,
+                        and_(
+                            ProcessWorkItem.status == ProcessWorkItemStatus.LEASED,
+                            ProcessWorkItem.lease_expires_at < timestamp
+                        )
+                    )
+                ).order_by(
+                    ProcessRun.queued_at,
+                    ProcessWorkItem.chunk_index
+                ).limit(1).with_for_update(skip_locked=True, of=ProcessWorkItem)
+            ).first()
+            if item is None:
+                return None
+
+            if item.status == ProcessWorkItemStatus.LEASED:
+                logger.warning(f"Work item {item.uuid} lease held by {item.lease_owner} expired")
+                if item.attempts >= settings.PROCESS_WORK_MAX_ATTEMPTS:
+                    item.status = ProcessWorkItemStatus.FAILED
+                    item.last_error = f"Lease expired after {item.attempts} attempts"
+                    item.lease_expires_at = None
+                    item.updated_at = timestamp
+                    self.session.flush()
+                    continue
+
+            item.status = ProcessWorkItemStatus.LEASED
+            item.lease_owner = worker_id
+            item.lease_expires_at = timestamp + settings.PROCESS_WORK_LEASE_SECONDS
+            item.attempts += 1
+            # Se vuelve a contar desde cero; lo ya enviado lo saltean los watermarks (en las full, los de esta corrida)
+            item.processed = item.sent = item.skipped = item.failed = item.retries = 0
+            item.updated_at = timestamp
+            self.session.flush()
+            return item
+
+    def update_work_item(self, item_uuid, worker_id: str, status: ProcessWorkItemStatus = ProcessWorkItemStatus.LEASED, **values) -> bool:
+        """Guarda el progreso del item y renueva su lease (o lo cierra con status); False si el lease ya no es de worker_id"""
+        timestamp = now()
+        if status is ProcessWorkItemStatus.LEASED:
+            values["lease_expires_at"] = timestamp + settings.PROCESS_WORK_LEASE_SECONDS
+        else:
+            values["lease_expires_at"] = None
+        result = self.session.execute(
+            update(ProcessWorkItem).where(
+                ProcessWorkItem.uuid == item_uuid,
+                ProcessWorkItem.lease_owner == worker_id,
+                ProcessWorkItem.status == ProcessWorkItemStatus.LEASED
+            ).values(status=status, updated_at=timestamp, **values)
+        )
+        return result.rowcount == 1
+
+    def release_work_item(self, item_uuid, worker_id: str) -> bool:
+        """Devuelve el item a la cola sin contar el intento (apagado del worker)"""
+        return self.update_work_item(item_uuid, worker_id, ProcessWorkItemStatus.PENDING, attempts=ProcessWorkItem.attempts - 1)
+
+    def fail_work_item(self, item_uuid, worker_id: str, attempts: int, error: str) -> bool:
+        """Vuelve a la cola, o queda failed si ya agotó PROCESS_WORK_MAX_ATTEMPTS"""
+        status = ProcessWorkItemStatus.FAILED if attempts >= settings.PROCESS_WORK_MAX_ATTEMPTS else ProcessWorkItemStatus.PENDING
+        return self.update_work_item(item_uuid, worker_id, status, last_error=error)
+
+    def refresh_run(self, run_uuid) -> Optional[ProcessRun]:
+        """Suma el progreso de los work items en la corrida y la cierra cuando no queda ninguno pendiente.
+
+        La fila de la corrida se bloquea primero: el último worker en terminar ve los items
+        de los demás ya confirmados y es el que la cierra.
+        """
+        run = self.session.scalars(
+            select(ProcessRun).filter(ProcessRun.uuid == run_uuid).with_for_update()
+        ).first()
+        if run is None or run.status != ProcessRunStatus.RUNNING:
+            return run
+
+        def count(status: ProcessWorkItemStatus):
+            return func.coalesce(func.sum(case((ProcessWorkItem.status == status, 1), else_=0)), 0)
+
+        totals = self.session.execute(
+            select(
+                func.coalesce(func.sum(ProcessWorkItem.processed), 0),
+                func.coalesce(func.sum(ProcessWorkItem.sent), 0),
+                func.coalesce(func.sum(ProcessWorkItem.skipped), 0),
+                func.coalesce(func.sum(ProcessWorkItem.failed), 0),
+                func.coalesce(func.sum(ProcessWorkItem.retries), 0),
+                count(ProcessWorkItemStatus.DONE),
+                count(ProcessWorkItemStatus.FAILED),
+                func.max(ProcessWorkItem.last_error)
+            ).filter(ProcessWorkItem.run_uuid == run_uuid)
+        ).one()
+        run.processed, run.sent, run.skipped, run.failed, run.retries, run.work_items_done, failed_items, last_error = totals
+        run.last_error = last_error
+        run.updated_at = now()
+
+        if run.work_items_done + failed_items >= run.work_items:
+            if failed_items:
+                self.finish_run(run, ProcessRunStatus.FAILED, f"{failed_items} work items failed: {last_error}")
+            else:
+                self.finish_run(run, ProcessRunStatus.COMPLETED)
+        self.session.flush()
+        return run
+
+    def finish_run(self, run: ProcessRun, status: ProcessRunStatus, error: str = None) -> None:
+        run.status = status
+        run.updated_at = run.finished_at = now()
+        if error is not None:
+            run.last_error = error
+
+class ProcessRunAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_run_by_uuid(self, uuid: str):
+        item = select(ProcessRun).filter(ProcessRun.uuid == uuid).execution_options(populate_existing=True)
+        return (await self.session.scalars(item)).first()
+
+    async def get_all_runs(self, limit: int = 20):
+        items = select(ProcessRun).order_by(ProcessRun.queued_at.desc()).limit(limit)
+        return (await self.session.scalars(items)).all()
+
+class ProcessRunAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = ProcessRunAsyncDataAccess(session)
+
+    async def get_all_runs(self, limit: int = 20):
+        try:
+            items = await self.data_access.get_all_runs(limit)
+            return [run_response(item) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting process runs: {e}")
+            raise HTTPException(status_code=500, detail="Error getting process runs")
+
+    async def get_run_by_uuid(self, uuid: str):
+        try:
+            item = await self.data_access.get_run_by_uuid(uuid)
+
+            if not item:
+                raise HTTPException(status_code=404, detail="Process run not found")
+
+            return run_response(item)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting process run by uuid: {e}")
+            raise HTTPException(status_code=500, detail="Error getting process run by uuid")
+
+    async def stream_run(self, uuid: str):
+        """Eventos SSE con el progreso de la corrida hasta que termina.
+
+        Usa una sesión propia: la de la dependencia (get_async_db) ya está cerrada cuando
+        se empieza a recorrer el StreamingResponse.
+        """
+        last = None
+        async with AsyncSessionLocal() as session:
+            data_access = ProcessRunAsyncDataAccess(session)
+            while True:
+                item = await data_access.get_run_by_uuid(uuid)
+                if not item:
+                    yield "event: error\ndata: {\"detail\": \"Process run not found\"}\n\n"
+                    return
+
+                # Todo se lee antes del rollback, que expira los objetos cargados
+                data = run_response(item).model_dump_json()
+                end = json.dumps({'status': 'interrupted' if is_stale(item) else item.status.value}) if is_finished(item) else None
+                # Cierra la transacción para ver los commits del proceso en la próxima lectura
+                await session.rollback()
+
+                if data != last:
+                    yield f"event: progress\ndata: {data}\n\n"
+                    last = data
+                if end is not None:
+                    yield f"event: end\ndata: {end}\n\n"
+                    return
+                await asyncio.sleep(settings.PROCESS_RUN_STREAM_INTERVAL_SECONDS)
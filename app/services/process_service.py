@@ -1,34 +1,122 @@
+import asyncio
 import logging
+import threading
+import time
 from fastapi import Request, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime, timezone
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
 import statistics
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import json
 
 ## Models
-from app.models import Student, Submission, Assignment, Enrollment, CourseContent
+from app.models import Student, Submission, Assignment, Enrollment, Course, CourseContent, ProcessWatermark, ProcessWorkItemStatus
 
 ## Schemas
 from app.schemas.prediction_model_schema import StudentData
 
 ## Services
 from app.services.base_service import AppDataAccess, AppService
-from app.services.course_service import CourseDataAccess
-from app.services.student_service import StudentDataAccess
-from app.services.enrollment_service import EnrollmentDataAccess
+from app.services.process_run_service import ProcessRunDataAccess
+from app.services.process_retry_service import ProcessRetryDataAccess
 
 ## Extras
 import logging
 import os
-import requests
 
 ## Utils
 from app.core.config import settings
+from app.utils.dataBase import SessionLocal
+from app.utils.process_dispatcher import ProcessDispatcher
+from app.utils.submission_features import grouped_submission_features
 
 logger = logging.getLogger('process_service')    
 
+def performance_metrics(grades: List[float]) -> Dict[str, float]:
+    if not grades:
+        return {
+            "avg_grade": 0.0,
+            "grade_stddev": 0.0
+        }
+    
+    return {
+        "avg_grade": sum(grades) / len(grades),
+        "grade_stddev": statistics.stdev(grades) if len(grades) > 1 else 0.0
+    }
+
+def submission_metrics(submissions: List[Tuple[Any, int, Optional[int]]], total_tasks: int) -> Dict[str, float]:
+    """submissions: (assignment_uuid, created_at, due_date) de cada entrega, ordenadas por created_at"""
+    if not submissions:
+        return {
+            "retry_rate": 0.0,
+            "avg_delivery_delay_days": 0.0,
+            "avg_submission_time_diff_hours": 0.0,
+            "late_submissions_count": 0,
+            "missing_tasks": 0,
+            "completed_tasks": 0,
+            "total_tasks": 0
+        }
+
+    # Calcular métricas
+    total_submissions = len(submissions)
+    late_submissions = sum(1 for _, created_at, due in submissions if due is not None and created_at > due)
+    completed_tasks = len(set(assignment_uuid for assignment_uuid, _, _ in submissions))
+
+    # Calcular retrasos promedio
+    delays = []
+    for _, created_at, due_date in submissions:
+        if due_date:
+            delay = (created_at - due_date) / (24 * 3600)  # Convertir a días
+            delays.append(delay)
+
+    avg_delay = sum(delays) / len(delays) if delays else 0.0
+
+    # Calcular diferencia promedio entre envíos
+    submission_times = sorted(created_at for _, created_at, _ in submissions)
+    time_diffs = []
+    for i in range(1, len(submission_times)):
+        diff = (submission_times[i] - submission_times[i-1]) / 3600  # Convertir a horas
+        time_diffs.append(diff)
+
+    avg_time_diff = sum(time_diffs) / len(time_diffs) if time_diffs else 0.0
+
+    return {
+        "retry_rate": (total_submissions - completed_tasks) / completed_tasks if completed_tasks > 0 else 0.0,
+        "avg_delivery_delay_days": avg_delay,
+        "avg_submission_time_diff_hours": avg_time_diff,
+        "late_submissions_count": late_submissions,
+        "missing_tasks": total_tasks - completed_tasks,
+        "completed_tasks": completed_tasks,
+        "total_tasks": total_tasks
+    }
+
+def engagement_metrics(resource_interactions: int) -> Dict[str, Any]:
+    # Nota: Estas métricas requerirían datos adicionales que no están en los modelos actuales
+    # Por ahora retornamos valores por defecto para algunas métricas
+    return {
+        "total_login_time_hours": 0.0,
+        "classes_attended": 0,
+        "classes_missed": 0,
+        "last_login_days_ago": 0.0,
+        "resource_interactions": resource_interactions
+    }
+
+def mentorship_metrics() -> Dict[str, int]:
+    # Nota: Estas métricas requerirían datos adicionales que no están en los modelos actuales
+    # Por ahora retornamos valores por defecto
+    return {
+        "mentor_sessions_count": 0,
+        "mentor_total_words_exchanged": 0,
+        "mentor_before_task_help": 0,
+        "mentor_after_low_grade": 0
+    }
+
 class ProcessDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -43,25 +131,18 @@ class ProcessDataAccess(AppDataAccess):
             Submission.student_uuid == student_uuid,
             Assignment.course_uuid == course_uuid,
             Submission.grade.isnot(None)
+        ).order_by(
+            Submission.created_at,
+            Submission.uuid
         ).all()
         
-        grades = [g[0] for g in grades]
-        
-        if not grades:
-            return {
-                "avg_grade": 0.0,
-                "grade_stddev": 0.0
-            }
-        
-        return {
-            "avg_grade": sum(grades) / len(grades),
-            "grade_stddev": statistics.stdev(grades) if len(grades) > 1 else 0.0
-        }
+        return performance_metrics([g[0] for g in grades])
 
     def get_student_submission_metrics(self, student_uuid: str, course_uuid: str) -> Dict[str, float]:
         """Calcula métricas relacionadas con las entregas del estudiante para un curso específico"""
         submissions = self.session.query(
-            Submission,
+            Submission.assignment_uuid,
+            Submission.created_at,
             Assignment.due_date
         ).join(
             Assignment,
@@ -69,24 +150,14 @@ class ProcessDataAccess(AppDataAccess):
         ).filter(
             Submission.student_uuid == student_uuid,
             Assignment.course_uuid == course_uuid
+        ).order_by(
+            Submission.created_at,
+            Submission.uuid
         ).all()
 
         if not submissions:
-            return {
-                "retry_rate": 0.0,
-                "avg_delivery_delay_days": 0.0,
-                "avg_submission_time_diff_hours": 0.0,
-                "late_submissions_count": 0,
-                "missing_tasks": 0,
-                "completed_tasks": 0,
-                "total_tasks": 0
-            }
+            return submission_metrics([], 0)
 
-        # Calcular métricas
-        total_submissions = len(submissions)
-        late_submissions = sum(1 for s, due in submissions if s.created_at > due)
-        completed_tasks = len(set(s[0].assignment_uuid for s in submissions))
-        
         # Obtener total de tareas asignadas para el curso específico
         total_tasks = self.session.query(Assignment).join(
             Enrollment,
@@ -99,33 +170,7 @@ class ProcessDataAccess(AppDataAccess):
             Assignment.course_uuid == course_uuid
         ).count()
 
-        # Calcular retrasos promedio
-        delays = []
-        for submission, due_date in submissions:
-            if due_date:
-                delay = (submission.created_at - due_date) / (24 * 3600)  # Convertir a días
-                delays.append(delay)
-
-        avg_delay = sum(delays) / len(delays) if delays else 0.0
-
-        # Calcular diferencia promedio entre envíos
-        submission_times = sorted(s[0].created_at for s in submissions)
-        time_diffs = []
-        for i in range(1, len(submission_times)):
-            diff = (submission_times[i] - submission_times[i-1]) / 3600  # Convertir a horas
-            time_diffs.append(diff)
-
-        avg_time_diff = sum(time_diffs) / len(time_diffs) if time_diffs else 0.0
-
-        return {
-            "retry_rate": (total_submissions - completed_tasks) / completed_tasks if completed_tasks > 0 else 0.0,
-            "avg_delivery_delay_days": avg_delay,
-            "avg_submission_time_diff_hours": avg_time_diff,
-            "late_submissions_count": late_submissions,
-            "missing_tasks": total_tasks - completed_tasks,
-            "completed_tasks": completed_tasks,
-            "total_tasks": total_tasks
-        }
+        return submission_metrics([tuple(submission) for submission in submissions], total_tasks)
 
     def get_student_engagement_metrics(self, student_uuid: str, course_uuid: str) -> Dict[str, Any]:
         """Calcula métricas de participación del estudiante para un curso específico"""
@@ -140,26 +185,11 @@ class ProcessDataAccess(AppDataAccess):
             CourseContent.course_uuid == course_uuid
         ).count()
 
-        # Nota: Estas métricas requerirían datos adicionales que no están en los modelos actuales
-        # Por ahora retornamos valores por defecto para algunas métricas
-        return {
-            "total_login_time_hours": 0.0,
-            "classes_attended": 0,
-            "classes_missed": 0,
-            "last_login_days_ago": 0.0,
-            "resource_interactions": resource_interactions
-        }
+        return engagement_metrics(resource_interactions)
 
     def get_student_mentorship_metrics(self, student_uuid: str, course_uuid: str) -> Dict[str, int]:
         """Calcula métricas relacionadas con la mentoría para un curso específico"""
-        # Nota: Estas métricas requerirían datos adicionales que no están en los modelos actuales
-        # Por ahora retornamos valores por defecto
-        return {
-            "mentor_sessions_count": 0,
-            "mentor_total_words_exchanged": 0,
-            "mentor_before_task_help": 0,
-            "mentor_after_low_grade": 0
-        }
+        return mentorship_metrics()
 
     def get_student_data(self, student_uuid: str, course_uuid: str) -> Dict[str, Any]:
         """Obtiene todos los datos del estudiante para el modelo de predicción en un curso específico"""
@@ -175,64 +205,627 @@ class ProcessDataAccess(AppDataAccess):
             **mentorship
         }
 
+    def get_all_students_data(self, student_uuids: Optional[Iterable[str]] = None, engine: str = None) -> Dict[Tuple[Any, Any], Dict[str, Any]]:
+        """Mismos datos que get_student_data para todos los pares (estudiante, curso) inscritos, en 4 consultas.
+
+        Si se pasan student_uuids solo se calculan los pares de esos estudiantes.
+        engine ("numpy" o "python", por defecto PROCESS_FEATURES_ENGINE) elige cómo se calculan las métricas de entregas.
+        """
+        if student_uuids is not None:
+            student_uuids = list(student_uuids)
+
+        enrolled = select(Enrollment.student_uuid, Enrollment.course_uuid).distinct()
+        if student_uuids is not None:
+            enrolled = enrolled.filter(Enrollment.student_uuid.in_(student_uuids))
+        pairs = [tuple(pair) for pair in self.session.execute(enrolled)]
+
+        # Entregas de los pares inscritos, en el mismo orden que el cálculo por par
+        rows = self.session.execute(
+            select(
+                Submission.student_uuid,
+                Assignment.course_uuid,
+                Submission.assignment_uuid,
+                Submission.grade,
+                Submission.created_at,
+                Assignment.due_date
+            ).join(
+                Assignment,
+                Submission.assignment_uuid == Assignment.uuid
+            ).filter(
+                tuple_(Submission.student_uuid, Assignment.course_uuid).in_(enrolled)
+            ).order_by(
+                Submission.created_at,
+                Submission.uuid
+            )
+        ).all()
+
+        total_tasks, resource_interactions = self.get_enrollment_counts(student_uuids)
+
+        if (engine or settings.PROCESS_FEATURES_ENGINE) == "numpy":
+            submission_features = self.columnar_submission_features(pairs, rows, total_tasks)
+        else:
+            submission_features = self.python_submission_features(pairs, rows, total_tasks)
+
+        return {
+            pair: {
+                **submission_features[pair],
+                **engagement_metrics(resource_interactions.get(pair, 0)),
+                **mentorship_metrics()
+            }
+            for pair in pairs
+        }
+
+    def get_enrollment_counts(self, student_uuids: Optional[List[str]] = None) -> Tuple[Dict, Dict]:
+        """Tareas de la sección inscrita y recursos del curso por par, agrupados en SQL"""
+        # Tareas de la sección en la que está inscrito cada estudiante
+        total_tasks = select(
+            Enrollment.student_uuid,
+            Enrollment.course_uuid,
+            func.count(Assignment.uuid)
+        ).join(
+            Assignment,
+            and_(
+                Assignment.course_uuid == Enrollment.course_uuid,
+                Assignment.section_uuid == Enrollment.section_uuid
+            )
+        ).group_by(
+            Enrollment.student_uuid,
+            Enrollment.course_uuid
+        )
+
+        # Recursos del curso (una fila por inscripción, igual que en el cálculo por par)
+        resource_interactions = select(
+            Enrollment.student_uuid,
+            Enrollment.course_uuid,
+            func.count(CourseContent.uuid)
+        ).join(
+            CourseContent,
+            CourseContent.course_uuid == Enrollment.course_uuid
+        ).group_by(
+            Enrollment.student_uuid,
+            Enrollment.course_uuid
+        )
+
+        if student_uuids is not None:
+            total_tasks = total_tasks.filter(Enrollment.student_uuid.in_(student_uuids))
+            resource_interactions = resource_interactions.filter(Enrollment.student_uuid.in_(student_uuids))
+
+        total_tasks = {(student_uuid, course_uuid): count for student_uuid, course_uuid, count in self.session.execute(total_tasks)}
+        resource_interactions = {(student_uuid, course_uuid): count for student_uuid, course_uuid, count in self.session.execute(resource_interactions)}
+        return total_tasks, resource_interactions
+
+    def python_submission_features(self, pairs: List[Tuple], rows: List[Tuple], total_tasks: Dict) -> Dict[Tuple, Dict[str, Any]]:
+        submissions = defaultdict(list)
+        grades = defaultdict(list)
+        for student_uuid, course_uuid, assignment_uuid, grade, created_at, due_date in rows:
+            submissions[(student_uuid, course_uuid)].append((assignment_uuid, created_at, due_date))
+            if grade is not None:
+                grades[(student_uuid, course_uuid)].append(grade)
+
+        return {
+            pair: {
+                **performance_metrics(grades[pair]),
+                **submission_metrics(submissions[pair], total_tasks.get(pair, 0))
+            }
+            for pair in pairs
+        }
+
+    def columnar_submission_features(self, pairs: List[Tuple], rows: List[Tuple], total_tasks: Dict) -> Dict[Tuple, Dict[str, Any]]:
+        pair_codes = {pair: code for code, pair in enumerate(pairs)}
+        assignment_codes = {}
+        students, courses, assignments, grades, created_at, due_dates = zip(*rows) if rows else ((),) * 6
+
+        features = grouped_submission_features(
+            group=np.fromiter(map(pair_codes.__getitem__, zip(students, courses)), dtype=np.int64, count=len(rows)),
+            assignment=np.fromiter((assignment_codes.setdefault(uuid, len(assignment_codes)) for uuid in assignments), dtype=np.int64, count=len(rows)),
+            created_at=np.array(created_at, dtype=np.int64),
+            due_date=np.array(due_dates, dtype=np.float64),  # None -> NaN
+            grade=np.array(grades, dtype=np.float64),
+            n_groups=len(pairs)
+        )
+        features = {name: values.tolist() for name, values in features.items()}
+
+        result = {}
+        for code, pair in enumerate(pairs):
+            if not features["submissions"][code]:
+                result[pair] = {**performance_metrics([]), **submission_metrics([], 0)}
+                continue
+
+            tasks = total_tasks.get(pair, 0)
+            result[pair] = {
+                "avg_grade": features["avg_grade"][code],
+                "grade_stddev": features["grade_stddev"][code],
+                "retry_rate": features["retry_rate"][code],
+                "avg_delivery_delay_days": features["avg_delivery_delay_days"][code],
+                "avg_submission_time_diff_hours": features["avg_submission_time_diff_hours"][code],
+                "late_submissions_count": features["late_submissions_count"][code],
+                "missing_tasks": tasks - features["completed_tasks"][code],
+                "completed_tasks": features["completed_tasks"][code],
+                "total_tasks": tasks
+            }
+        return result
+
+    def get_input_watermarks(self, student_uuids: List[str]) -> Dict[Tuple[Any, Any], int]:
+        """Máximo updated_at de las entregas del par y de las tareas de su sección"""
+        submissions = select(
+            Submission.student_uuid,
+            Assignment.course_uuid,
+            func.max(Submission.updated_at)
+        ).join(
+            Assignment,
+            Submission.assignment_uuid == Assignment.uuid
+        ).filter(
+            Submission.student_uuid.in_(student_uuids)
+        ).group_by(
+            Submission.student_uuid,
+            Assignment.course_uuid
+        )
+
+        assignments = select(
+            Enrollment.student_uuid,
+            Enrollment.course_uuid,
+            func.max(Assignment.updated_at)
+        ).join(
+            Assignment,
+            and_(
+                Assignment.course_uuid == Enrollment.course_uuid,
+                Assignment.section_uuid == Enrollment.section_uuid
+            )
+        ).filter(
+            Enrollment.student_uuid.in_(student_uuids)
+        ).group_by(
+            Enrollment.student_uuid,
+            Enrollment.course_uuid
+        )
+
+        watermarks = {}
+        for query in (submissions, assignments):
+            for student_uuid, course_uuid, updated_at in self.session.execute(query):
+                if updated_at is not None:
+                    pair = (student_uuid, course_uuid)
+                    watermarks[pair] = max(watermarks.get(pair, updated_at), updated_at)
+        return watermarks
+
+    def get_watermarks(self, student_uuids: List[str], sent_since: Optional[int] = None) -> Dict[Tuple[Any, Any], Tuple[Optional[int], str]]:
+        """(input_updated_at, feature_hash) del último envío de cada par; con sent_since, solo los enviados desde entonces"""
+        watermarks = select(
+            ProcessWatermark.student_uuid,
+            ProcessWatermark.course_uuid,
+            ProcessWatermark.input_updated_at,
+            ProcessWatermark.feature_hash
+        ).filter(ProcessWatermark.student_uuid.in_(student_uuids))
+        if sent_since is not None:
+            watermarks = watermarks.filter(ProcessWatermark.processed_at >= sent_since)
+        watermarks = self.session.execute(watermarks)
+        return {(student_uuid, course_uuid): (input_updated_at, data_hash) for student_uuid, course_uuid, input_updated_at, data_hash in watermarks}
+
+    def get_chunk_features(self, student_uuids: List[Any], full: bool = False, sent_since: Optional[int] = None) -> Dict[Tuple[Any, Any], Tuple]:
+        """Por par: (métricas, hash, watermark de entrada, (watermark, hash) del último envío).
+
+        En una corrida full no se usan los envíos anteriores, salvo los hechos desde sent_since
+        (el inicio de la corrida), para que un work item retomado no reenvíe lo que ya envió.
+        """
+        students_data = self.get_all_students_data(student_uuids)
+        input_watermarks = self.get_input_watermarks(student_uuids)
+        if not full:
+            watermarks = self.get_watermarks(student_uuids)
+        elif sent_since is not None:
+            watermarks = self.get_watermarks(student_uuids, sent_since)
+        else:
+            watermarks = {}
+        return {
+            pair: (data, feature_hash(data), input_watermarks.get(pair), watermarks.get(pair, (None, None)))
+            for pair, data in students_data.items()
+        }
+
+    def iter_enrolled_students(self) -> Iterator[Tuple[Any, int]]:
+        """(student_uuid, inscripciones) de todos los estudiantes inscritos, ordenados por uuid.
+
+        Se leen de a PROCESS_STREAM_CHUNK_SIZE filas con un cursor del servidor (yield_per
+        activa stream_results), así que la memoria no depende de la cantidad de inscripciones.
+        """
+        students = select(
+            Enrollment.student_uuid,
+            func.count(Enrollment.uuid)
+        ).group_by(
+            Enrollment.student_uuid
+        ).order_by(
+            Enrollment.student_uuid
+        ).execution_options(
+            yield_per=settings.PROCESS_STREAM_CHUNK_SIZE
+        )
+        for student_uuid, enrollments in self.session.execute(students):
+            yield student_uuid, enrollments
+
+    def get_enrollments(self, first_student_uuid, last_student_uuid) -> List[Dict[str, Any]]:
+        """Inscripciones de los estudiantes entre first y last (inclusive), con los datos que se envían"""
+        return self._enrollment_rows(Enrollment.student_uuid.between(first_student_uuid, last_student_uuid))
+
+    def get_pair_enrollments(self, pairs: List[Tuple[Any, Any]]) -> List[Dict[str, Any]]:
+        """Inscripciones de los pares (estudiante, curso) dados, con los datos que se envían"""
+        return self._enrollment_rows(tuple_(Enrollment.student_uuid, Enrollment.course_uuid).in_(pairs))
+
+    def _enrollment_rows(self, condition) -> List[Dict[str, Any]]:
+        enrollments = self.session.execute(
+            select(
+                Enrollment.student_uuid,
+                Enrollment.course_uuid,
+                Course.code,
+                Student.email,
+                Student.first_name,
+                Student.last_name
+            ).join(
+                Student,
+                Student.uuid == Enrollment.student_uuid
+            ).join(
+                Course,
+                Course.uuid == Enrollment.course_uuid
+            ).filter(
+                condition
+            ).order_by(
+                Enrollment.student_uuid
+            )
+        )
+        return [
+            {
+                "student_uuid": student_uuid,
+                "course_uuid": course_uuid,
+                "course_code": str(code),
+                "email": str(email),
+                "full_name": f'{first_name} {last_name}'
+            }
+            for student_uuid, course_uuid, code, email, first_name, last_name in enrollments
+        ]
+
+    def save_watermarks(self, watermarks: List[Dict[str, Any]]) -> None:
+        """Inserta o actualiza los watermarks de los pares enviados (sin commit)"""
+        if not watermarks:
+            return
+        statement = insert(ProcessWatermark).values(watermarks)
+        self.session.execute(statement.on_conflict_do_update(
+            index_elements=[ProcessWatermark.student_uuid, ProcessWatermark.course_uuid],
+            set_={
+                "input_updated_at": statement.excluded.input_updated_at,
+                "feature_hash": statement.excluded.feature_hash,
+                "processed_at": statement.excluded.processed_at
+            }
+        ))
+
+def feature_hash(data: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+def compute_shard_chunk(student_uuids: List[Any], full: bool, sent_since: Optional[int] = None) -> Tuple[Dict, Dict[str, Any]]:
+    """Corre en un proceso del pool: métricas del lote con una sesión propia, más lo que tardó"""
+    started = time.perf_counter()
+    session = SessionLocal()
+    try:
+        features = ProcessDataAccess(session).get_chunk_features(student_uuids, full, sent_since)
+    finally:
+        session.close()
+    return features, {
+        "pid": os.getpid(),
+        "chunks": 1,
+        "students": len(student_uuids),
+        "pairs": len(features),
+        "seconds": time.perf_counter() - started
+    }
+
+class LeaseLost(Exception):
+    """Otro worker tomó el work item porque su lease venció"""
+
 class ProcessService(AppService):
     def __init__(self, session: Session, request: Request):
         super().__init__(session, request)
         self.data_access = ProcessDataAccess(session)
+        self.run_data_access = ProcessRunDataAccess(session)
+        self.retry_data_access = ProcessRetryDataAccess(session)
+
+    def enqueue_run(self, full: bool = False, resume: bool = True):
+        """Encola una corrida para los workers (app.workers.process); 409 si ya hay una en curso"""
+        try:
+            run, resumed = self.run_data_access.enqueue_run(full, resume)
+            if run is None:
+                raise HTTPException(status_code=409, detail="A process run is already in progress")
+            self.session.commit()
+            return run, resumed
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error enqueuing process run: {e}")
+            self.session.rollback()
+            raise HTTPException(status_code=500, detail="Error enqueuing process run")
+
+    def coordinate_runs(self) -> None:
+        """Solo el worker con el advisory lock: cierra las corridas terminadas y arranca la próxima encolada"""
+        for run in self.run_data_access.get_running_runs():
+            self.run_data_access.refresh_run(run.uuid)
+            self.session.commit()
+
+        run = self.run_data_access.get_next_queued_run()
+        if run is None:
+            return
+        students = self.data_access.iter_enrolled_students() if run.started_at is None else None
+        resumed = run.started_at is not None
+        self.run_data_access.start_run(run, students)
+        logger.info(f"Starting run {run.uuid} (full={run.full}, work_items={run.work_items}, resumed={resumed})")
+        # Una corrida sin inscripciones no tiene items; se cierra en el acto
+        self.run_data_access.refresh_run(run.uuid)
+        self.session.commit()
+
+    def process_next_work_item(self, worker_id: str, stop: Optional[threading.Event] = None, pool: Optional[ProcessPoolExecutor] = None, shards: int = 1) -> bool:
+        """Toma un work item de la cola y envía sus pares; False si no había ninguno.
+
+        Si stop se activa el item vuelve a la cola para otro worker. Si falla vuelve a la cola
+        hasta PROCESS_WORK_MAX_ATTEMPTS intentos y después queda failed.
+        """
+        item = self.run_data_access.claim_work_item(worker_id)
+        if item is None:
+            self.session.commit()
+            return False
+
+        # Se copian los valores: los commits de los checkpoints expiran los objetos
+        item_uuid, run_uuid, chunk_index, attempts = item.uuid, item.run_uuid, item.chunk_index, item.attempts
+        first_student_uuid, last_student_uuid = item.first_student_uuid, item.last_student_uuid
+        run = self.run_data_access.get_run_by_uuid(run_uuid)
+        # Una corrida full saltea solo lo que ya envió ella misma (item retomado tras un lease vencido, un apagado o un fallo)
+        full, sent_since = run.full, run.started_at if run.full else None
+        self.session.commit()
+        logger.info(f"Work item {item_uuid} (chunk {chunk_index} of run {run_uuid}) leased by {worker_id}, attempt {attempts}")
+
+        def save_checkpoint(watermarks: List[Dict[str, Any]], failures: List[Dict[str, Any]], values: Dict[str, Any]):
+            # Lo enviado queda registrado aunque el lease se haya perdido
+            self.save_outcomes(watermarks, failures, run_uuid)
+            self.session.commit()
+            if not self.run_data_access.update_work_item(item_uuid, worker_id, **values):
+                self.session.rollback()
+                raise LeaseLost(f"Work item {item_uuid} was taken by another worker")
+            self.run_data_access.refresh_run(run_uuid)
+            self.session.commit()
+
+        try:
+            enrollments = self.data_access.get_enrollments(first_student_uuid, last_student_uuid)
+            stats = asyncio.run(self.dispatch_student_prediction_data(enrollments, full, stop, pool, shards, save_checkpoint, sent_since))
+            if stats["stopped"]:
+                self.run_data_access.release_work_item(item_uuid, worker_id)
+                logger.info(f"Process stopped, work item {item_uuid} released: {stats}")
+            else:
+                self.run_data_access.update_work_item(item_uuid, worker_id, ProcessWorkItemStatus.DONE)
+                logger.info(f"Work item {item_uuid} done: {stats}")
+        except LeaseLost as e:
+            logger.warning(str(e))
+            self.session.rollback()
+            return True
+        except Exception as e:
+            logger.error(f"Error processing work item {item_uuid}: {e}")
+            self.session.rollback()
+            self.run_data_access.fail_work_item(item_uuid, worker_id, attempts, str(e))
+
+        self.run_data_access.refresh_run(run_uuid)
+        self.session.commit()
+        return True
+
+    def process_due_retries(self, stop: Optional[threading.Event] = None, pool: Optional[ProcessPoolExecutor] = None, shards: int = 1) -> bool:
+        """Reenvía hasta PROCESS_RETRY_BATCH_SIZE pares con el reintento vencido; False si no había ninguno.
+
+        Solo se envían esos pares, con las métricas recalculadas. Los que vuelven a fallar se
+        reprograman con backoff y, tras PROCESS_RETRY_MAX_ATTEMPTS, pasan a dead letters.
+        """
+        pairs = self.retry_data_access.claim_due_retries(settings.PROCESS_RETRY_BATCH_SIZE)
+        self.session.commit()
+        if not pairs:
+            return False
+
+        def save_checkpoint(watermarks: List[Dict[str, Any]], failures: List[Dict[str, Any]], values: Dict[str, Any]):
+            self.save_outcomes(watermarks, failures)
+            self.session.commit()
 
-    def process_student_prediction_data(self) -> None:
         try:
-            all_enrollments = EnrollmentDataAccess(self.session).get_all_enrollments(all=True)
-
-            for enrollment in all_enrollments:
-                student_uuid = enrollment.student_uuid
-                course_uuid = enrollment.course_uuid
-
-                logger.info(f"Getting student prediction data for student {student_uuid} in course {course_uuid}")
-
-                course_data = CourseDataAccess(self.session).get_course_by_uuid(course_uuid)
-
-                student_data = StudentDataAccess(self.session).get_student_by_uuid(student_uuid)
-
-                data = self.data_access.get_student_data(student_uuid, course_uuid)
-
-                # Verifcamos si el usuario existe en el microservicio de users
-                user_response = requests.patch(
-                    f"{settings.API_AUTH_URL}/internal/users_services/get_or_create_user", 
-                    json={
-                        "email": str(student_data.email),
-                        "full_name": f'{student_data.first_name} {student_data.last_name}',
-                        "uuid": str(student_uuid)
-                    },
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-HTTP-PURPOSE": "internal"
-                    }
-                )
-                
-                if user_response.status_code != 200:
-                    logger.error(f"Error getting user: {user_response.text}")
-                    continue
-
-                # Construir la URL con los query params
-                url = f"{settings.API_PREDICTION_URL}/process/predictions/process_student_data"
-                params = {
-                    "user_uuid": str(student_uuid),
-                    "course_id": str(course_data.code)
-                }
-                
-                # Enviar los datos en el body como JSON
-                response = requests.post(
-                    url,
-                    params=params,
-                    json=data,
-                    headers={"Content-Type": "application/json"}
-                )
-
-                if response.status_code != 200:
-                    logger.error(f"Error processing student prediction data: {response.text}")
-                    continue
-
-            logger.info(f"End process")
+            enrollments = self.data_access.get_pair_enrollments(pairs)
+            # Los pares que ya no están inscritos no tienen nada que reintentar
+            enrolled = {(enrollment["student_uuid"], enrollment["course_uuid"]) for enrollment in enrollments}
+            self.retry_data_access.clear_retries([pair for pair in pairs if pair not in enrolled])
+            self.session.commit()
+
+            stats = asyncio.run(self.dispatch_student_prediction_data(enrollments, True, stop, pool, shards, save_checkpoint))
+            logger.info(f"Retried {len(pairs)} pairs: {stats}")
         except Exception as e:
-            logger.error(f"Error getting student prediction data: {e}")
\ No newline at end of file
+            # Los pares quedan en la cola y se vuelven a tomar cuando vence su lease
+            logger.error(f"Error retrying process pairs: {e}")
+            self.session.rollback()
+        return True
+
+    def save_outcomes(self, watermarks: List[Dict[str, Any]], failures: List[Dict[str, Any]], run_uuid=None) -> None:
+        """Watermarks de los pares enviados, que además salen de la cola de reintentos, y reintentos de los que fallaron (sin commit)"""
+        self.data_access.save_watermarks(watermarks)
+        self.retry_data_access.clear_retries([(watermark["student_uuid"], watermark["course_uuid"]) for watermark in watermarks])
+        self.retry_data_access.record_failures(failures, run_uuid)
+
+    async def dispatch_student_prediction_data(
+        self,
+        enrollments: List[Dict[str, Any]],
+        full: bool = False,
+        stop: Optional[threading.Event] = None,
+        pool: Optional[ProcessPoolExecutor] = None,
+        shards: int = 1,
+        save_checkpoint=None,
+        sent_since: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Calcula las métricas por lotes de estudiantes mientras PROCESS_DISPATCH_CONCURRENCY workers las envían.
+
+        Con un pool de procesos los lotes se calculan en él, hasta `shards` lotes a la vez,
+        y se encolan en el mismo orden.
+
+        Salvo en corridas full, solo se envían los pares cuyas entregas o tareas cambiaron
+        desde el último envío o cuyo vector de métricas es distinto al enviado. En las full,
+        con sent_since solo se comparan los envíos hechos desde ese momento.
+
+        Cada PROCESS_RUN_CHECKPOINT_SECONDS, y al terminar, se llama a save_checkpoint(watermarks, fallos, progreso)
+        desde un hilo con los watermarks de los pares enviados y los pares que fallaron desde el anterior;
+        si falla se corta el envío.
+        """
+        enrollments_by_student = defaultdict(list)
+        for enrollment in enrollments:
+            enrollments_by_student[enrollment["student_uuid"]].append(enrollment)
+        student_uuids = sorted(enrollments_by_student)
+
+        concurrency = max(1, settings.PROCESS_DISPATCH_CONCURRENCY)
+        chunk_size = max(1, settings.PROCESS_FEATURES_CHUNK_SIZE)
+        chunks = [student_uuids[start:start + chunk_size] for start in range(0, len(student_uuids), chunk_size)]
+        queue = asyncio.Queue(maxsize=concurrency * 2)
+        # La sesión se usa desde hilos; el lock evita que dos consultas la usen a la vez
+        session_lock = asyncio.Lock()
+        # Procesos del pool -> lotes, estudiantes, pares y segundos que calcularon
+        shard_stats = defaultdict(dict)
+
+        progress = {"processed": 0, "sent": 0, "skipped": 0, "failed": 0}
+        # Watermarks de los pares ya enviados y pares que fallaron, pendientes de guardar
+        sent_watermarks = {}
+        failures = {}
+        # Error de un checkpoint periódico; corta el envío como stop
+        checkpoint_errors = []
+
+        def stopped() -> bool:
+            return bool(checkpoint_errors) or (stop is not None and stop.is_set())
+
+        def on_done(item: Dict[str, Any], sent: bool):
+            progress["processed"] += 1
+            if sent:
+                progress["sent"] += 1
+                sent_watermarks[item["pair"]] = item["watermark"]
+                failures.pop(item["pair"], None)
+            else:
+                progress["failed"] += 1
+                student_uuid, course_uuid = item["pair"]
+                failures[item["pair"]] = {"student_uuid": student_uuid, "course_uuid": course_uuid, **item["error"]}
+
+        async def checkpoint_progress(dispatcher: ProcessDispatcher):
+            if save_checkpoint is None:
+                return
+            # Copia en el hilo del event loop; los callbacks siguen modificando los originales
+            watermarks = list(sent_watermarks.values())
+            failed = list(failures.values())
+            sent_watermarks.clear()
+            failures.clear()
+            values = {**progress, "retries": dispatcher.stats["retries"]}
+            if dispatcher.last_error is not None:
+                values["last_error"] = dispatcher.last_error
+            async with session_lock:
+                await asyncio.to_thread(save_checkpoint, watermarks, failed, values)
+
+        async def checkpoint_periodically(dispatcher: ProcessDispatcher, finished: asyncio.Event):
+            # No se cancela: el hilo de un checkpoint cancelado seguiría usando la sesión sin el lock
+            while not finished.is_set():
+                try:
+                    await asyncio.wait_for(finished.wait(), settings.PROCESS_RUN_CHECKPOINT_SECONDS)
+                except asyncio.TimeoutError:
+                    try:
+                        await checkpoint_progress(dispatcher)
+                    except Exception as e:
+                        checkpoint_errors.append(e)
+                        return
+
+        async def chunk_features():
+            """(lote, métricas) en orden; con pool calcula hasta `shards` lotes a la vez en otros procesos"""
+            if pool is None:
+                for chunk in chunks:
+                    # Las consultas corren en un hilo para que los envíos sigan mientras tanto
+                    async with session_lock:
+                        features = await asyncio.to_thread(self.data_access.get_chunk_features, chunk, full, sent_since)
+                    yield chunk, features
+                return
+
+            loop = asyncio.get_running_loop()
+            in_flight = deque()
+            next_chunk = 0
+            try:
+                while next_chunk < len(chunks) or in_flight:
+                    while next_chunk < len(chunks) and len(in_flight) < shards and not stopped():
+                        chunk = chunks[next_chunk]
+                        in_flight.append((chunk, loop.run_in_executor(pool, compute_shard_chunk, chunk, full, sent_since)))
+                        next_chunk += 1
+                    if not in_flight:
+                        return
+                    chunk, future = in_flight.popleft()
+                    features, chunk_stats = await future
+                    shard = shard_stats[chunk_stats.pop("pid")]
+                    for key, value in chunk_stats.items():
+                        shard[key] = shard.get(key, 0) + value
+                    yield chunk, features
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+
+        async def produce() -> bool:
+            """Encola los lotes; devuelve False si se detuvo antes de terminar"""
+            produced = 0
+            async for chunk, features in chunk_features():
+                if stopped():
+                    return False
+                for student_uuid in chunk:
+                    for enrollment in enrollments_by_student[student_uuid]:
+                        pair = (student_uuid, enrollment["course_uuid"])
+                        pair_features = features.get(pair)
+                        if pair_features is None:
+                            # La inscripción se borró después de leer la lista: no hay nada que enviar
+                            logger.warning(f"Skipping student {student_uuid} in course {enrollment['course_uuid']}: no longer enrolled")
+                            progress["processed"] += 1
+                            progress["skipped"] += 1
+                            continue
+                        data, data_hash, input_updated_at, (previous_updated_at, previous_hash) = pair_features
+                        if previous_hash == data_hash and (
+                            input_updated_at is None or (previous_updated_at is not None and input_updated_at <= previous_updated_at)
+                        ):
+                            progress["processed"] += 1
+                            progress["skipped"] += 1
+                            continue
+
+                        logger.info(f"Getting student prediction data for student {student_uuid} in course {enrollment['course_uuid']}")
+                        await queue.put({
+                            "student_uuid": str(student_uuid),
+                            "email": enrollment["email"],
+                            "full_name": enrollment["full_name"],
+                            "course_code": enrollment["course_code"],
+                            "data": data,
+                            "pair": pair,
+                            "watermark": {
+                                "student_uuid": student_uuid,
+                                "course_uuid": enrollment["course_uuid"],
+                                "input_updated_at": input_updated_at,
+                                "feature_hash": data_hash,
+                                "processed_at": int(datetime.now(timezone.utc).timestamp())
+                            }
+                        })
+                produced += 1
+            return produced == len(chunks)
+
+        async def consume(dispatcher: ProcessDispatcher):
+            while (item := await queue.get()) is not None:
+                try:
+                    await dispatcher.dispatch(item)
+                except Exception as e:
+                    logger.error(f"Error dispatching student {item['student_uuid']}: {e}")
+                    dispatcher.last_error = str(e)
+                    item["error"] = {"stage": "dispatch", "error": str(e)}
+                    on_done(item, False)
+
+        async with ProcessDispatcher(on_done=on_done) as dispatcher:
+            workers = [asyncio.create_task(consume(dispatcher)) for _ in range(concurrency)]
+            finished = asyncio.Event()
+            checkpointer = asyncio.create_task(checkpoint_periodically(dispatcher, finished))
+            try:
+                completed = await produce()
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+                await dispatcher.flush()
+            finally:
+                for task in workers:
+                    task.cancel()
+                finished.set()
+                await checkpointer
+                if not checkpoint_errors:
+                    # Lo ya enviado queda registrado aunque el envío falle
+                    await checkpoint_progress(dispatcher)
+            if checkpoint_errors:
+                raise checkpoint_errors[0]
+            return {**dispatcher.stats, **progress, "stopped": not completed, "shards": dict(shard_stats)}
@@ -0,0 +1,120 @@
+import logging
+from fastapi import Request, HTTPException
+from sqlalchemy import String, cast, func, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.career_model import Career
+from app.models.courses_model import Course
+from app.models.assignments_model import Assignment
+from app.models.content_model import Content
+from app.models.course_content import CourseContent
+from app.models.students_model import Student
+from app.schemas.search_schema import SearchHit, SearchResponse
+from app.utils.access_scope import AccessScope
+from app.utils.search import build_tsquery
+from app.services.base_service import AsyncAppDataAccess, AsyncAppService
+
+logger = logging.getLogger('search_service')
+
+# Tipo -> (modelo, título, subtítulo) de cada resultado
+SEARCH_TYPES = {
+    "careers": (Career, Career.name, Career.code),
+    "courses": (Course, Course.name, Course.code),
+    "assignments": (Assignment, Assignment.title, Assignment.description),
+    "contents": (Content, Content.title, Content.file_type),
+    "students": (Student, Student.first_name + " " + Student.last_name, Student.email),
+}
+
+def type_label(type: str):
+    # Los tipos salen de SEARCH_TYPES; como literal evita un parámetro sin tipo dentro del UNION
+    return literal_column(f"'{type}'", String).label("type")
+
+def scope_filter(type: str, _access_scope: AccessScope):
+    if type == "careers":
+        return Career.uuid.in_(_access_scope.career_uuids)
+    if type == "courses":
+        return Course.uuid.in_(_access_scope.course_uuids)
+    if type == "assignments":
+        return Assignment.course_uuid.in_(_access_scope.course_uuids)
+    if type == "contents":
+        return Content.course_contents.any(CourseContent.course_uuid.in_(_access_scope.course_uuids))
+    # /students/get-all no restringe por usuario; la búsqueda tampoco
+    return None
+
+def matches(type: str, tsquery, _access_scope: AccessScope = None):
+    model = SEARCH_TYPES[type][0]
+    conditions = [model.search_vector.op("@@")(tsquery)]
+    if _access_scope is not None:
+        condition = scope_filter(type, _access_scope)
+        if condition is not None:
+            conditions.append(condition)
+    return conditions
+
+def search_query(types: list[str], tsquery, limit: int = 20, _access_scope: AccessScope = None):
+    """Resultados de todos los tipos en una sola consulta, ordenados por relevancia"""
+    hits = []
+    for type in types:
+        model, title, subtitle = SEARCH_TYPES[type]
+        hits.append(
+            select(
+                type_label(type),
+                model.uuid.label("uuid"),
+                cast(title, String).label("title"),
+                cast(subtitle, String).label("subtitle"),
+                func.ts_rank_cd(model.search_vector, tsquery).label("rank")
+            ).filter(*matches(type, tsquery, _access_scope))
+        )
+    hits = union_all(*hits).subquery()
+    return select(hits).order_by(hits.c.rank.desc(), hits.c.uuid).limit(limit)
+
+def facets_query(types: list[str], tsquery, _access_scope: AccessScope = None):
+    """Cantidad total de coincidencias por tipo"""
+    return union_all(*[
+        select(type_label(type), func.count().label("total"))
+        .select_from(SEARCH_TYPES[type][0])
+        .filter(*matches(type, tsquery, _access_scope))
+        for type in types
+    ])
+
+class SearchAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def search(self, types: list[str], tsquery, limit: int = 20, _access_scope: AccessScope = None):
+        items = (await self.session.execute(search_query(types, tsquery, limit, _access_scope))).all()
+        facets = (await self.session.execute(facets_query(types, tsquery, _access_scope))).all()
+        return items, {type: total for type, total in facets}
+
+class SearchAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = SearchAsyncDataAccess(session)
+
+    async def search(self, q: str, types: str = None, limit: int = 20):
+        tsquery = build_tsquery(q)
+        if tsquery is None:
+            raise HTTPException(status_code=400, detail="Empty search query")
+
+        selected = list(dict.fromkeys(type.strip() for type in types.split(",") if type.strip())) if types else list(SEARCH_TYPES)
+        unknown = [type for type in selected if type not in SEARCH_TYPES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(unknown)}")
+
+        try:
+            items, facets = await self.data_access.search(selected, tsquery, limit, await self.get_access_scope())
+
+            return SearchResponse(
+                query=q,
+                total=sum(facets.values()),
+                facets={type: facets.get(type, 0) for type in selected},
+                items=[SearchHit(
+                    type=item.type,
+                    uuid=item.uuid,
+                    title=item.title,
+                    subtitle=item.subtitle,
+                    rank=item.rank
+                ) for item in items]
+            )
+        except Exception as e:
+            logger.error(f"Error searching: {e}")
+            raise HTTPException(status_code=500, detail="Error searching")
@@ -1,18 +1,61 @@
 import logging
 from fastapi import Request, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 
 from app.models.sections_model import Section
 from app.models.course_sections_model import CourseSection
 from app.models.courses_model import Course
 from app.models.enrollments_model import Enrollment
 from app.schemas.sections_schema import SectionCreate, SectionUpdate, SectionResponse
-from app.services.base_service import AppDataAccess, AppService
+from app.utils.access_scope import AccessScope
+from app.utils.pagination import Cursor, paginate
+from app.services.base_service import AppDataAccess, AppService, AsyncAppDataAccess, AsyncAppService
 
 logger = logging.getLogger('section_service')
 
+def sections_query(skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+    items = select(Section)
+
+    if course_uuid:
+        items = items.filter(
+            Section.course_sections.any(
+                CourseSection.course_uuid == course_uuid
+            )
+        )
+    if search:
+        items = items.filter(
+            or_(
+                Section.name.ilike(f"%{search}%"), 
+                Section.section_code.ilike(f"%{search}%")
+            )
+        )
+    if course_code:
+        items = items.filter(
+            Section.course_sections.any(
+                CourseSection.course.has(
+                    Course.code.ilike(f"%{course_code}%")
+                )
+            )
+        )
+
+    if _access_scope is not None:
+        items = items.filter(Section.uuid.in_(_access_scope.section_uuids))
+    if student_uuid:
+        items = items.filter(
+            Section.course_sections.any(
+                CourseSection.course.has(
+                    Course.enrollments.any(
+                        Enrollment.student_uuid == student_uuid
+                    )
+                )
+            )
+        )
+    items = paginate(items, Section, skip, limit, cursor)
+    return items
+
 class SectionDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -37,53 +80,8 @@ class SectionDataAccess(AppDataAccess):
         item = item.first()
         return item if item else None
     
-    def get_all_sections(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, _current_user_uuid: str = None):
-        items = self.session.query(Section)
-
-        if course_uuid:
-            items = items.filter(
-                Section.course_sections.any(
-                    CourseSection.course_uuid == course_uuid
-                )
-            )
-        if search:
-            items = items.filter(
-                or_(
-                    Section.name.ilike(f"%{search}%"), 
-                    Section.section_code.ilike(f"%{search}%")
-                )
-            )
-        if course_code:
-            items = items.filter(
-                Section.course_sections.any(
-                    CourseSection.course.any(
-                        Course.code.ilike(f"%{course_code}%")
-                    )
-                )
-            )
-
-        if _current_user_uuid:
-            items = items.filter(
-                Section.course_sections.any(
-                    CourseSection.course.has(
-                        Course.enrollments.any(
-                            Enrollment.student_uuid == _current_user_uuid
-                        )
-                    )
-                )
-            )
-        if student_uuid:
-            items = items.filter(
-                Section.course_sections.any(
-                    CourseSection.course.has(
-                        Course.enrollments.any(
-                            Enrollment.student_uuid == student_uuid
-                        )
-                    )
-                )
-            )
-        items = items.order_by(Section.created_at.desc())
-        items = items.offset(skip).limit(limit)
+    def get_all_sections(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = self.session.scalars(sections_query(skip, limit, course_uuid, search, course_code, student_uuid, cursor, _access_scope))
         items = items.all()
         return items if items else None
 
@@ -154,9 +152,9 @@ class SectionService(AppService):
             logger.error(f"Error getting section by uuid: {e}")
             raise HTTPException(status_code=500, detail="Error getting section by uuid")
         
-    def get_all_sections(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None):
+    def get_all_sections(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None):
         try:
-            items = self.data_access.get_all_sections(skip, limit, course_uuid, search, course_code, student_uuid, self.current_user_uuid)
+            items = self.data_access.get_all_sections(skip, limit, course_uuid, search, course_code, student_uuid, cursor, self.get_access_scope())
             
             return [SectionResponse(
                 uuid=item.uuid,
@@ -207,5 +205,61 @@ class SectionService(AppService):
         except Exception as e:
             logger.error(f"Error deleting section: {e}")
             self.session.rollback()
-            raise HTTPException(status_code=500, detail="Error deleting section") 
-    
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Error deleting section")
+
+class SectionAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_section_by_uuid(self, uuid: str):
+        item = select(Section)
+        item = item.filter(Section.uuid == uuid)
+        item = (await self.session.scalars(item)).first()
+        return item if item else None
+
+    async def get_all_sections(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None, _access_scope: AccessScope = None):
+        items = sections_query(skip, limit, course_uuid, search, course_code, student_uuid, cursor, _access_scope)
+        items = (await self.session.scalars(items)).all()
+        return items if items else None
+
+class SectionAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = SectionAsyncDataAccess(session)
+
+    async def get_section_by_uuid(self, uuid: str):
+        try:
+            item = await self.data_access.get_section_by_uuid(uuid)
+
+            if not item:
+                raise HTTPException(status_code=404, detail="Section not found")
+            
+            return SectionResponse(
+                uuid=item.uuid,
+                name=item.name,
+                section_code=item.section_code,
+                capacity=item.capacity,
+                description=item.description,
+                created_at=item.created_at,
+                updated_at=item.updated_at
+            )
+        except Exception as e:
+            logger.error(f"Error getting section by uuid: {e}")
+            raise HTTPException(status_code=500, detail="Error getting section by uuid")
+        
+    async def get_all_sections(self, skip: int = 0, limit: int = 100, course_uuid: str = None, search: str = None, course_code: str = None, student_uuid: str = None, cursor: Cursor = None):
+        try:
+            items = await self.data_access.get_all_sections(skip, limit, course_uuid, search, course_code, student_uuid, cursor, await self.get_access_scope())
+            
+            return [SectionResponse(
+                uuid=item.uuid,
+                name=item.name,
+                section_code=item.section_code,
+                capacity=item.capacity,
+                description=item.description,
+                created_at=item.created_at,
+                updated_at=item.updated_at
+            ) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting all sections: {e}")
+            raise HTTPException(status_code=500, detail="Error getting all sections")
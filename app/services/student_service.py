@@ -2,14 +2,23 @@ import logging
 from fastapi import Request, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+from sqlalchemy import select
 
 from app.models.students_model import Student
 from app.models.enrollments_model import Enrollment
 from app.schemas.students_schema import StudentCreate, StudentUpdate, StudentResponse
+from app.utils.pagination import Cursor, paginate
 from app.services.base_service import AppDataAccess, AppService
 
 logger = logging.getLogger('student_service')
 
+def students_query(skip: int = 0, limit: int = 100, course_uuid: str = None, cursor: Cursor = None):
+    items = select(Student)
+    if course_uuid:
+        items = items.filter(Student.enrollments.any(Enrollment.course_uuid == course_uuid))
+    items = paginate(items, Student, skip, limit, cursor)
+    return items
+
 class StudentDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -33,12 +42,9 @@ class StudentDataAccess(AppDataAccess):
         item = item.first()
         return item if item else None
     
-    def get_all_students(self, skip: int = 0, limit: int = 100, course_uuid: str = None):
-        items = self.session.query(Student)
-        if course_uuid:
-            items = items.filter(Student.enrollments.any(Enrollment.course_uuid == course_uuid))
-        items = items.order_by(Student.created_at.desc())
-        items = items.offset(skip).limit(limit)
+    def get_all_students(self, skip: int = 0, limit: int = 100, course_uuid: str = None, cursor: Cursor = None):
+        items = self.session.scalars(students_query(skip, limit, course_uuid, cursor))
+        items = items.all()
         return items
     
     def update_student(self, uuid: str, student: StudentUpdate):
@@ -105,9 +111,9 @@ class StudentService(AppService):
             logger.error(f"Error getting student by uuid: {e}")
             raise HTTPException(status_code=500, detail="Error getting student by uuid")
         
-    def get_all_students(self, skip: int = 0, limit: int = 100, course_uuid: str = None):
+    def get_all_students(self, skip: int = 0, limit: int = 100, course_uuid: str = None, cursor: Cursor = None):
         try:
-            items = self.data_access.get_all_students(skip, limit, course_uuid)
+            items = self.data_access.get_all_students(skip, limit, course_uuid, cursor)
             
             return [StudentResponse(
                 uuid=item.uuid,
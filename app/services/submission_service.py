@@ -1,17 +1,66 @@
 import logging
 from fastapi import Request, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from app.models.submissions_model import Submission
 from app.models.assignments_model import Assignment
 from app.models.courses_model import Course
 from app.models.students_model import Student
 from app.schemas.submissions_schema import SubmissionCreate, SubmissionUpdate, SubmissionResponse
-from app.services.base_service import AppDataAccess, AppService
+from app.utils.pagination import Cursor, paginate
+from app.utils.search import text_search
+from app.services.base_service import AppDataAccess, AppService, AsyncAppDataAccess, AsyncAppService
 
 logger = logging.getLogger('submission_service')
 
+def submissions_query(
+    skip: int = 0, 
+    limit: int = 100,
+    course_uuid: str = None,
+    assignment_uuid: str = None, 
+    student_uuid: str = None,
+    course_code: str = None,
+    assignment_name: str = None,
+    search: str = None,
+    cursor: Cursor = None,
+    _current_user_uuid: str = None
+):
+    items = select(Submission)
+    if course_uuid:
+        items = items.filter(
+            Submission.assignment.has(
+                Assignment.course_uuid == course_uuid
+            )
+        )
+    if assignment_uuid:
+        items = items.filter(Submission.assignment_uuid == assignment_uuid)
+    if student_uuid:
+        items = items.filter(Submission.student_uuid == student_uuid)
+    if course_code:
+        items = items.filter(Submission.assignment.has(Assignment.course.has(Course.code.ilike(f"%{course_code}%"))))
+    if assignment_name:
+        items = items.filter(Submission.assignment.has(Assignment.title.ilike(f"%{assignment_name}%")))
+    if search:
+        items = items.filter(
+            or_(
+                Submission.assignment.has(text_search(Assignment, search, Assignment.title)),
+                Submission.student.has(text_search(Student, search, Student.first_name, Student.last_name)),
+                Submission.assignment.has(Assignment.course.has(text_search(Course, search, Course.name, Course.code)))
+            )
+        )
+    if _current_user_uuid:
+        items = items.filter(Submission.student_uuid == _current_user_uuid)
+    items = paginate(items, Submission, skip, limit, cursor)
+    return items
+
+# Relaciones que serializa SubmissionResponse; son many-to-one, así que van en el mismo SELECT
+SUBMISSION_RESPONSE_OPTIONS = (
+    joinedload(Submission.student),
+    joinedload(Submission.assignment)
+)
+
 class SubmissionDataAccess(AppDataAccess):
     def __init__(self, session: Session):
         super().__init__(session)
@@ -33,7 +82,7 @@ class SubmissionDataAccess(AppDataAccess):
         return item
 
     def get_submission_by_uuid(self, uuid: str):
-        item = self.session.query(Submission)
+        item = self.session.query(Submission).options(*SUBMISSION_RESPONSE_OPTIONS)
         item = item.filter(Submission.uuid == uuid)
         item = item.first()
         return item if item else None
@@ -48,43 +97,11 @@ class SubmissionDataAccess(AppDataAccess):
         course_code: str = None,
         assignment_name: str = None,
         search: str = None,
+        cursor: Cursor = None,
         _current_user_uuid: str = None
     ):
-        items = self.session.query(Submission)
-        if course_uuid:
-            items = items.filter(
-                Submission.assignment.any(
-                    Assignment.course_uuid == course_uuid
-                )
-            )
-        if assignment_uuid:
-            items = items.filter(Submission.assignment_uuid == assignment_uuid)
-        if student_uuid:
-            items = items.filter(Submission.student_uuid == student_uuid)
-        if course_code:
-            items = items.filter(Submission.assignment.has(Assignment.course.has(Course.code.ilike(f"%{course_code}%"))))
-        if assignment_name:
-            items = items.filter(Submission.assignment.has(Assignment.title.ilike(f"%{assignment_name}%")))
-        if search:
-            items = items.filter(
-                or_(
-                    Submission.assignment.has(Assignment.title.ilike(f"%{search}%")), 
-                    Submission.student.has(Student.first_name.ilike(f"%{search}%")), 
-                    Submission.student.has(Student.last_name.ilike(f"%{search}%")),
-                    Submission.assignment.has(
-                        Assignment.course.has(
-                            or_(
-                                Course.name.ilike(f"%{search}%"),
-                                Course.code.ilike(f"%{search}%")
-                            )
-                        )
-                    )
-                )
-            )
-        if _current_user_uuid:
-            items = items.filter(Submission.student_uuid == _current_user_uuid)
-        items = items.order_by(Submission.created_at.desc())
-        items = items.offset(skip).limit(limit)
+        items = submissions_query(skip, limit, course_uuid, assignment_uuid, student_uuid, course_code, assignment_name, search, cursor, _current_user_uuid)
+        items = self.session.scalars(items.options(*SUBMISSION_RESPONSE_OPTIONS))
         items = items.all()
         return items if items else None
     
@@ -171,10 +188,11 @@ class SubmissionService(AppService):
         student_uuid: str = None,
         course_code: str = None,
         assignment_name: str = None,
-        search: str = None
+        search: str = None,
+        cursor: Cursor = None
     ):
         try:
-            items = self.data_access.get_all_submissions(skip, limit, course_uuid, assignment_uuid, student_uuid, course_code, assignment_name, search, self.current_user_uuid)
+            items = self.data_access.get_all_submissions(skip, limit, course_uuid, assignment_uuid, student_uuid, course_code, assignment_name, search, cursor, self.current_user_uuid)
 
             if not items:
                 return HTTPException(status_code=404, detail="No submissions found")
@@ -235,4 +253,94 @@ class SubmissionService(AppService):
         except Exception as e:
             self.session.rollback()
             logger.error(f"Error deleting submission: {e}")
-            raise HTTPException(status_code=500, detail="Error deleting submission") 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Error deleting submission")
+
+class SubmissionAsyncDataAccess(AsyncAppDataAccess):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def get_submission_by_uuid(self, uuid: str):
+        item = select(Submission).options(*SUBMISSION_RESPONSE_OPTIONS)
+        item = item.filter(Submission.uuid == uuid)
+        item = (await self.session.scalars(item)).first()
+        return item if item else None
+
+    async def get_all_submissions(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        course_uuid: str = None,
+        assignment_uuid: str = None, 
+        student_uuid: str = None,
+        course_code: str = None,
+        assignment_name: str = None,
+        search: str = None,
+        cursor: Cursor = None,
+        _current_user_uuid: str = None
+    ):
+        items = submissions_query(skip, limit, course_uuid, assignment_uuid, student_uuid, course_code, assignment_name, search, cursor, _current_user_uuid)
+        items = items.options(*SUBMISSION_RESPONSE_OPTIONS)
+        items = (await self.session.scalars(items)).all()
+        return items if items else None
+
+class SubmissionAsyncService(AsyncAppService):
+    def __init__(self, session: AsyncSession, request: Request):
+        super().__init__(session, request)
+        self.data_access = SubmissionAsyncDataAccess(session)
+
+    async def get_submission_by_uuid(self, uuid: str):
+        try:
+            item = await self.data_access.get_submission_by_uuid(uuid)
+
+            if not item:
+                return HTTPException(status_code=404, detail="Submission not found")
+            
+            return SubmissionResponse(
+                uuid=item.uuid,
+                assignment_uuid=item.assignment_uuid,
+                student_uuid=item.student_uuid,
+                content=item.content,
+                grade=item.grade,
+                feedback=item.feedback,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                student=item.student,
+                assignment=item.assignment
+            )
+        except Exception as e:
+            logger.error(f"Error getting submission by uuid: {e}")
+            raise HTTPException(status_code=500, detail="Error getting submission by uuid")
+        
+    async def get_all_submissions(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        course_uuid: str = None,
+        assignment_uuid: str = None, 
+        student_uuid: str = None,
+        course_code: str = None,
+        assignment_name: str = None,
+        search: str = None,
+        cursor: Cursor = None
+    ):
+        try:
+            items = await self.data_access.get_all_submissions(skip, limit, course_uuid, assignment_uuid, student_uuid, course_code, assignment_name, search, cursor, self.current_user_uuid)
+
+            if not items:
+                return HTTPException(status_code=404, detail="No submissions found")
+            
+            return [SubmissionResponse(
+                uuid=item.uuid,
+                assignment_uuid=item.assignment_uuid,
+                student_uuid=item.student_uuid,
+                content=item.content,
+                grade=item.grade,
+                feedback=item.feedback,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                student=item.student,
+                assignment=item.assignment
+            ) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting all submissions: {e}")
+            raise HTTPException(status_code=500, detail="Error getting all submissions")
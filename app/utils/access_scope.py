@@ -0,0 +1,147 @@
+import itertools
+import time
+from collections import OrderedDict
+from typing import FrozenSet, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.utils.dataBase import SessionLocal
+from app.models.enrollments_model import Enrollment
+from app.models.courses_model import Course
+from app.models.course_sections_model import CourseSection
+
+
+class AccessScope(NamedTuple):
+    """Lo que puede ver un estudiante: sus cursos inscritos, las secciones de esos cursos y sus carreras"""
+    course_uuids: FrozenSet[UUID]
+    section_uuids: FrozenSet[UUID]
+    career_uuids: FrozenSet[UUID]
+
+
+def access_scope_query(user_uuid: str):
+    return (
+        select(Enrollment.course_uuid, CourseSection.section_uuid, Course.career_uuid)
+        .join(Course, Course.uuid == Enrollment.course_uuid)
+        .outerjoin(CourseSection, CourseSection.course_uuid == Enrollment.course_uuid)
+        .filter(Enrollment.student_uuid == user_uuid)
+    )
+
+
+def build_access_scope(rows) -> AccessScope:
+    courses, sections, careers = set(), set(), set()
+    for course_uuid, section_uuid, career_uuid in rows:
+        courses.add(course_uuid)
+        if section_uuid:
+            sections.add(section_uuid)
+        if career_uuid:
+            careers.add(career_uuid)
+    return AccessScope(frozenset(courses), frozenset(sections), frozenset(careers))
+
+
+class AccessScopeCache:
+    """Cache LRU con TTL de los scopes por usuario, compartida entre requests del worker.
+
+    Las inscripciones del usuario la invalidan al cambiar; otros cambios (ej. secciones
+    de un curso) se reflejan al vencer el TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, user_uuid: str) -> Optional[AccessScope]:
+        entry = self._items.get(str(user_uuid))
+        if entry is None:
+            return None
+        scope, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._items.pop(str(user_uuid), None)
+            return None
+        self._items.move_to_end(str(user_uuid))
+        return scope
+
+    def set(self, user_uuid: str, scope: AccessScope) -> None:
+        self._items[str(user_uuid)] = (scope, time.monotonic() + self.ttl_seconds)
+        self._items.move_to_end(str(user_uuid))
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, user_uuid: str) -> None:
+        self._items.pop(str(user_uuid), None)
+
+
+def build_access_scope_cache() -> Optional[AccessScopeCache]:
+    if settings.ACCESS_SCOPE_CACHE_TTL_SECONDS <= 0:
+        return None
+    return AccessScopeCache(settings.ACCESS_SCOPE_CACHE_TTL_SECONDS, settings.ACCESS_SCOPE_CACHE_MAX_SIZE)
+
+
+access_scope_cache = build_access_scope_cache()
+
+
+def _cached_scope(request, user_uuid: str) -> Optional[AccessScope]:
+    # Primero el scope ya resuelto en este request, después la cache del worker
+    scope = getattr(getattr(request, "state", None), "access_scope", None)
+    if scope is None and access_scope_cache is not None:
+        scope = access_scope_cache.get(user_uuid)
+    return scope
+
+
+def _remember_scope(request, user_uuid: str, scope: AccessScope, resolved: bool) -> AccessScope:
+    if request is not None:
+        request.state.access_scope = scope
+    if resolved and access_scope_cache is not None:
+        access_scope_cache.set(user_uuid, scope)
+    return scope
+
+
+def resolve_access_scope(session: Session, user_uuid: Optional[str], request=None) -> Optional[AccessScope]:
+    """Scope del usuario, o None si no hay usuario (sin restricción)"""
+    if not user_uuid:
+        return None
+    scope = _cached_scope(request, user_uuid)
+    if scope is not None:
+        return _remember_scope(request, user_uuid, scope, resolved=False)
+    scope = build_access_scope(session.execute(access_scope_query(user_uuid)).all())
+    return _remember_scope(request, user_uuid, scope, resolved=True)
+
+
+async def resolve_access_scope_async(session: AsyncSession, user_uuid: Optional[str], request=None) -> Optional[AccessScope]:
+    if not user_uuid:
+        return None
+    scope = _cached_scope(request, user_uuid)
+    if scope is not None:
+        return _remember_scope(request, user_uuid, scope, resolved=False)
+    scope = build_access_scope((await session.execute(access_scope_query(user_uuid))).all())
+    return _remember_scope(request, user_uuid, scope, resolved=True)
+
+
+def invalidate_access_scope(user_uuid: Optional[str]) -> None:
+    if user_uuid and access_scope_cache is not None:
+        access_scope_cache.invalidate(user_uuid)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def collect_enrolled_students(session, flush_context):
+    # En after_flush new/dirty/deleted y el historial todavía muestran lo que se escribió
+    students = session.info.setdefault("access_scope_students", set())
+    for item in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(item, Enrollment):
+            history = inspect(item).attrs.student_uuid.history
+            students.update(uuid for uuid in itertools.chain([item.student_uuid], history.deleted) if uuid)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def invalidate_enrolled_students(session):
+    for user_uuid in session.info.pop("access_scope_students", ()):
+        invalidate_access_scope(user_uuid)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def discard_enrolled_students(session):
+    session.info.pop("access_scope_students", None)
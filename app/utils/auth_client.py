@@ -0,0 +1,64 @@
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger('auth_client')
+
+
+class AuthServiceUnavailable(Exception):
+    """El servicio de autenticación no respondió (timeout o error de conexión)"""
+
+
+class AuthClient:
+    """Cliente HTTP asíncrono con pool de conexiones keep-alive hacia el servicio de auth"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(
+                    settings.AUTH_HTTP_TIMEOUT_SECONDS,
+                    connect=settings.AUTH_HTTP_CONNECT_TIMEOUT_SECONDS
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.AUTH_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.AUTH_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.AUTH_HTTP_KEEPALIVE_EXPIRY_SECONDS
+                )
+            )
+        return self._client
+
+    async def get_current_user(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """Devuelve el payload de /auth/me, o None si el token es rechazado"""
+        try:
+            response = await self._get_client().get(
+                "/api/v1/auth/me",
+                headers={
+                    "Authorization": f"Bearer {access_token}",
+                }
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Error calling auth service: {e}")
+            raise AuthServiceUnavailable(str(e)) from e
+
+        if response.status_code >= 500:
+            logger.error(f"Auth service error: {response.status_code}")
+            raise AuthServiceUnavailable(f"Auth service returned {response.status_code}")
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+auth_client = AuthClient(settings.API_AUTH_URL)
@@ -0,0 +1,65 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.auth_client import AuthServiceUnavailable
+from app.utils.authentication import authenticate
+
+logger = logging.getLogger('auth_middleware')
+
+EXEMPT_PATHS = ("/docs", "/openapi.json", "/api/v1/health")
+
+
+class AuthMiddleware:
+    """Middleware ASGI puro que valida el bearer token y deja el usuario en request.state.user.
+
+    A diferencia de BaseHTTPMiddleware no crea una tarea ni una cola por request y
+    deja pasar el stream de la respuesta sin intermediarios (StreamingResponse).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        exempt_paths: Iterable[str] = EXEMPT_PATHS,
+        authenticate: Callable[[str], Awaitable[Optional[Dict[str, Any]]]] = authenticate
+    ):
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+        self.authenticate = authenticate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if headers.get("X-HTTP-PURPOSE") == "internal":
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = headers.get("authorization")
+        if not auth_header or not auth_header.lower().startswith("bearer "):
+            response = JSONResponse(status_code=401, content={"detail": "Access token not found or invalid"})
+            await response(scope, receive, send)
+            return
+
+        access_token = auth_header.split(" ")[1]
+
+        try:
+            user = await self.authenticate(access_token)
+        except AuthServiceUnavailable:
+            response = JSONResponse(status_code=503, content={"detail": "Authentication service unavailable"})
+            await response(scope, receive, send)
+            return
+
+        if user is None:
+            response = JSONResponse(status_code=401, content={"detail": "Access token invalid"})
+            await response(scope, receive, send)
+            return
+
+        # request.state lee de scope["state"]
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
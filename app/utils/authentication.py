@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.utils.auth_client import auth_client, AuthServiceUnavailable
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.jwt_verifier import jwt_verifier, InvalidToken
+from app.utils.single_flight import SingleFlight
+from app.utils.token_cache import token_cache, hash_token
+
+logger = logging.getLogger('authentication')
+
+# Validaciones concurrentes del mismo token comparten una sola llamada a /auth/me
+auth_single_flight = SingleFlight()
+
+auth_circuit_breaker = CircuitBreaker(
+    "auth",
+    failure_threshold=settings.AUTH_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout_seconds=settings.AUTH_BREAKER_RECOVERY_TIMEOUT_SECONDS,
+    half_open_max_calls=settings.AUTH_BREAKER_HALF_OPEN_MAX_CALLS
+)
+
+# Referencias a las revalidaciones en segundo plano para que no las recolecte el GC
+_revalidation_tasks: set = set()
+
+
+async def _fetch_user(access_token: str) -> Optional[Dict[str, Any]]:
+    if not auth_circuit_breaker.allow_request():
+        raise AuthServiceUnavailable("Circuit breaker open")
+
+    try:
+        user = await auth_client.get_current_user(access_token)
+    except Exception:
+        # Cualquier error (ej. un 200 con JSON inválido) cuenta: si no, el half-open queda sin intentos libres
+        auth_circuit_breaker.record_failure()
+        raise
+    except BaseException:
+        # Request cancelado: el intento de prueba no cuenta como resultado
+        auth_circuit_breaker.release()
+        raise
+    auth_circuit_breaker.record_success()
+
+    if token_cache:
+        if user is not None:
+            token_cache.set(access_token, user)
+        else:
+            token_cache.invalidate(access_token)
+    return user
+
+
+async def _revalidate(access_token: str) -> None:
+    try:
+        await auth_single_flight.do(hash_token(access_token), lambda: _fetch_user(access_token))
+    except AuthServiceUnavailable:
+        pass
+
+
+def _get_stale_user(access_token: str) -> Optional[Dict[str, Any]]:
+    return token_cache.get_stale(access_token) if token_cache else None
+
+
+async def authenticate(access_token: str) -> Optional[Dict[str, Any]]:
+    """Devuelve el usuario asociado al token, o None si el token es inválido.
+
+    En modo local el token se verifica primero con la clave configurada, de modo
+    que un token vencido o mal firmado se rechaza aunque siga en la cache.
+    """
+    claims = None
+    if jwt_verifier is not None:
+        try:
+            claims = jwt_verifier.verify(access_token)
+        except InvalidToken as e:
+            logger.info(f"Access token rejected by local verification: {e}")
+            return None
+
+    cached_user = token_cache.get(access_token) if token_cache else None
+    if cached_user is not None:
+        return cached_user
+
+    if claims is not None and not settings.AUTH_JWT_REVOCATION_CHECK:
+        user = jwt_verifier.user_from_claims(claims)
+        if user is not None:
+            if token_cache:
+                token_cache.set(access_token, user)
+            return user
+
+    # Con el breaker abierto o semiabierto se sirve el último payload conocido
+    # y se revalida en segundo plano (stale-while-revalidate)
+    if not auth_circuit_breaker.is_closed:
+        stale_user = _get_stale_user(access_token)
+        if stale_user is not None:
+            task = asyncio.ensure_future(_revalidate(access_token))
+            _revalidation_tasks.add(task)
+            task.add_done_callback(_revalidation_tasks.discard)
+            return stale_user
+
+    try:
+        return await auth_single_flight.do(hash_token(access_token), lambda: _fetch_user(access_token))
+    except AuthServiceUnavailable:
+        stale_user = _get_stale_user(access_token)
+        if stale_user is not None:
+            logger.warning("Auth service unavailable, serving last known good identity")
+            return stale_user
+        raise
+
+
+def auth_stats() -> Dict[str, Any]:
+    return {
+        "verification_mode": settings.AUTH_VERIFICATION_MODE,
+        "token_cache": token_cache.stats() if token_cache else None,
+        "single_flight": auth_single_flight.stats(),
+        "circuit_breaker": auth_circuit_breaker.stats()
+    }
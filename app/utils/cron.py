@@ -0,0 +1,72 @@
+"""Expresiones cron de 5 campos (minuto hora día-del-mes mes día-de-la-semana).
+
+Soporta *, valores, rangos (1-5), listas (1,15) y pasos (*/10, 0-30/5). El día
+de la semana va de 0 (domingo) a 6; 7 también es domingo. Como en cron, si día
+del mes y día de la semana están restringidos alcanza con que coincida uno.
+"""
+from datetime import datetime, timedelta
+from typing import Set
+
+FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+def parse_field(field: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in field.split(","):
+        value_range, _, step = part.partition("/")
+        if value_range == "*":
+            start, end = low, high
+        elif "-" in value_range:
+            start, end = (int(value) for value in value_range.split("-", 1))
+        else:
+            start = int(value_range)
+            end = high if step else start
+        step = int(step) if step else 1
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field: {field!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != len(FIELDS):
+            raise ValueError(f"Cron expression needs {len(FIELDS)} fields: {expression!r}")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            parse_field(field, low, high) for field, (_, low, high) in zip(fields, FIELDS)
+        )
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def matches_day(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        # datetime.weekday(): lunes = 0; cron: domingo = 0
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Primer minuto estrictamente posterior a moment que cumple la expresión"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Avanza por mes, día y hora antes de recorrer minutos
+        for _ in range(366 * 24 * 60):
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self.matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
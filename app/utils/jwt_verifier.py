@@ -0,0 +1,77 @@
+import json
+import logging
+from typing import Any, Dict, Optional, Union
+
+from jose import jwt, JWTError
+
+from app.core.config import settings
+
+logger = logging.getLogger('jwt_verifier')
+
+
+class InvalidToken(Exception):
+    """El token no pasó la verificación local (firma, expiración o claims)"""
+
+
+class JWTVerifier:
+    """Verifica firma, expiración y claims del token sin llamar al servicio de auth"""
+
+    def __init__(
+        self,
+        key: Union[str, Dict[str, Any]],
+        algorithms: list[str],
+        audience: Optional[str] = None,
+        issuer: Optional[str] = None,
+        user_claim: str = "uuid"
+    ):
+        self.key = key
+        self.algorithms = algorithms
+        self.audience = audience
+        self.issuer = issuer
+        self.user_claim = user_claim
+
+    def verify(self, access_token: str) -> Dict[str, Any]:
+        try:
+            return jwt.decode(
+                access_token,
+                self.key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer,
+                options={
+                    "verify_aud": self.audience is not None,
+                    "require_exp": True
+                }
+            )
+        except JWTError as e:
+            raise InvalidToken(str(e)) from e
+
+    def user_from_claims(self, claims: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Arma el usuario a partir de los claims, o None si falta el identificador"""
+        user_uuid = claims.get(self.user_claim) or claims.get("sub")
+        if not user_uuid:
+            return None
+        return {**claims, "uuid": user_uuid}
+
+
+def load_verification_key() -> Union[str, Dict[str, Any]]:
+    if settings.AUTH_JWT_JWKS_PATH:
+        with open(settings.AUTH_JWT_JWKS_PATH) as jwks_file:
+            return json.load(jwks_file)
+    return settings.SECRET_KEY
+
+
+def build_jwt_verifier() -> Optional[JWTVerifier]:
+    if settings.AUTH_VERIFICATION_MODE != "local":
+        return None
+
+    return JWTVerifier(
+        key=load_verification_key(),
+        algorithms=[algorithm.strip() for algorithm in settings.AUTH_JWT_ALGORITHMS.split(",")],
+        audience=settings.AUTH_JWT_AUDIENCE,
+        issuer=settings.AUTH_JWT_ISSUER,
+        user_claim=settings.AUTH_JWT_USER_CLAIM
+    )
+
+
+jwt_verifier = build_jwt_verifier()
@@ -0,0 +1,54 @@
+import base64
+import json
+import uuid as uuid_lib
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Cursor(NamedTuple):
+    """Posición (created_at, uuid) del último elemento de la página anterior"""
+    created_at: int
+    uuid: uuid_lib.UUID
+
+
+def encode_cursor(created_at: int, uuid) -> str:
+    raw = json.dumps([int(created_at), str(uuid)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, uuid = json.loads(raw)
+        return Cursor(int(created_at), uuid_lib.UUID(uuid))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+# Dependency
+def cursor_param(
+    cursor: Optional[str] = Query(None, description=f"Cursor opaco devuelto en el header {NEXT_CURSOR_HEADER}; si se envía se ignora skip")
+) -> Optional[Cursor]:
+    return decode_cursor(cursor) if cursor else None
+
+
+def paginate(query, model, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None, all: bool = False):
+    """Ordena por (created_at, uuid) descendente y pagina por cursor (keyset) o por offset"""
+    query = query.order_by(model.created_at.desc(), model.uuid.desc())
+    if all:
+        return query
+    if cursor:
+        query = query.filter(tuple_(model.created_at, model.uuid) < (cursor.created_at, cursor.uuid))
+        return query.limit(limit)
+    return query.offset(skip).limit(limit)
+
+
+def set_next_cursor(response: Response, items, limit: int) -> None:
+    """Si la página vino completa, agrega el cursor de la siguiente en el header de la respuesta"""
+    if isinstance(items, list) and items and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.uuid)
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger('process_dispatcher')
+
+# Respuestas que vale la pena reintentar (el resto se reporta como error)
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# El servicio de predicción no tiene el endpoint de lotes: se deja de intentar en esta corrida
+BATCH_UNSUPPORTED_STATUS_CODES = {404, 405, 501}
+
+PREDICTION_PATH = "/process/predictions/process_student_data"
+PREDICTION_BATCH_PATH = "/process/predictions/process_student_data_batch"
+
+
+class ProcessDispatcher:
+    """Envía los datos de predicción a los servicios de users y predicción.
+
+    Usa un cliente httpx (pool keep-alive propio) por host y reintenta con backoff
+    exponencial los errores de conexión, timeouts y RETRY_STATUS_CODES.
+
+    Con PROCESS_PREDICTION_BATCH_SIZE > 1 agrupa los pares en lotes de hasta ese
+    tamaño y PROCESS_PREDICTION_BATCH_MAX_BYTES; si el servicio rechaza un lote,
+    sus pares se envían de a uno. Al terminar hay que llamar a flush().
+
+    on_done, si se pasa, se llama una vez por item con True si el servicio de predicción
+    lo aceptó o False si falló; en ese caso item["error"] tiene {stage, error}.
+    """
+
+    def __init__(self, on_done: Optional[Callable[[Dict[str, Any], bool], None]] = None):
+        self.on_done = on_done
+        self.last_error: Optional[str] = None
+        self.users_client = self._create_client(settings.API_AUTH_URL)
+        self.prediction_client = self._create_client(settings.API_PREDICTION_URL)
+        self.batch_size = max(1, settings.PROCESS_PREDICTION_BATCH_SIZE)
+        self.batch_max_bytes = settings.PROCESS_PREDICTION_BATCH_MAX_BYTES
+        self._batch: List[Dict[str, Any]] = []
+        self._batch_bytes = 0
+        self.stats = {"sent": 0, "user_errors": 0, "prediction_errors": 0, "retries": 0, "batches": 0, "rejected_batches": 0}
+
+    @staticmethod
+    def _create_client(base_url: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(
+                settings.PROCESS_HTTP_TIMEOUT_SECONDS,
+                connect=settings.PROCESS_HTTP_CONNECT_TIMEOUT_SECONDS
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.PROCESS_HTTP_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=settings.PROCESS_HTTP_MAX_CONNECTIONS_PER_HOST
+            )
+        )
+
+    async def __aenter__(self) -> "ProcessDispatcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if exc_info[0] is None:
+            await self.flush()
+        await self.close()
+
+    async def close(self) -> None:
+        await self.users_client.aclose()
+        await self.prediction_client.aclose()
+
+    def backoff_seconds(self, attempt: int) -> float:
+        delay = min(settings.PROCESS_HTTP_BACKOFF_MAX_SECONDS, settings.PROCESS_HTTP_BACKOFF_SECONDS * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """Hace la petición con reintentos; devuelve la última respuesta o None si nunca hubo respuesta"""
+        for attempt in range(settings.PROCESS_HTTP_MAX_RETRIES + 1):
+            last_attempt = attempt == settings.PROCESS_HTTP_MAX_RETRIES
+            try:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+            except httpx.TransportError as e:
+                if last_attempt:
+                    logger.error(f"Error calling {method} {url}: {e!r}")
+                    return None
+                logger.warning(f"Error calling {method} {url}: {e!r}, retrying")
+
+            self.stats["retries"] += 1
+            await asyncio.sleep(self.backoff_seconds(attempt))
+
+    async def get_or_create_user(self, student_uuid: str, email: str, full_name: str) -> bool:
+        response = await self.request(
+            self.users_client,
+            "PATCH",
+            "/internal/users_services/get_or_create_user",
+            json={
+                "email": email,
+                "full_name": full_name,
+                "uuid": student_uuid
+            },
+            headers={
+                "Content-Type": "application/json",
+                "X-HTTP-PURPOSE": "internal"
+            }
+        )
+        if response is None or response.status_code != 200:
+            self.last_error = f"Error getting user: {response.text if response is not None else 'no response'}"
+            logger.error(self.last_error)
+            self.stats["user_errors"] += 1
+            return False
+        return True
+
+    async def send_prediction_data(self, student_uuid: str, course_code: str, data: Dict[str, Any]) -> bool:
+        response = await self.request(
+            self.prediction_client,
+            "POST",
+            PREDICTION_PATH,
+            params={
+                "user_uuid": student_uuid,
+                "course_id": course_code
+            },
+            json=data,
+            headers={"Content-Type": "application/json"}
+        )
+        if response is None or response.status_code != 200:
+            self.last_error = f"Error processing student prediction data: {response.text if response is not None else 'no response'}"
+            logger.error(self.last_error)
+            self.stats["prediction_errors"] += 1
+            return False
+        return True
+
+    async def send_prediction_batch(self, items: List[Dict[str, Any]]) -> List[bool]:
+        """Envía un lote; si el servicio lo rechaza, envía cada par por separado. Devuelve si se envió cada par"""
+        if self.batch_size > 1:
+            self.stats["batches"] += 1
+            response = await self.request(
+                self.prediction_client,
+                "POST",
+                PREDICTION_BATCH_PATH,
+                json={"items": [batch_entry(item) for item in items]},
+                headers={"Content-Type": "application/json"}
+            )
+            if response is not None and response.status_code == 200:
+                return [True] * len(items)
+
+            self.stats["rejected_batches"] += 1
+            if response is not None and response.status_code in BATCH_UNSUPPORTED_STATUS_CODES:
+                logger.warning(f"Prediction service does not support batches ({response.status_code}), sending one by one")
+                self.batch_size = 1
+            else:
+                logger.warning(f"Prediction batch of {len(items)} rejected: {response.text if response is not None else 'no response'}, sending one by one")
+
+        results = await asyncio.gather(*[self.send_item(item) for item in items], return_exceptions=True)
+        sent = []
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending prediction data for student {item['student_uuid']}: {result!r}")
+                self.last_error = str(result)
+                self.stats["prediction_errors"] += 1
+                item["error"] = {"stage": "prediction", "error": str(result)}
+                result = False
+            elif isinstance(result, BaseException):
+                raise result
+            sent.append(result)
+        return sent
+
+    async def send_item(self, item: Dict[str, Any]) -> bool:
+        sent = await self.send_prediction_data(item["student_uuid"], item["course_code"], item["data"])
+        if not sent:
+            # last_error es el de este envío: no hay otro await entre que se asigna y se lee
+            item["error"] = {"stage": "prediction", "error": self.last_error}
+        return sent
+
+    def done(self, item: Dict[str, Any], sent: bool) -> None:
+        if sent:
+            self.stats["sent"] += 1
+        if self.on_done is not None:
+            self.on_done(item, sent)
+
+    async def add_to_batch(self, item: Dict[str, Any]) -> None:
+        size = len(json.dumps(batch_entry(item)))
+        # Lo que no entra en el lote actual se envía antes de agregar el par
+        if self._batch and self._batch_bytes + size > self.batch_max_bytes:
+            await self.flush()
+        self._batch.append(item)
+        self._batch_bytes += size
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._batch:
+            return
+        items, self._batch, self._batch_bytes = self._batch, [], 0
+        try:
+            results = await self.send_prediction_batch(items)
+        except Exception as e:
+            # Cualquier error que no sea de transporte también deja un resultado por par
+            logger.error(f"Error sending prediction batch of {len(items)}: {e!r}")
+            self.last_error = str(e)
+            self.stats["prediction_errors"] += len(items)
+            for item in items:
+                item["error"] = {"stage": "prediction", "error": str(e)}
+            results = [False] * len(items)
+        for item, sent in zip(items, results):
+            self.done(item, sent)
+
+    async def dispatch(self, item: Dict[str, Any]) -> bool:
+        """Verifica el usuario en el microservicio de users y envía sus métricas al de predicción"""
+        if not await self.get_or_create_user(item["student_uuid"], item["email"], item["full_name"]):
+            item["error"] = {"stage": "user", "error": self.last_error}
+            self.done(item, False)
+            return False
+        if self.batch_size > 1:
+            await self.add_to_batch(item)
+            return True
+        sent = await self.send_item(item)
+        self.done(item, sent)
+        return sent
+
+
+def batch_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "user_uuid": item["student_uuid"],
+        "course_id": item["course_code"],
+        "data": item["data"]
+    }
@@ -0,0 +1,188 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.utils.dataBase import AsyncSessionLocal, SessionLocal, build_async_url, build_async_engine_kwargs
+
+logger = logging.getLogger('replicas')
+
+# Segundos de retraso de la réplica; 0 si ya reprodujo todo lo recibido del primario
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+# Hasta cuándo (epoch en segundos) las lecturas del cliente van al primario; viaja en una
+# cookie y en un header de respuesta que los clientes sin cookies pueden reenviar
+READ_YOUR_WRITES_UNTIL_HEADER = "X-Read-Your-Writes-Until"
+READ_YOUR_WRITES_COOKIE = "read_your_writes_until"
+
+# Pin del request en curso; el middleware lo crea y el after_commit lo completa
+_write_pin: ContextVar[Optional[Dict[str, float]]] = ContextVar("write_pin", default=None)
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        self.lag_seconds: Optional[float] = None
+        self.healthy = True
+
+
+class ReplicaRouter:
+    """Elige dónde ejecutar las lecturas: una réplica sana o el primario.
+
+    Una réplica con más de max_lag_seconds de retraso (o que no responde) sale de
+    la rotación hasta el siguiente chequeo. Después de un commit, las lecturas del
+    mismo cliente van al primario durante pin_seconds (read your writes); el pin
+    lo lleva el cliente (ReadYourWritesMiddleware), así vale en cualquier worker.
+    """
+
+    def __init__(self, urls: List[str], max_lag_seconds: float, check_interval_seconds: float, pin_seconds: float):
+        self.replicas = [
+            Replica(f"replica-{index}", create_async_engine(build_async_url(url), **build_async_engine_kwargs()))
+            for index, url in enumerate(urls)
+        ]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.pin_seconds = pin_seconds
+        self._round_robin = itertools.cycle(self.replicas) if self.replicas else None
+        self._checked_at = 0.0
+        self._check_task: Optional[asyncio.Task] = None
+
+    def mark_write(self) -> None:
+        pin = _write_pin.get()
+        if pin is not None:
+            pin["until"] = time.time() + self.pin_seconds
+
+    def is_pinned(self, request: Request) -> bool:
+        until = request.headers.get(READ_YOUR_WRITES_UNTIL_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
+        try:
+            return float(until) > time.time()
+        except (TypeError, ValueError):
+            return False
+
+    def sessionmaker_for(self, request: Request) -> async_sessionmaker:
+        if not self.replicas:
+            return AsyncSessionLocal
+
+        if request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() == "true":
+            return AsyncSessionLocal
+
+        if self.is_pinned(request):
+            return AsyncSessionLocal
+
+        self._schedule_lag_check()
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._round_robin)
+            if replica.healthy:
+                return replica.sessionmaker
+        return AsyncSessionLocal
+
+    def _schedule_lag_check(self) -> None:
+        if time.monotonic() - self._checked_at < self.check_interval_seconds:
+            return
+        if self._check_task is not None and not self._check_task.done():
+            return
+        self._checked_at = time.monotonic()
+        self._check_task = asyncio.ensure_future(self.check_lag())
+
+    async def check_lag(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    replica.lag_seconds = float((await conn.execute(REPLICA_LAG_QUERY)).scalar() or 0)
+                healthy = replica.lag_seconds <= self.max_lag_seconds
+            except Exception as e:
+                logger.error(f"Error checking lag of {replica.name}: {e}")
+                replica.lag_seconds = None
+                healthy = False
+
+            if healthy != replica.healthy:
+                logger.warning(f"{replica.name} {'back in' if healthy else 'out of'} rotation (lag: {replica.lag_seconds})")
+            replica.healthy = healthy
+
+    def stats(self) -> List[Dict]:
+        return [
+            {"name": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds}
+            for replica in self.replicas
+        ]
+
+    async def close(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(
+    urls=[url.strip() for url in (settings.DB_READ_REPLICA_URLS or "").split(",") if url.strip()],
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    pin_seconds=settings.DB_READ_YOUR_WRITES_SECONDS
+)
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que devuelve el pin al primario si el request hizo commit.
+
+    Lo manda en la cookie read_your_writes_until (dura pin_seconds) y en el header
+    X-Read-Your-Writes-Until; get_async_read_db respeta cualquiera de los dos.
+    """
+
+    def __init__(self, app: ASGIApp, router: ReplicaRouter = None):
+        self.app = app
+        self.router = router or replica_router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Un dict y no un valor: los endpoints sync corren en otro hilo con una copia del contexto
+        pin = {}
+        token = _write_pin.set(pin)
+
+        async def send_with_pin(message) -> None:
+            if message["type"] == "http.response.start" and pin.get("until"):
+                headers = MutableHeaders(scope=message)
+                until = f"{pin['until']:.3f}"
+                headers.append(READ_YOUR_WRITES_UNTIL_HEADER, until)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={until}; Max-Age={math.ceil(self.router.pin_seconds)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _write_pin.reset(token)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def pin_client_to_primary(session):
+    # Solo los commits de un request (AppService guarda el usuario en session.info), no los del worker
+    if session.info.get("user_uuid"):
+        replica_router.mark_write()
+
+
+# Dependency (lecturas que toleran réplicas)
+async def get_async_read_db(request: Request):
+    async with replica_router.sessionmaker_for(request)() as db:
+        yield db
@@ -0,0 +1,51 @@
+import re
+from typing import Optional
+
+from sqlalchemy import Column, Computed, func, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
+from app.core.config import settings
+
+# Sin stemming ni stopwords: nombres, códigos y títulos se buscan tal cual se escriben
+SEARCH_CONFIG = "simple"
+
+# __mapper_args__ de los modelos con search_vector: sin esto el ORM pide la columna
+# generada en el RETURNING de cada INSERT/UPDATE, y en una base sin add_search_columns
+# fallan todas las altas aunque SEARCH_MODE sea "ilike"
+SEARCH_VECTOR_MAPPER_ARGS = {"eager_defaults": False}
+
+
+def search_vector_column(**weights):
+    """Columna tsvector generada por Postgres a partir de columnas de texto, con un peso (A-D) por columna.
+
+    Ej.: search_vector_column(name="A", code="A", description="C")
+
+    Es deferred para que los SELECT de los listados no la traigan; el modelo tiene que
+    usar __mapper_args__ = SEARCH_VECTOR_MAPPER_ARGS.
+    """
+    expression = " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in weights.items()
+    )
+    return deferred(Column(TSVECTOR, Computed(expression, persisted=True)))
+
+
+def build_tsquery(term: Optional[str]):
+    """Convierte lo que escribe el usuario en un tsquery por prefijo: 'ana gar' -> 'ana:* & gar:*'"""
+    words = re.findall(r"\w+", term or "")
+    if not words:
+        return None
+    return func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{word.lower()}:*" for word in words))
+
+
+def text_search(model, term: str, *ilike_columns):
+    """Condición de búsqueda de los parámetros search de los listados.
+
+    Con SEARCH_MODE="fulltext" usa la columna search_vector del modelo (índice GIN);
+    con "ilike" conserva la búsqueda por substring sobre ilike_columns.
+    """
+    tsquery = build_tsquery(term)
+    if settings.SEARCH_MODE == "fulltext" and hasattr(model, "search_vector") and tsquery is not None:
+        return model.search_vector.op("@@")(tsquery)
+    return or_(*[column.ilike(f"%{term}%") for column in ilike_columns])
@@ -0,0 +1,230 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger('token_cache')
+
+# Cada cuántas escrituras (por proceso) se limpia la tabla compartida
+SHARED_PRUNE_EVERY_WRITES = 500
+
+
+def hash_token(access_token: str) -> str:
+    """Devuelve el hash del token para no guardar el token en claro"""
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+
+class SQLiteTokenCacheBackend:
+    """Backend compartido entre los workers de uvicorn de un mismo host (archivo SQLite local).
+
+    Cada SHARED_PRUNE_EVERY_WRITES escrituras borra las filas vencidas (pasada la
+    ventana de gracia) y, si quedan más de max_entries, las que vencen antes.
+    """
+
+    def __init__(self, path: str, grace_seconds: int = 0, max_entries: Optional[int] = None):
+        self.path = path
+        self.grace_seconds = grace_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS token_cache ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS ix_token_cache_expires_at ON token_cache (expires_at)")
+        self.prune()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str, min_expires_at: float) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT payload, expires_at FROM token_cache WHERE key = ? AND expires_at > ?", (key, min_expires_at)
+        ).fetchone()
+        if not row:
+            return None
+        payload, expires_at = row
+        return {"payload": json.loads(payload), "expires_at": expires_at}
+
+    def set(self, key: str, payload: Dict[str, Any], expires_at: float) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO token_cache (key, payload, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(payload), expires_at)
+        )
+        with self._writes_lock:
+            self._writes += 1
+            prune = self._writes % SHARED_PRUNE_EVERY_WRITES == 0
+        if prune:
+            self.prune()
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM token_cache WHERE key = ?", (key,))
+
+    def purge_expired(self, grace_seconds: int = 0) -> None:
+        self._connection().execute("DELETE FROM token_cache WHERE expires_at <= ?", (time.time() - grace_seconds,))
+
+    def enforce_max_entries(self) -> None:
+        if not self.max_entries:
+            return
+        # Con TTL fijo, las que vencen antes son las escritas hace más tiempo
+        self._connection().execute(
+            "DELETE FROM token_cache WHERE key IN ("
+            "SELECT key FROM token_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def prune(self) -> None:
+        self.purge_expired(self.grace_seconds)
+        self.enforce_max_entries()
+
+
+class TokenCache:
+    """Cache LRU con TTL de los payloads de /auth/me, indexada por el hash del token.
+
+    Las entradas vencidas se conservan durante stale_grace_seconds como último
+    payload válido conocido, para usarlas si el servicio de auth no responde.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_size: int,
+        backend: Optional[SQLiteTokenCacheBackend] = None,
+        stale_grace_seconds: int = 0
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.backend = backend
+        self.stale_grace_seconds = stale_grace_seconds
+        self._items: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    def get(self, access_token: str) -> Optional[Dict[str, Any]]:
+        payload = self._lookup(hash_token(access_token), time.time())
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload
+
+    def get_stale(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """Devuelve el último payload conocido aunque haya vencido, dentro de la ventana de gracia"""
+        payload = self._lookup(hash_token(access_token), time.time() - self.stale_grace_seconds)
+        if payload is not None:
+            with self._lock:
+                self.stale_hits += 1
+        return payload
+
+    def _lookup(self, key: str, min_expires_at: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > min_expires_at:
+                    self._items.move_to_end(key)
+                    return payload
+                if expires_at <= time.time() - self.stale_grace_seconds:
+                    del self._items[key]
+
+        if self.backend is not None:
+            try:
+                shared = self.backend.get(key, min_expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading shared token cache: {e}")
+                shared = None
+            if shared is not None:
+                with self._lock:
+                    self._store(key, shared["payload"], shared["expires_at"])
+                    self.shared_hits += 1
+                return shared["payload"]
+
+        return None
+
+    def set(self, access_token: str, payload: Dict[str, Any]) -> None:
+        key = hash_token(access_token)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, payload, expires_at)
+
+        if self.backend is not None:
+            try:
+                self.backend.set(key, payload, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing shared token cache: {e}")
+
+    def invalidate(self, access_token: str) -> None:
+        key = hash_token(access_token)
+        with self._lock:
+            self._items.pop(key, None)
+        if self.backend is not None:
+            try:
+                self.backend.delete(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Error deleting from shared token cache: {e}")
+
+    def _store(self, key: str, payload: Dict[str, Any], expires_at: float) -> None:
+        self._items[key] = (expires_at, payload)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+def build_token_cache() -> Optional[TokenCache]:
+    if not settings.AUTH_CACHE_ENABLED:
+        return None
+
+    backend = None
+    if settings.AUTH_CACHE_SHARED_PATH:
+        try:
+            backend = SQLiteTokenCacheBackend(
+                settings.AUTH_CACHE_SHARED_PATH,
+                settings.AUTH_STALE_GRACE_SECONDS,
+                settings.AUTH_CACHE_MAX_SIZE
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error opening shared token cache, using in-process cache only: {e}")
+
+    return TokenCache(
+        ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+        max_size=settings.AUTH_CACHE_MAX_SIZE,
+        backend=backend,
+        stale_grace_seconds=settings.AUTH_STALE_GRACE_SECONDS
+    )
+
+
+token_cache = build_token_cache()
@@ -0,0 +1,183 @@
+"""Worker del proceso de predicción, separado de la API.
+
+Uso: python -m app.workers.process [--schedule "0 3 * * *"] [--shards N] [--once]
+
+Ejecuta las corridas que encola GET /internal/process/process-student-data y,
+con --schedule (o PROCESS_WORKER_SCHEDULE, cron de 5 campos en UTC), encola una
+corrida en cada horario. Con --once procesa lo encolado y termina (para usarlo
+desde un cron externo). --shards (o PROCESS_SHARDS) reparte el cálculo de
+métricas entre N procesos.
+
+Cada corrida se reparte en work items (tramos de PROCESS_WORK_ITEM_STUDENTS
+estudiantes, tabla process_work_items). Todos los workers toman items con
+SELECT ... FOR UPDATE SKIP LOCKED, así que la corrida escala con la cantidad de
+réplicas. Un item se toma con un lease de PROCESS_WORK_LEASE_SECONDS que se
+renueva con cada checkpoint; si el worker muere, al vencer lo toma otro.
+
+Solo el worker con el pg advisory lock PROCESS_WORKER_LOCK_KEY programa las
+corridas, las reparte en items y las cierra; si se cae, otro toma el lock. El
+lock es de sesión, así que la conexión tiene que ir directo a Postgres o a un
+pooler en modo sesión, no a uno en modo transacción.
+
+SIGTERM o SIGINT terminan el item en curso en el próximo lote de estudiantes,
+guardan su progreso y lo devuelven a la cola; una segunda señal corta en el acto.
+
+Sin work items pendientes, los workers reenvían los pares que fallaron (tabla
+process_retries) cuando vence su backoff; los que agotan PROCESS_RETRY_MAX_ATTEMPTS
+quedan en process_dead_letters hasta que se hace replay desde la API.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services.process_run_service import ProcessRunDataAccess
+from app.services.process_service import ProcessService
+from app.utils.cron import CronSchedule
+from app.utils.dataBase import SessionLocal, engine
+from app.utils.logging_config import setup_logging
+
+logger = logging.getLogger('process_worker')
+
+class AdvisoryLock:
+    """pg advisory lock de sesión, tomado en una conexión propia mientras el worker esté activo"""
+
+    def __init__(self, key: int):
+        self.key = key
+        self.connection = None
+
+    def acquire(self) -> bool:
+        if self.connection is not None:
+            if self.is_held():
+                return True
+            logger.warning("Lost the worker lock connection")
+
+        connection = engine.connect()
+        try:
+            acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+
+        logger.info(f"Acquired worker lock {self.key}")
+        self.connection = connection
+        return True
+
+    def is_held(self) -> bool:
+        try:
+            self.connection.execute(text("SELECT 1"))
+            self.connection.commit()
+            return True
+        except Exception:
+            # Si la conexión se cortó, Postgres ya liberó el lock
+            self.connection.invalidate()
+            self.connection = None
+            return False
+
+    def release(self) -> None:
+        if self.connection is None:
+            return
+        try:
+            self.connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self.connection.commit()
+        finally:
+            self.connection.close()
+            self.connection = None
+
+class ProcessWorker:
+    def __init__(self, schedule: Optional[str] = None, poll_seconds: float = 5.0, shards: int = None):
+        self.schedule = CronSchedule(schedule) if schedule else None
+        self.poll_seconds = poll_seconds
+        self.shards = max(1, shards or settings.PROCESS_SHARDS)
+        self.stop = threading.Event()
+        self.lock = AdvisoryLock(settings.PROCESS_WORKER_LOCK_KEY)
+        self.next_scheduled = None
+        # Identifica al worker en lease_owner de los items que toma
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.pool = None
+
+    def enqueue_scheduled(self, session) -> None:
+        if self.schedule is None:
+            return
+        now = datetime.now(timezone.utc)
+        if self.next_scheduled is None:
+            self.next_scheduled = self.schedule.next_after(now)
+            logger.info(f"Next scheduled run at {self.next_scheduled.isoformat()}")
+        if now < self.next_scheduled:
+            return
+
+        run, _ = ProcessRunDataAccess(session).enqueue_run()
+        session.commit()
+        if run is None:
+            logger.info("Skipping scheduled run: a run is already in progress")
+        else:
+            logger.info(f"Scheduled run {run.uuid} queued")
+        self.next_scheduled = self.schedule.next_after(now)
+        logger.info(f"Next scheduled run at {self.next_scheduled.isoformat()}")
+
+    def run_next(self) -> bool:
+        """Coordina las corridas si tiene el lock y procesa un work item o, si no hay, un lote de reintentos; False si no había nada"""
+        session = SessionLocal()
+        try:
+            service = ProcessService(session, None)
+            if self.lock.acquire():
+                self.enqueue_scheduled(session)
+                service.coordinate_runs()
+            return (
+                service.process_next_work_item(self.worker_id, self.stop, self.pool, self.shards)
+                or service.process_due_retries(self.stop, self.pool, self.shards)
+            )
+        finally:
+            session.close()
+
+    def run_forever(self, once: bool = False) -> int:
+        logger.info(f"Worker {self.worker_id} started (shards={self.shards})")
+        if self.shards > 1:
+            # spawn: cada proceso arranca limpio y crea su propio engine (fork copiaría el pool de conexiones)
+            self.pool = ProcessPoolExecutor(max_workers=self.shards, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            while not self.stop.is_set():
+                if not self.run_next():
+                    if once:
+                        return 0
+                    self.stop.wait(self.poll_seconds)
+            return 0
+        finally:
+            self.lock.release()
+            if self.pool is not None:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def request_stop(self, signum, frame) -> None:
+        if self.stop.is_set():
+            raise KeyboardInterrupt
+        logger.info(f"Received signal {signum}, stopping after the current batch")
+        self.stop.set()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker del proceso de predicción")
+    parser.add_argument("--schedule", default=settings.PROCESS_WORKER_SCHEDULE, help='Cron de 5 campos en UTC, ej. "0 3 * * *"')
+    parser.add_argument("--poll-seconds", type=float, default=settings.PROCESS_WORKER_POLL_SECONDS)
+    parser.add_argument("--shards", type=int, default=settings.PROCESS_SHARDS, help="Procesos para calcular métricas")
+    parser.add_argument("--once", action="store_true", help="Procesar lo encolado y terminar")
+    args = parser.parse_args()
+
+    setup_logging()
+    worker = ProcessWorker(args.schedule, args.poll_seconds, args.shards)
+    signal.signal(signal.SIGTERM, worker.request_stop)
+    signal.signal(signal.SIGINT, worker.request_stop)
+    sys.exit(worker.run_forever(args.once))
@@ -1,18 +1,29 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.controller.router import api_router
 from fastapi.openapi.utils import get_openapi
-import requests
-from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.utils.logging_config import setup_logging
+from app.utils.auth_client import auth_client
+from app.utils.auth_middleware import AuthMiddleware
+from app.utils.replicas import replica_router, ReadYourWritesMiddleware, READ_YOUR_WRITES_UNTIL_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 setup_logging()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Cerrar el pool de conexiones hacia el servicio de auth
+    await auth_client.close()
+    await replica_router.close()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    lifespan=lifespan,
 )
 
 def custom_openapi():
@@ -52,36 +63,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, READ_YOUR_WRITES_UNTIL_HEADER],
 )
 
-# Incluir los routers de la API
-app.include_router(api_router)
-
-@app.middleware("http")
-async def verify_access_token(request: Request, call_next):
-    if request.method == "OPTIONS":
-        return await call_next(request)
-    
-    if request.headers.get("X-HTTP-PURPOSE") == "internal":
-        return await call_next(request)
-    
-    if request.url.path in ["/docs", "/openapi.json", '/api/v1/health']: 
-        return await call_next(request)
-    
-    auth_header = request.headers.get("authorization")
-    if not auth_header or not auth_header.lower().startswith("bearer "):
-        return JSONResponse(status_code=401, content={"detail": "Access token not found or invalid"})
+# Pin al primario después de escribir (read your writes entre workers)
+app.add_middleware(ReadYourWritesMiddleware)
 
-    access_token = auth_header.split(" ")[1]
+# Validación del access token (el último middleware agregado es el primero en ejecutarse)
+app.add_middleware(AuthMiddleware)
 
-    response = requests.get(
-        f"{settings.API_AUTH_URL}/api/v1/auth/me",
-        headers={
-            "Authorization": f"Bearer {access_token}",
-        }
-    )
-    if response.status_code != 200:
-        return JSONResponse(status_code=401, content={"detail": "Access token invalid"})
-    
-    request.state.user = response.json()
-    return await call_next(request)
\ No newline at end of file
+# Incluir los routers de la API
+app.include_router(api_router)